@@ -7,7 +7,6 @@ Filters and redacts sensitive information from API responses
 import logging
 import re
 from typing import Any, Dict, List, Set, Optional
-from copy import deepcopy
 
 logger = logging.getLogger(__name__)
 
@@ -71,6 +70,9 @@ class DataFilter:
         # (r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}', "EMAIL_REDACTED"),
     ]
 
+    # Distinct field names whose verdict is remembered by _is_sensitive_field
+    FIELD_VERDICT_CACHE_SIZE = 4096
+
     def __init__(
         self,
         redact_pii: bool = True,
@@ -109,23 +111,49 @@ class DataFilter:
             for pattern, replacement in self.SENSITIVE_VALUE_PATTERNS
         ]
 
+        # Single-pass scanners: one alternation per pattern family, so a clean
+        # field name or string is rejected by one regex call.  Replacements
+        # still run pattern by pattern to keep their original precedence.
+        self._field_scanner = self._combine(self.field_patterns, re.IGNORECASE)
+        self._value_scanner = self._combine([p for p, _ in self.value_patterns])
+
+        # Field-name verdicts; the same keys repeat on every row of a result.
+        self._field_verdicts: Dict[str, bool] = {}
+
         logger.info("Data filter initialized")
 
+    @staticmethod
+    def _combine(patterns: List[re.Pattern], flags: int = 0) -> Optional[re.Pattern]:
+        """
+        Join compiled patterns into one alternation.
+
+        Returns None when there is nothing to combine or the patterns cannot be
+        spliced together (e.g. clashing group names); callers then fall back to
+        trying each pattern in turn.
+        """
+        if not patterns:
+            return None
+        try:
+            return re.compile("|".join(f"(?:{p.pattern})" for p in patterns), flags)
+        except re.error:
+            return None
+
     def filter_response(self, data: Any) -> Any:
         """
         Filter sensitive data from API response
 
+        The input is never modified.  Containers are rebuilt only along paths
+        where something was redacted; clean sub-trees (and objects that are
+        not dicts, lists or strings, such as MCP ``TextContent``) are returned
+        as-is, so a clean response costs one scan and no copies.
+
         Args:
             data: Response data (dict, list, or primitive)
 
         Returns:
-            Filtered copy of the data
+            Filtered data (the original object when nothing was redacted)
         """
-        # Create a deep copy to avoid modifying original
-        filtered_data = deepcopy(data)
-
-        # Recursively filter
-        return self._filter_recursive(filtered_data)
+        return self._filter_recursive(data)
 
     def _filter_recursive(self, data: Any, path: str = "") -> Any:
         """
@@ -148,31 +176,43 @@ class DataFilter:
             return data
 
     def _filter_dict(self, data: Dict, path: str) -> Dict:
-        """Filter dictionary data"""
-        filtered = {}
+        """Filter dictionary data (copied only if a value changes)"""
+        filtered = None
 
         for key, value in data.items():
-            current_path = f"{path}.{key}" if path else key
-
             # Check if field should be redacted
-            if self._is_sensitive_field(key):
-                filtered[key] = self._redact_value(value, key)
-                logger.debug(f"Redacted sensitive field: {current_path}")
+            if isinstance(key, str) and self._is_sensitive_field(key):
+                new_value = self._redact_value(value, key)
+                logger.debug("Redacted sensitive field: %s", f"{path}.{key}" if path else key)
             else:
                 # Recursively filter value
-                filtered[key] = self._filter_recursive(value, current_path)
+                new_value = self._filter_recursive(value, f"{path}.{key}" if path else key)
 
-        return filtered
+            if new_value is not value:
+                if filtered is None:
+                    filtered = dict(data)
+                filtered[key] = new_value
+
+        return data if filtered is None else filtered
 
     def _filter_list(self, data: List, path: str) -> List:
-        """Filter list data"""
-        return [
-            self._filter_recursive(item, f"{path}[{i}]")
-            for i, item in enumerate(data)
-        ]
+        """Filter list data (copied only if an item changes)"""
+        filtered = None
+
+        for i, item in enumerate(data):
+            new_item = self._filter_recursive(item, f"{path}[{i}]")
+            if new_item is not item:
+                if filtered is None:
+                    filtered = list(data)
+                filtered[i] = new_item
+
+        return data if filtered is None else filtered
 
     def _filter_string(self, data: str, path: str) -> str:
         """Filter string data for sensitive patterns"""
+        if self._value_scanner is not None and not self._value_scanner.search(data):
+            return data
+
         filtered = data
 
         # Apply value pattern replacements
@@ -193,18 +233,24 @@ class DataFilter:
         Returns:
             True if field is sensitive
         """
+        verdict = self._field_verdicts.get(field_name)
+        if verdict is not None:
+            return verdict
+
         field_lower = field_name.lower()
 
-        # Check exact matches
+        # Check exact matches, then all patterns in one pass
         if field_lower in self.SENSITIVE_FIELD_NAMES:
-            return True
-
-        # Check pattern matches
-        for pattern in self.field_patterns:
-            if pattern.match(field_lower):
-                return True
+            verdict = True
+        elif self._field_scanner is not None:
+            verdict = self._field_scanner.match(field_lower) is not None
+        else:
+            verdict = any(pattern.match(field_lower) for pattern in self.field_patterns)
 
-        return False
+        if len(self._field_verdicts) >= self.FIELD_VERDICT_CACHE_SIZE:
+            self._field_verdicts.clear()
+        self._field_verdicts[field_name] = verdict
+        return verdict
 
     def _redact_value(self, value: Any, field_name: str) -> str:
         """
@@ -242,7 +288,8 @@ class DataFilter:
         Returns:
             Filtered connection info
         """
-        filtered = self.filter_response(connection)
+        # filter_response may hand back the input itself; copy before editing
+        filtered = dict(self.filter_response(connection))
 
         # Additional connection-specific filtering
         sensitive_connection_fields = [
@@ -4,16 +4,56 @@ SAP Datasphere Authenticated Connector
 Integrates OAuth 2.0 authentication with Datasphere API calls
 """
 
+import asyncio
+import copy
 import logging
-from typing import Dict, List, Optional, Any
+import os
+import time
+from typing import Dict, List, Optional, Any, Tuple, TYPE_CHECKING
 import aiohttp
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
 from auth.oauth_handler import OAuthHandler, OAuthError
+from tracing import span
+
+if TYPE_CHECKING:
+    from telemetry import TelemetryManager
 
 logger = logging.getLogger(__name__)
 
 
+@dataclass
+class ConnectionPoolConfig:
+    """
+    HTTP connection pool settings for the Datasphere tenant
+
+    One pool is created per connector and shared by every request path, so
+    concurrent tool calls reuse warm keep-alive connections instead of paying
+    a TCP and TLS handshake each.
+    """
+    max_connections: int = 100          # Total open connections across hosts
+    max_connections_per_host: int = 20  # Open connections to a single host
+    keepalive_timeout: float = 30.0     # Seconds an idle connection is kept
+    dns_cache_ttl: int = 300            # Seconds a resolved address is reused
+    coalesce_gets: bool = True          # Share one upstream call between identical in-flight GETs
+
+    @classmethod
+    def from_env(cls) -> "ConnectionPoolConfig":
+        """
+        Build pool settings from environment variables
+
+        Unset variables keep the defaults above.
+        """
+        defaults = cls()
+        return cls(
+            max_connections=int(os.getenv("DATASPHERE_HTTP_MAX_CONNECTIONS", defaults.max_connections)),
+            max_connections_per_host=int(os.getenv("DATASPHERE_HTTP_MAX_CONNECTIONS_PER_HOST", defaults.max_connections_per_host)),
+            keepalive_timeout=float(os.getenv("DATASPHERE_HTTP_KEEPALIVE_SECONDS", defaults.keepalive_timeout)),
+            dns_cache_ttl=int(os.getenv("DATASPHERE_HTTP_DNS_CACHE_TTL", defaults.dns_cache_ttl)),
+            coalesce_gets=os.getenv("DATASPHERE_HTTP_COALESCE_GETS", "true").lower() == "true",
+        )
+
+
 @dataclass
 class DatasphereConfig:
     """Configuration for SAP Datasphere connection"""
@@ -23,6 +63,7 @@ class DatasphereConfig:
     token_url: str
     tenant_id: str
     scope: Optional[str] = None
+    pool: ConnectionPoolConfig = field(default_factory=ConnectionPoolConfig)
 
 
 class DatasphereAuthConnector:
@@ -37,22 +78,38 @@ class DatasphereAuthConnector:
     - Metadata
     """
 
-    def __init__(self, config: DatasphereConfig, oauth_handler: Optional[OAuthHandler] = None):
+    def __init__(
+        self,
+        config: DatasphereConfig,
+        oauth_handler: Optional[OAuthHandler] = None,
+        telemetry_manager: Optional["TelemetryManager"] = None
+    ):
         """
         Initialize Datasphere connector
 
         Args:
             config: Datasphere configuration
             oauth_handler: Optional pre-configured OAuth handler
+            telemetry_manager: Optional telemetry manager for pool metrics
         """
         self.config = config
         self.oauth_handler = oauth_handler
+        self.telemetry_manager = telemetry_manager
         self._session: Optional[aiohttp.ClientSession] = None
+        self._connector: Optional[aiohttp.TCPConnector] = None
+        # In-flight GETs keyed by _coalesce_key: [shared task, waiter count]
+        self._inflight: Dict[Tuple, List[Any]] = {}
+        # Pool occupancy, maintained by the trace callbacks of the current pool
+        self._requests_in_flight = 0
+        self._connections_created = 0
+        self._connections_reused = 0
 
         logger.info(f"Datasphere connector initialized for {config.base_url}")
 
     async def initialize(self):
-        """Initialize the connector and acquire OAuth token"""
+        """Initialize the connector, create the connection pool and acquire OAuth token"""
+        self._ensure_session()
+
         if not self.oauth_handler:
             from auth.oauth_handler import create_oauth_handler
 
@@ -61,11 +118,137 @@ class DatasphereAuthConnector:
                 client_secret=self.config.client_secret,
                 token_url=self.config.token_url,
                 scope=self.config.scope,
-                acquire_token=True
+                acquire_token=True,
+                telemetry_manager=self.telemetry_manager,
+                # Token requests share the pool instead of a session per attempt
+                session_provider=self._ensure_session
             )
 
         logger.info("Datasphere connector initialized with OAuth authentication")
 
+    def _ensure_session(self) -> aiohttp.ClientSession:
+        """
+        Return the shared pooled session, creating it on first use
+
+        ``initialize()`` creates the pool up front; the lazy path only exists
+        so a connector used without ``initialize()`` still gets the same pool
+        rather than an unpooled default session.
+        """
+        if self._session is None or self._session.closed:
+            self._session = self._create_session()
+        return self._session
+
+    def _create_session(self) -> aiohttp.ClientSession:
+        """Create the keep-alive session every request path shares"""
+        pool = self.config.pool
+        self._connector = aiohttp.TCPConnector(
+            limit=pool.max_connections,
+            limit_per_host=pool.max_connections_per_host,
+            keepalive_timeout=pool.keepalive_timeout,
+            ttl_dns_cache=pool.dns_cache_ttl,
+            use_dns_cache=pool.dns_cache_ttl > 0,
+        )
+
+        self._requests_in_flight = 0
+        self._connections_created = 0
+        self._connections_reused = 0
+
+        logger.info(
+            f"Connection pool created (limit={pool.max_connections}, "
+            f"per_host={pool.max_connections_per_host}, keepalive={pool.keepalive_timeout}s, "
+            f"dns_ttl={pool.dns_cache_ttl}s)"
+        )
+        return aiohttp.ClientSession(
+            connector=self._connector,
+            trace_configs=[self._build_trace_config()]
+        )
+
+    def _build_trace_config(self) -> aiohttp.TraceConfig:
+        """
+        Count requests and connections, and report pool events to telemetry
+
+        ``get_pool_stats`` is derived from these counters; aiohttp exposes no
+        public occupancy figures.
+        """
+        trace_config = aiohttp.TraceConfig()
+
+        def acquired(ctx):
+            ctx.holds_connection = True
+            self._requests_in_flight += 1
+
+        async def on_request_done(session, ctx, params):
+            if getattr(ctx, "holds_connection", False):
+                ctx.holds_connection = False
+                self._requests_in_flight -= 1
+
+        async def on_queued_start(session, ctx, params):
+            ctx.queued_at = time.perf_counter()
+
+        async def on_queued_end(session, ctx, params):
+            wait_ms = (time.perf_counter() - getattr(ctx, "queued_at", time.perf_counter())) * 1000
+            self._record_pool_event("queued", wait_ms=wait_ms)
+
+        async def on_create_end(session, ctx, params):
+            acquired(ctx)
+            self._connections_created += 1
+            self._record_pool_event("created")
+
+        async def on_reuse(session, ctx, params):
+            acquired(ctx)
+            self._connections_reused += 1
+            self._record_pool_event("reused")
+
+        trace_config.on_request_end.append(on_request_done)
+        trace_config.on_request_exception.append(on_request_done)
+        trace_config.on_connection_queued_start.append(on_queued_start)
+        trace_config.on_connection_queued_end.append(on_queued_end)
+        trace_config.on_connection_create_end.append(on_create_end)
+        trace_config.on_connection_reuseconn.append(on_reuse)
+        return trace_config
+
+    def _record_pool_event(self, event: str, wait_ms: Optional[float] = None):
+        """Forward a pool event with the current occupancy snapshot"""
+        if not self.telemetry_manager:
+            return
+        stats = self.get_pool_stats()
+        self.telemetry_manager.record_connection_pool_event(
+            event,
+            wait_ms=wait_ms,
+            in_use=stats.get("in_use"),
+            limit=stats.get("limit")
+        )
+
+    def get_pool_stats(self) -> Dict[str, Any]:
+        """
+        Get current connection pool occupancy
+
+        ``in_use`` counts requests from the moment they get a connection
+        until their response headers arrive. aiohttp signals nothing when a
+        connection returns to the pool, so a response whose body is still
+        being read is not counted. The connection counts cover the current
+        pool.
+
+        Returns:
+            Dictionary with pool limits, in-use requests and connection counts
+        """
+        pool = self.config.pool
+        stats: Dict[str, Any] = {
+            "limit": pool.max_connections,
+            "limit_per_host": pool.max_connections_per_host,
+            "keepalive_timeout": pool.keepalive_timeout,
+            "in_use": 0,
+            "connections_created": 0,
+            "connections_reused": 0,
+            "inflight_gets": len(self._inflight),
+        }
+        if self._session is None or self._session.closed:
+            return stats
+
+        stats["in_use"] = self._requests_in_flight
+        stats["connections_created"] = self._connections_created
+        stats["connections_reused"] = self._connections_reused
+        return stats
+
     async def _get_headers(self) -> Dict[str, str]:
         """
         Get HTTP headers with valid OAuth token
@@ -82,7 +265,7 @@ class DatasphereAuthConnector:
         token = await self.oauth_handler.get_token()
 
         return {
-            'Authorization': f'{token.token_type} {token.access_token}',
+            'Authorization': token.authorization,
             'Accept': 'application/json',
             'Content-Type': 'application/json',
             'User-Agent': 'Datasphere-Metadata-Sync/2.0'  # Required for API access
@@ -129,60 +312,169 @@ class DatasphereAuthConnector:
         """
         headers = await self._get_headers()
         url = f"{self.config.base_url}/{endpoint.lstrip('/')}"
+        session = self._ensure_session()
+
+        with span("upstream_http"):
+            try:
+                async with session.request(
+                    method=method,
+                    url=url,
+                    headers=headers,
+                    params=params,
+                    json=data,
+                    timeout=aiohttp.ClientTimeout(total=30)
+                ) as response:
+                    if response.status == 401:
+                        # Token might be expired, try refreshing
+                        logger.warning("Received 401, refreshing token...")
+                        await self.oauth_handler.get_token(force_refresh=True)
+
+                        # Retry with new token
+                        headers = await self._get_headers()
+                        async with session.request(
+                            method=method,
+                            url=url,
+                            headers=headers,
+                            params=params,
+                            json=data,
+                            timeout=aiohttp.ClientTimeout(total=30)
+                        ) as retry_response:
+                            retry_response.raise_for_status()
+
+                            # Check content-type before parsing JSON
+                            content_type = retry_response.headers.get('content-type', '').lower()
+                            if 'text/html' in content_type:
+                                raise ValueError(f"API returned HTML instead of JSON. This endpoint may be UI-only or not available via REST API. URL: {url}")
+
+                            return await retry_response.json()
+
+                    response.raise_for_status()
+
+                    # Check content-type before parsing JSON
+                    content_type = response.headers.get('content-type', '').lower()
+                    if 'text/html' in content_type:
+                        raise ValueError(f"API returned HTML instead of JSON. This endpoint may be UI-only or not available via REST API. URL: {url}")
+
+                    return await response.json()
+
+            except aiohttp.ClientError as e:
+                logger.error(f"API request failed: {method} {url} - {str(e)}")
+                raise
+
+    async def fetch_text(
+        self,
+        endpoint: str,
+        accept: str = 'application/xml',
+        timeout: float = 30
+    ) -> Tuple[int, str]:
+        """
+        Make authenticated GET request for a non-JSON body (e.g. ``$metadata``)
 
-        if not self._session:
-            self._session = aiohttp.ClientSession()
+        Does not raise on HTTP error status, so callers that branch on the
+        status code (404 on optional endpoints, soft-failing lookups) can.
 
-        try:
-            async with self._session.request(
-                method=method,
-                url=url,
-                headers=headers,
-                params=params,
-                json=data,
-                timeout=aiohttp.ClientTimeout(total=30)
-            ) as response:
-                if response.status == 401:
-                    # Token might be expired, try refreshing
-                    logger.warning("Received 401, refreshing token...")
-                    await self.oauth_handler.get_token(force_refresh=True)
-
-                    # Retry with new token
-                    headers = await self._get_headers()
-                    async with self._session.request(
-                        method=method,
-                        url=url,
-                        headers=headers,
-                        params=params,
-                        json=data,
-                        timeout=aiohttp.ClientTimeout(total=30)
-                    ) as retry_response:
-                        retry_response.raise_for_status()
-
-                        # Check content-type before parsing JSON
-                        content_type = retry_response.headers.get('content-type', '').lower()
-                        if 'text/html' in content_type:
-                            raise ValueError(f"API returned HTML instead of JSON. This endpoint may be UI-only or not available via REST API. URL: {url}")
-
-                        return await retry_response.json()
-
-                response.raise_for_status()
-
-                # Check content-type before parsing JSON
-                content_type = response.headers.get('content-type', '').lower()
-                if 'text/html' in content_type:
-                    raise ValueError(f"API returned HTML instead of JSON. This endpoint may be UI-only or not available via REST API. URL: {url}")
-
-                return await response.json()
-
-        except aiohttp.ClientError as e:
-            logger.error(f"API request failed: {method} {url} - {str(e)}")
-            raise
+        Args:
+            endpoint: API endpoint (relative to base_url)
+            accept: Accept header value
+            timeout: Total request timeout in seconds
+
+        Returns:
+            Tuple of (status_code, response_text)
+        """
+        status, text, _ = await self._request_text(endpoint, accept, timeout, raise_for_status=False)
+        return status, text
+
+    async def fetch_text_conditional(
+        self,
+        endpoint: str,
+        etag: Optional[str] = None,
+        accept: str = 'application/xml',
+        timeout: float = 30
+    ) -> Tuple[int, str, Optional[str]]:
+        """
+        Make authenticated GET request, revalidating a cached body by ETag
+
+        With ``etag`` set, sends ``If-None-Match``; an unchanged resource then
+        answers 304 with an empty body instead of re-sending it.
+
+        Args:
+            endpoint: API endpoint (relative to base_url)
+            etag: ETag of the cached copy, if any
+            accept: Accept header value
+            timeout: Total request timeout in seconds
+
+        Returns:
+            Tuple of (status_code, response_text, response_etag)
+        """
+        return await self._request_text(
+            endpoint, accept, timeout, raise_for_status=False, if_none_match=etag
+        )
+
+    async def get_text(
+        self,
+        endpoint: str,
+        accept: str = 'application/xml',
+        timeout: float = 30
+    ) -> str:
+        """
+        Make authenticated GET request and return the body as text
+
+        Args:
+            endpoint: API endpoint (relative to base_url)
+            accept: Accept header value
+            timeout: Total request timeout in seconds
+
+        Returns:
+            Response body as text
+
+        Raises:
+            aiohttp.ClientResponseError: On non-2xx status
+        """
+        _, text, _ = await self._request_text(endpoint, accept, timeout, raise_for_status=True)
+        return text
+
+    async def _request_text(
+        self,
+        endpoint: str,
+        accept: str,
+        timeout: float,
+        raise_for_status: bool,
+        if_none_match: Optional[str] = None
+    ) -> Tuple[int, str, Optional[str]]:
+        """Shared text-body GET through the pooled session, with one 401 retry"""
+        url = f"{self.config.base_url}/{endpoint.lstrip('/')}"
+        session = self._ensure_session()
+
+        with span("upstream_http"):
+            for attempt in range(2):
+                headers = await self._get_headers()
+                headers['Accept'] = accept
+                if if_none_match:
+                    headers['If-None-Match'] = if_none_match
+
+                async with session.get(
+                    url,
+                    headers=headers,
+                    timeout=aiohttp.ClientTimeout(total=timeout)
+                ) as response:
+                    if response.status == 401 and attempt == 0:
+                        logger.warning("Received 401, refreshing token...")
+                        await self.oauth_handler.get_token(force_refresh=True)
+                        continue
+
+                    if raise_for_status:
+                        response.raise_for_status()
+                    return response.status, await response.text(), response.headers.get('ETag')
+
+            raise OAuthError("Request still unauthorized after token refresh")
 
     async def get(self, endpoint: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """
         Make authenticated GET request
 
+        Identical GETs that are already in flight (same endpoint, params and
+        token scope) share one upstream call instead of each issuing their own.
+
         Args:
             endpoint: API endpoint
             params: Optional query parameters
@@ -190,7 +482,48 @@ class DatasphereAuthConnector:
         Returns:
             Response data as dictionary
         """
-        return await self._make_request('GET', endpoint, params=params)
+        if not self.config.pool.coalesce_gets:
+            return await self._make_request('GET', endpoint, params=params)
+
+        key = self._coalesce_key(endpoint, params)
+        entry = self._inflight.get(key)
+
+        if entry is None:
+            task = asyncio.ensure_future(self._make_request('GET', endpoint, params=params))
+            entry = [task, 1]
+            self._inflight[key] = entry
+            task.add_done_callback(lambda t, k=key, e=entry: self._finish_inflight(k, e, t))
+        else:
+            entry[1] += 1
+            self._record_pool_event("coalesced")
+            logger.debug(f"Coalesced GET {endpoint} with in-flight request ({entry[1]} waiters)")
+            # The shared request is timed in its creator's trace; time the
+            # wait here so this call's breakdown still shows it
+            with span("upstream_http"):
+                result = await asyncio.shield(entry[0])
+            return copy.deepcopy(result)
+
+        # Shield so one cancelled caller does not cancel the call for the others
+        result = await asyncio.shield(entry[0])
+
+        # Handlers annotate and mutate responses in place, so once a response
+        # is shared every waiter gets its own copy
+        return copy.deepcopy(result) if entry[1] > 1 else result
+
+    def _coalesce_key(self, endpoint: str, params: Optional[Dict[str, Any]]) -> Tuple:
+        """Identity of a GET for coalescing: endpoint, normalized params, token scope"""
+        normalized = tuple(sorted(
+            (str(k), str(v)) for k, v in (params or {}).items() if v is not None
+        ))
+        return (endpoint.lstrip('/'), normalized, self.config.client_id, self.config.scope)
+
+    def _finish_inflight(self, key: Tuple, entry: List[Any], task: "asyncio.Future") -> None:
+        """Drop a completed GET from the in-flight table"""
+        if self._inflight.get(key) is entry:
+            del self._inflight[key]
+        # Mark the exception retrieved; waiters still see it through the shield
+        if not task.cancelled():
+            task.exception()
 
     async def post(self, endpoint: str, data: Optional[Dict[str, Any]] = None, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """
@@ -354,12 +687,9 @@ class DatasphereAuthConnector:
             # Use spaces endpoint (returns JSON with list of spaces)
             url = f"{self.config.base_url}/api/v1/datasphere/consumption/catalog/spaces"
             headers = await self._get_headers()
+            session = self._ensure_session()
 
-            # Ensure session is created
-            if not self._session:
-                self._session = aiohttp.ClientSession()
-
-            async with self._session.get(url, headers=headers, timeout=aiohttp.ClientTimeout(total=10)) as response:
+            async with session.get(url, headers=headers, timeout=aiohttp.ClientTimeout(total=10)) as response:
                 if response.status == 200:
                     return {
                         'connected': True,
@@ -384,12 +714,18 @@ class DatasphereAuthConnector:
 
     async def close(self):
         """Close the connector and cleanup resources"""
+        for task, _ in list(self._inflight.values()):
+            task.cancel()
+        self._inflight.clear()
+
         if self._session:
             await self._session.close()
             self._session = None
+            self._connector = None
 
         if self.oauth_handler:
             await self.oauth_handler.revoke_token()
+            await self.oauth_handler.close()
 
         logger.info("Datasphere connector closed")
 
@@ -7,7 +7,7 @@ ensure data integrity, and validate tool parameters.
 
 import re
 import logging
-from typing import Any, Dict, List, Optional, Set, Tuple
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
 from enum import Enum
 from dataclasses import dataclass
 
@@ -90,6 +90,13 @@ class InputValidator:
     # Valid space ID pattern (alphanumeric + underscore + hyphen)
     SPACE_ID_PATTERN = r'^[A-Z][A-Z0-9_-]*$'
 
+    # Connection types accepted by CONNECTION_TYPE rules
+    VALID_CONNECTION_TYPES = {
+        'SAP_ERP', 'SALESFORCE', 'EXTERNAL', 'SAP_S4HANA',
+        'SAP_BW', 'SNOWFLAKE', 'DATABRICKS', 'POSTGRESQL',
+        'MYSQL', 'ORACLE', 'SQLSERVER', 'HANA'
+    }
+
     def __init__(self, strict_mode: bool = True):
         """
         Initialize input validator
@@ -98,7 +105,6 @@ class InputValidator:
             strict_mode: If True, validation is more restrictive
         """
         self.strict_mode = strict_mode
-        self._validation_errors: List[str] = []
         logger.info(f"Input validator initialized (strict_mode={strict_mode})")
 
     def validate_params(
@@ -109,6 +115,9 @@ class InputValidator:
         """
         Validate parameters against a set of rules
 
+        For rules that are applied repeatedly, compile them once with
+        ``compile_rules`` and call ``ValidationPlan.validate`` instead.
+
         Args:
             params: Parameters to validate
             rules: Validation rules to apply
@@ -116,234 +125,245 @@ class InputValidator:
         Returns:
             Tuple of (is_valid, error_messages)
         """
-        self._validation_errors = []
+        return self.compile_rules(rules).validate(params)
 
-        for rule in rules:
-            value = params.get(rule.param_name)
+    @classmethod
+    def compile_rules(cls, rules: List[ValidationRule]) -> "ValidationPlan":
+        """
+        Compile rules into a reusable validation plan
 
-            # Check if required parameter is missing
-            if rule.required and value is None:
-                self._validation_errors.append(
-                    f"Required parameter '{rule.param_name}' is missing"
-                )
-                continue
+        Each rule becomes a checker bound to its own parameters, with any
+        pattern compiled up front.
 
-            # Skip validation if parameter is optional and not provided
-            if not rule.required and value is None:
-                continue
-
-            # Validate based on type
-            try:
-                self._validate_by_type(rule, value)
-            except ValidationError as e:
-                self._validation_errors.append(str(e))
+        Args:
+            rules: Validation rules to compile
 
-        is_valid = len(self._validation_errors) == 0
-        return is_valid, self._validation_errors
+        Returns:
+            ValidationPlan that can be applied to any number of calls
+        """
+        return ValidationPlan(tuple(
+            (rule.param_name, rule.required, _CHECKER_FACTORIES[rule.validation_type](rule))
+            for rule in rules
+        ))
 
-    def _validate_by_type(self, rule: ValidationRule, value: Any):
-        """Validate value based on validation type"""
+    # -- checker factories (one per ValidationType) ---------------------
 
-        if rule.validation_type == ValidationType.STRING:
-            self._validate_string(rule, value)
+    @staticmethod
+    def _string_checker(rule: ValidationRule) -> "Checker":
+        """Validate string parameter"""
+        name = rule.param_name
+        pattern = re.compile(rule.pattern) if rule.pattern else None
+        allowed = rule.allowed_values
 
-        elif rule.validation_type == ValidationType.INTEGER:
-            self._validate_integer(rule, value)
+        def check(value: Any):
+            if not isinstance(value, str):
+                raise ValidationError(
+                    f"Parameter '{name}' must be a string"
+                )
 
-        elif rule.validation_type == ValidationType.BOOLEAN:
-            self._validate_boolean(rule, value)
+            # Check empty string
+            if not rule.allow_empty and len(value.strip()) == 0:
+                raise ValidationError(
+                    f"Parameter '{name}' cannot be empty"
+                )
 
-        elif rule.validation_type == ValidationType.ENUM:
-            self._validate_enum(rule, value)
+            # Check length constraints
+            if rule.min_length and len(value) < rule.min_length:
+                raise ValidationError(
+                    f"Parameter '{name}' must be at least "
+                    f"{rule.min_length} characters"
+                )
 
-        elif rule.validation_type == ValidationType.SPACE_ID:
-            self._validate_space_id(rule, value)
+            if rule.max_length and len(value) > rule.max_length:
+                raise ValidationError(
+                    f"Parameter '{name}' must not exceed "
+                    f"{rule.max_length} characters"
+                )
 
-        elif rule.validation_type == ValidationType.TABLE_NAME:
-            self._validate_table_name(rule, value)
+            # Check pattern
+            if pattern and not pattern.match(value):
+                raise ValidationError(
+                    f"Parameter '{name}' does not match required pattern"
+                )
 
-        elif rule.validation_type == ValidationType.SQL_QUERY:
-            self._validate_sql_query(rule, value)
+            # Honour allowed_values on STRING rules too, not only on ENUM ones.
+            # Several rules were written as STRING + allowed_values and silently
+            # enforced nothing, because only the ENUM check consulted the field.
+            if allowed and value not in allowed:
+                raise ValidationError(
+                    f"Parameter '{name}' must be one of: "
+                    f"{', '.join(sorted(allowed))}"
+                )
 
-        elif rule.validation_type == ValidationType.CONNECTION_TYPE:
-            self._validate_connection_type(rule, value)
+        return check
 
-    def _validate_string(self, rule: ValidationRule, value: Any):
-        """Validate string parameter"""
-        if not isinstance(value, str):
-            raise ValidationError(
-                f"Parameter '{rule.param_name}' must be a string"
-            )
-
-        # Check empty string
-        if not rule.allow_empty and len(value.strip()) == 0:
-            raise ValidationError(
-                f"Parameter '{rule.param_name}' cannot be empty"
-            )
-
-        # Check length constraints
-        if rule.min_length and len(value) < rule.min_length:
-            raise ValidationError(
-                f"Parameter '{rule.param_name}' must be at least "
-                f"{rule.min_length} characters"
-            )
-
-        if rule.max_length and len(value) > rule.max_length:
-            raise ValidationError(
-                f"Parameter '{rule.param_name}' must not exceed "
-                f"{rule.max_length} characters"
-            )
-
-        # Check pattern
-        if rule.pattern and not re.match(rule.pattern, value):
-            raise ValidationError(
-                f"Parameter '{rule.param_name}' does not match required pattern"
-            )
-
-        # Honour allowed_values on STRING rules too, not only on ENUM ones.
-        # Several rules were written as STRING + allowed_values and silently
-        # enforced nothing, because only _validate_enum consulted the field.
-        if rule.allowed_values and value not in rule.allowed_values:
-            raise ValidationError(
-                f"Parameter '{rule.param_name}' must be one of: "
-                f"{', '.join(sorted(rule.allowed_values))}"
-            )
-
-    def _validate_integer(self, rule: ValidationRule, value: Any):
+    @staticmethod
+    def _integer_checker(rule: ValidationRule) -> "Checker":
         """Validate integer parameter"""
-        if not isinstance(value, int):
-            raise ValidationError(
-                f"Parameter '{rule.param_name}' must be an integer"
-            )
+        message = f"Parameter '{rule.param_name}' must be an integer"
+
+        def check(value: Any):
+            if not isinstance(value, int):
+                raise ValidationError(message)
 
-    def _validate_boolean(self, rule: ValidationRule, value: Any):
+        return check
+
+    @staticmethod
+    def _boolean_checker(rule: ValidationRule) -> "Checker":
         """Validate boolean parameter"""
-        if not isinstance(value, bool):
-            raise ValidationError(
-                f"Parameter '{rule.param_name}' must be a boolean"
-            )
+        message = f"Parameter '{rule.param_name}' must be a boolean"
+
+        def check(value: Any):
+            if not isinstance(value, bool):
+                raise ValidationError(message)
 
-    def _validate_enum(self, rule: ValidationRule, value: Any):
+        return check
+
+    @staticmethod
+    def _enum_checker(rule: ValidationRule) -> "Checker":
         """Validate enum parameter"""
-        if not isinstance(value, str):
-            raise ValidationError(
-                f"Parameter '{rule.param_name}' must be a string"
-            )
-
-        if rule.allowed_values and value not in rule.allowed_values:
-            raise ValidationError(
-                f"Parameter '{rule.param_name}' must be one of: "
-                f"{', '.join(rule.allowed_values)}"
-            )
-
-    def _validate_space_id(self, rule: ValidationRule, value: Any):
+        name = rule.param_name
+        allowed = rule.allowed_values
+
+        def check(value: Any):
+            if not isinstance(value, str):
+                raise ValidationError(
+                    f"Parameter '{name}' must be a string"
+                )
+
+            if allowed and value not in allowed:
+                raise ValidationError(
+                    f"Parameter '{name}' must be one of: "
+                    f"{', '.join(allowed)}"
+                )
+
+        return check
+
+    @staticmethod
+    def _space_id_checker(rule: ValidationRule) -> "Checker":
         """Validate SAP Datasphere space ID"""
-        if not isinstance(value, str):
-            raise ValidationError(
-                f"Parameter '{rule.param_name}' must be a string"
-            )
-
-        # Space IDs are typically uppercase with underscores/hyphens
-        if not re.match(self.SPACE_ID_PATTERN, value):
-            raise ValidationError(
-                f"Parameter '{rule.param_name}' is not a valid space ID. "
-                f"Must start with uppercase letter and contain only "
-                f"uppercase letters, numbers, underscores, or hyphens."
-            )
-
-        # Check length
-        if len(value) < 2 or len(value) > 64:
-            raise ValidationError(
-                f"Parameter '{rule.param_name}' must be 2-64 characters"
-            )
-
-    def _validate_table_name(self, rule: ValidationRule, value: Any):
+        name = rule.param_name
+
+        def check(value: Any):
+            if not isinstance(value, str):
+                raise ValidationError(
+                    f"Parameter '{name}' must be a string"
+                )
+
+            # Space IDs are typically uppercase with underscores/hyphens
+            if not _SPACE_ID_RE.match(value):
+                raise ValidationError(
+                    f"Parameter '{name}' is not a valid space ID. "
+                    f"Must start with uppercase letter and contain only "
+                    f"uppercase letters, numbers, underscores, or hyphens."
+                )
+
+            # Check length
+            if len(value) < 2 or len(value) > 64:
+                raise ValidationError(
+                    f"Parameter '{name}' must be 2-64 characters"
+                )
+
+        return check
+
+    @staticmethod
+    def _table_name_checker(rule: ValidationRule) -> "Checker":
         """Validate table/view name"""
-        if not isinstance(value, str):
-            raise ValidationError(
-                f"Parameter '{rule.param_name}' must be a string"
-            )
-
-        # Table names must be valid identifiers
-        if not re.match(self.IDENTIFIER_PATTERN, value):
-            raise ValidationError(
-                f"Parameter '{rule.param_name}' is not a valid table name. "
-                f"Must start with a letter and contain only letters, "
-                f"numbers, or underscores."
-            )
-
-        # Check length
-        if len(value) < 1 or len(value) > 128:
-            raise ValidationError(
-                f"Parameter '{rule.param_name}' must be 1-128 characters"
-            )
-
-    def _validate_sql_query(self, rule: ValidationRule, value: Any):
+        name = rule.param_name
+
+        def check(value: Any):
+            if not isinstance(value, str):
+                raise ValidationError(
+                    f"Parameter '{name}' must be a string"
+                )
+
+            # Table names must be valid identifiers
+            if not _IDENTIFIER_RE.match(value):
+                raise ValidationError(
+                    f"Parameter '{name}' is not a valid table name. "
+                    f"Must start with a letter and contain only letters, "
+                    f"numbers, or underscores."
+                )
+
+            # Check length
+            if len(value) < 1 or len(value) > 128:
+                raise ValidationError(
+                    f"Parameter '{name}' must be 1-128 characters"
+                )
+
+        return check
+
+    @staticmethod
+    def _sql_query_checker(rule: ValidationRule) -> "Checker":
         """
         Validate SQL query for safety
 
         This is a read-only MCP server, so we only allow SELECT queries
         and block any potentially dangerous operations.
         """
-        if not isinstance(value, str):
-            raise ValidationError(
-                f"Parameter '{rule.param_name}' must be a string"
-            )
-
-        query = value.strip().upper()
-
-        # Check if query is too long (potential DoS)
-        if len(value) > 10000:
-            raise ValidationError(
-                f"Parameter '{rule.param_name}' exceeds maximum query length (10000 characters)"
-            )
-
-        # Must start with SELECT
-        if not query.startswith('SELECT'):
-            raise ValidationError(
-                f"Only SELECT queries are allowed. "
-                f"Query must start with SELECT."
-            )
-
-        # Check for dangerous keywords
-        for keyword in self.SQL_DANGEROUS_KEYWORDS:
-            if re.search(rf'\b{keyword}\b', query):
+        name = rule.param_name
+
+        def check(value: Any):
+            if not isinstance(value, str):
+                raise ValidationError(
+                    f"Parameter '{name}' must be a string"
+                )
+
+            query = value.strip().upper()
+
+            # Check if query is too long (potential DoS)
+            if len(value) > 10000:
+                raise ValidationError(
+                    f"Parameter '{name}' exceeds maximum query length (10000 characters)"
+                )
+
+            # Must start with SELECT
+            if not query.startswith('SELECT'):
+                raise ValidationError(
+                    f"Only SELECT queries are allowed. "
+                    f"Query must start with SELECT."
+                )
+
+            # Check for dangerous keywords
+            keyword = _DANGEROUS_KEYWORD_RE.search(query)
+            if keyword:
                 raise ValidationError(
-                    f"Query contains forbidden keyword: {keyword}"
+                    f"Query contains forbidden keyword: {keyword.group(1)}"
                 )
 
-        # Check for SQL injection patterns
-        for pattern in self.SQL_INJECTION_PATTERNS:
-            if re.search(pattern, value, re.IGNORECASE):
+            # Check for SQL injection patterns
+            if _INJECTION_RE.search(value):
                 raise ValidationError(
                     f"Query contains potentially malicious pattern and was blocked"
                 )
 
-        # Check for SQL comments (could hide malicious code)
-        for pattern in self.SQL_COMMENT_PATTERNS:
-            if re.search(pattern, value):
+            # Check for SQL comments (could hide malicious code)
+            if _COMMENT_RE.search(value):
                 raise ValidationError(
                     f"SQL comments are not allowed in queries"
                 )
 
-    def _validate_connection_type(self, rule: ValidationRule, value: Any):
+        return check
+
+    @staticmethod
+    def _connection_type_checker(rule: ValidationRule) -> "Checker":
         """Validate connection type"""
-        valid_types = {
-            'SAP_ERP', 'SALESFORCE', 'EXTERNAL', 'SAP_S4HANA',
-            'SAP_BW', 'SNOWFLAKE', 'DATABRICKS', 'POSTGRESQL',
-            'MYSQL', 'ORACLE', 'SQLSERVER', 'HANA'
-        }
+        name = rule.param_name
+        valid_types = InputValidator.VALID_CONNECTION_TYPES
 
-        if not isinstance(value, str):
-            raise ValidationError(
-                f"Parameter '{rule.param_name}' must be a string"
-            )
+        def check(value: Any):
+            if not isinstance(value, str):
+                raise ValidationError(
+                    f"Parameter '{name}' must be a string"
+                )
 
-        if value.upper() not in valid_types:
-            raise ValidationError(
-                f"Parameter '{rule.param_name}' must be a valid connection type: "
-                f"{', '.join(valid_types)}"
-            )
+            if value.upper() not in valid_types:
+                raise ValidationError(
+                    f"Parameter '{name}' must be a valid connection type: "
+                    f"{', '.join(valid_types)}"
+                )
+
+        return check
 
     def sanitize_sql_query(self, query: str) -> str:
         """
@@ -377,6 +397,76 @@ class InputValidator:
         }
 
 
+Checker = Callable[[Any], None]
+
+# Compiled once; the checkers above run on every tool call
+_SPACE_ID_RE = re.compile(InputValidator.SPACE_ID_PATTERN)
+_IDENTIFIER_RE = re.compile(InputValidator.IDENTIFIER_PATTERN)
+_DANGEROUS_KEYWORD_RE = re.compile(
+    r'\b(' + '|'.join(sorted(InputValidator.SQL_DANGEROUS_KEYWORDS)) + r')\b'
+)
+_INJECTION_RE = re.compile(
+    '|'.join(f'(?:{p})' for p in InputValidator.SQL_INJECTION_PATTERNS), re.IGNORECASE
+)
+_COMMENT_RE = re.compile('|'.join(f'(?:{p})' for p in InputValidator.SQL_COMMENT_PATTERNS))
+
+_CHECKER_FACTORIES: Dict[ValidationType, Callable[[ValidationRule], Checker]] = {
+    ValidationType.STRING: InputValidator._string_checker,
+    ValidationType.INTEGER: InputValidator._integer_checker,
+    ValidationType.BOOLEAN: InputValidator._boolean_checker,
+    ValidationType.ENUM: InputValidator._enum_checker,
+    ValidationType.SPACE_ID: InputValidator._space_id_checker,
+    ValidationType.TABLE_NAME: InputValidator._table_name_checker,
+    ValidationType.SQL_QUERY: InputValidator._sql_query_checker,
+    ValidationType.CONNECTION_TYPE: InputValidator._connection_type_checker,
+}
+
+
+class ValidationPlan:
+    """
+    A tool's validation rules compiled into pre-bound checkers
+
+    Holds no per-call state: errors are collected in a local list, so one
+    plan can validate concurrent calls.
+    """
+
+    __slots__ = ("_steps",)
+
+    def __init__(self, steps: Tuple[Tuple[str, bool, Checker], ...]):
+        self._steps = steps
+
+    def __len__(self) -> int:
+        return len(self._steps)
+
+    def validate(self, params: Dict[str, Any]) -> Tuple[bool, List[str]]:
+        """
+        Validate parameters against the compiled rules
+
+        Args:
+            params: Parameters to validate
+
+        Returns:
+            Tuple of (is_valid, error_messages)
+        """
+        errors: List[str] = []
+
+        for param_name, required, check in self._steps:
+            value = params.get(param_name)
+
+            # Missing: an error if required, otherwise nothing to validate
+            if value is None:
+                if required:
+                    errors.append(f"Required parameter '{param_name}' is missing")
+                continue
+
+            try:
+                check(value)
+            except ValidationError as e:
+                errors.append(str(e))
+
+        return not errors, errors
+
+
 # Convenience function for quick validation
 def validate_tool_params(
     params: Dict[str, Any],
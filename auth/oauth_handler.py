@@ -6,12 +6,18 @@ Implements client credentials flow with automatic token refresh
 
 import asyncio
 import logging
+import os
 import time
 from dataclasses import dataclass
 from datetime import datetime, timedelta
-from typing import Optional, Dict, Any
+from functools import cached_property
+from typing import Callable, Optional, Dict, Any, TYPE_CHECKING
 import aiohttp
-from cryptography.fernet import Fernet
+
+from tracing import span
+
+if TYPE_CHECKING:
+    from telemetry import TelemetryManager
 
 logger = logging.getLogger(__name__)
 
@@ -45,6 +51,9 @@ class OAuthToken:
     # Internal tracking
     acquired_at: float = None
 
+    # Considered expired this many seconds before the actual expiration
+    EXPIRY_BUFFER_SECONDS = 60
+
     def __post_init__(self):
         """Initialize acquisition timestamp"""
         if self.acquired_at is None:
@@ -58,9 +67,12 @@ class OAuthToken:
     @property
     def is_expired(self) -> bool:
         """Check if token has expired"""
-        # Consider token expired 60 seconds before actual expiration
-        buffer = 60
-        return time.time() >= (self.expires_at - buffer)
+        return time.time() >= (self.expires_at - self.EXPIRY_BUFFER_SECONDS)
+
+    @cached_property
+    def authorization(self) -> str:
+        """``Authorization`` header value, built once per token"""
+        return f"{self.token_type} {self.access_token}"
 
     @property
     def time_until_expiry(self) -> float:
@@ -81,11 +93,15 @@ class OAuthHandler:
     Features:
     - Client credentials grant flow
     - Automatic token refresh
-    - Encrypted token storage in memory
-    - Thread-safe token access
+    - Proactive background renewal at a fraction of the token lifetime
+    - Token requests over a persistent (by default the connector's pooled) session
+    - Lock-free reads of a valid token; renewals are serialized
     - Retry logic with exponential backoff
     """
 
+    # Backoff between failed background renewals: 1 s, 2 s, 4 s ... up to this
+    RENEWAL_RETRY_MAX_SECONDS = 60.0
+
     def __init__(
         self,
         client_id: str,
@@ -93,7 +109,10 @@ class OAuthHandler:
         token_url: str,
         scope: Optional[str] = None,
         max_retries: int = 3,
-        retry_delay: float = 1.0
+        retry_delay: float = 1.0,
+        refresh_fraction: float = 0.8,
+        telemetry_manager: Optional["TelemetryManager"] = None,
+        session_provider: Optional[Callable[[], aiohttp.ClientSession]] = None
     ):
         """
         Initialize OAuth handler
@@ -105,6 +124,12 @@ class OAuthHandler:
             scope: Optional OAuth scope
             max_retries: Maximum retry attempts for token acquisition
             retry_delay: Initial retry delay in seconds (exponential backoff)
+            refresh_fraction: Renew the token in the background once this
+                fraction of its lifetime has passed (0 disables)
+            telemetry_manager: Optional telemetry manager for renewal metrics
+            session_provider: Returns the HTTP session token requests use
+                (e.g. the connector's pooled session); without it the handler
+                keeps one session of its own
         """
         self.client_id = client_id
         self.client_secret = client_secret
@@ -112,17 +137,21 @@ class OAuthHandler:
         self.scope = scope
         self.max_retries = max_retries
         self.retry_delay = retry_delay
+        self.refresh_fraction = refresh_fraction
+        self.telemetry_manager = telemetry_manager
 
-        # Token storage with encryption
-        self._encryption_key = Fernet.generate_key()
-        self._cipher = Fernet(self._encryption_key)
-        self._encrypted_token: Optional[bytes] = None
+        # The current token, held once in memory. There is no encrypted copy:
+        # a cipher key kept in the same process as the ciphertext protects nothing.
         self._token: Optional[OAuthToken] = None
+        self._session_provider = session_provider
+        self._session: Optional[aiohttp.ClientSession] = None
         self._lock = asyncio.Lock()
+        self._refresh_task: Optional[asyncio.Task] = None
 
         # Monitoring
         self._token_acquisition_count = 0
         self._token_refresh_count = 0
+        self._proactive_refresh_count = 0
         self._last_error: Optional[str] = None
 
         logger.info(f"OAuth handler initialized for token URL: {token_url}")
@@ -140,24 +169,109 @@ class OAuthHandler:
         Raises:
             TokenAcquisitionError: If token cannot be acquired
         """
-        async with self._lock:
-            # Return existing token if valid
-            if not force_refresh and self._token and not self._token.is_expired:
-                logger.debug(f"Using cached token (expires in {self._token.time_until_expiry:.0f}s)")
-                return self._token
+        # Hot path: a valid token is returned without touching the lock. The
+        # background refresher renews it before it gets here expired.
+        token = self._token
+        if not force_refresh and token is not None and not token.is_expired:
+            return token
+
+        with span("oauth_token"):
+            async with self._lock:
+                # Another caller may have renewed the token while we waited
+                current = self._token
+                if current is not None and not current.is_expired and (not force_refresh or current is not token):
+                    return current
+                return await self._renew(proactive=False)
+
+    async def _renew(self, proactive: bool) -> OAuthToken:
+        """
+        Obtain a new token (refresh grant if possible, else client credentials)
 
-            # Acquire new token
+        Must be called with ``_lock`` held.
+
+        Args:
+            proactive: Renewal by the background refresher rather than a caller
+
+        Returns:
+            New OAuthToken
+        """
+        started = time.perf_counter()
+        try:
             if self._token is None or not self._token.refresh_token:
                 logger.info("Acquiring new access token")
-                return await self._acquire_token()
+                token = await self._acquire_token()
+            else:
+                logger.info("Refreshing access token")
+                try:
+                    token = await self._refresh_token()
+                except TokenRefreshError:
+                    logger.warning("Token refresh failed, acquiring new token")
+                    token = await self._acquire_token()
+        except Exception:
+            self._record_renewal(started, success=False, proactive=proactive)
+            raise
+
+        self._record_renewal(started, success=True, proactive=proactive)
+        if proactive:
+            self._proactive_refresh_count += 1
+        self._start_refresher()
+        return token
+
+    def _record_renewal(self, started: float, success: bool, proactive: bool):
+        """Report a renewal's latency to telemetry"""
+        if self.telemetry_manager is not None:
+            self.telemetry_manager.record_token_refresh(
+                (time.perf_counter() - started) * 1000, success, proactive
+            )
+
+    def _start_refresher(self):
+        """Start the background refresher unless it is disabled or running"""
+        if self.refresh_fraction <= 0 or (self._refresh_task is not None and not self._refresh_task.done()):
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        self._refresh_task = loop.create_task(self._refresh_loop())
+
+    async def _refresh_loop(self):
+        """Renew each token once ``refresh_fraction`` of its lifetime has passed"""
+        failures = 0
+        while self._token is not None:
+            token = self._token
+            # Never later than the point where callers would see it expired
+            lifetime = token.expires_in * self.refresh_fraction
+            if token.expires_in > token.EXPIRY_BUFFER_SECONDS:
+                lifetime = min(lifetime, token.expires_in - token.EXPIRY_BUFFER_SECONDS)
+            lifetime = max(1.0, lifetime)
+            due_in = token.acquired_at + lifetime - time.time()
+            if due_in > 0:
+                await asyncio.sleep(due_in)
+                continue
 
-            # Refresh existing token
-            logger.info("Refreshing access token")
             try:
-                return await self._refresh_token()
-            except TokenRefreshError:
-                logger.warning("Token refresh failed, acquiring new token")
-                return await self._acquire_token()
+                async with self._lock:
+                    if self._token is token:
+                        await self._renew(proactive=True)
+                        logger.debug(f"Token renewed proactively ({self._token!r})")
+                failures = 0
+            except OAuthError as e:
+                # Callers keep using the current token while it is valid; once
+                # it is not, get_token renews on demand (and restarts this loop)
+                failures += 1
+                if token.is_expired:
+                    logger.warning(f"Proactive token renewal failed and the token has expired; "
+                                   f"renewing on the next request instead: {e}")
+                    return
+                retry_in = min(self.RENEWAL_RETRY_MAX_SECONDS, 2.0 ** (failures - 1))
+                logger.warning(f"Proactive token renewal failed, retrying in {retry_in:.0f}s: {e}")
+                await asyncio.sleep(retry_in)
+
+    def _stop_refresher(self):
+        """Cancel the background refresher"""
+        if self._refresh_task is not None:
+            self._refresh_task.cancel()
+            self._refresh_task = None
 
     async def _acquire_token(self) -> OAuthToken:
         """
@@ -186,39 +300,39 @@ class OAuthHandler:
         # Retry logic with exponential backoff
         for attempt in range(self.max_retries):
             try:
-                async with aiohttp.ClientSession() as session:
-                    async with session.post(
-                        self.token_url,
-                        data=payload,
-                        headers=headers,
-                        timeout=aiohttp.ClientTimeout(total=10)
-                    ) as response:
-                        if response.status == 200:
-                            data = await response.json()
-                            token = self._create_token_from_response(data)
-                            self._store_token(token)
-                            self._token_acquisition_count += 1
-                            self._last_error = None
-
-                            logger.info(f"Access token acquired successfully (expires in {token.expires_in}s)")
-                            return token
-                        else:
-                            error_text = await response.text()
-                            error_msg = f"Token acquisition failed: HTTP {response.status} - {error_text}"
-                            logger.error(error_msg)
-                            self._last_error = error_msg
-
-                            if response.status == 401:
-                                raise TokenAcquisitionError("Invalid client credentials")
-                            elif response.status >= 500:
-                                # Retry on server errors
-                                if attempt < self.max_retries - 1:
-                                    delay = self.retry_delay * (2 ** attempt)
-                                    logger.warning(f"Retrying in {delay}s... (attempt {attempt + 1}/{self.max_retries})")
-                                    await asyncio.sleep(delay)
-                                    continue
-
-                            raise TokenAcquisitionError(error_msg)
+                session = self._get_session()
+                async with session.post(
+                    self.token_url,
+                    data=payload,
+                    headers=headers,
+                    timeout=aiohttp.ClientTimeout(total=10)
+                ) as response:
+                    if response.status == 200:
+                        data = await response.json()
+                        token = self._create_token_from_response(data)
+                        self._store_token(token)
+                        self._token_acquisition_count += 1
+                        self._last_error = None
+
+                        logger.info(f"Access token acquired successfully (expires in {token.expires_in}s)")
+                        return token
+                    else:
+                        error_text = await response.text()
+                        error_msg = f"Token acquisition failed: HTTP {response.status} - {error_text}"
+                        logger.error(error_msg)
+                        self._last_error = error_msg
+
+                        if response.status == 401:
+                            raise TokenAcquisitionError("Invalid client credentials")
+                        elif response.status >= 500:
+                            # Retry on server errors
+                            if attempt < self.max_retries - 1:
+                                delay = self.retry_delay * (2 ** attempt)
+                                logger.warning(f"Retrying in {delay}s... (attempt {attempt + 1}/{self.max_retries})")
+                                await asyncio.sleep(delay)
+                                continue
+
+                        raise TokenAcquisitionError(error_msg)
 
             except aiohttp.ClientError as e:
                 error_msg = f"Network error during token acquisition: {str(e)}"
@@ -266,28 +380,28 @@ class OAuthHandler:
         }
 
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    self.token_url,
-                    data=payload,
-                    headers=headers,
-                    timeout=aiohttp.ClientTimeout(total=10)
-                ) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        token = self._create_token_from_response(data)
-                        self._store_token(token)
-                        self._token_refresh_count += 1
-                        self._last_error = None
-
-                        logger.info(f"Token refreshed successfully (expires in {token.expires_in}s)")
-                        return token
-                    else:
-                        error_text = await response.text()
-                        error_msg = f"Token refresh failed: HTTP {response.status} - {error_text}"
-                        logger.error(error_msg)
-                        self._last_error = error_msg
-                        raise TokenRefreshError(error_msg)
+            session = self._get_session()
+            async with session.post(
+                self.token_url,
+                data=payload,
+                headers=headers,
+                timeout=aiohttp.ClientTimeout(total=10)
+            ) as response:
+                if response.status == 200:
+                    data = await response.json()
+                    token = self._create_token_from_response(data)
+                    self._store_token(token)
+                    self._token_refresh_count += 1
+                    self._last_error = None
+
+                    logger.info(f"Token refreshed successfully (expires in {token.expires_in}s)")
+                    return token
+                else:
+                    error_text = await response.text()
+                    error_msg = f"Token refresh failed: HTTP {response.status} - {error_text}"
+                    logger.error(error_msg)
+                    self._last_error = error_msg
+                    raise TokenRefreshError(error_msg)
 
         except aiohttp.ClientError as e:
             error_msg = f"Network error during token refresh: {str(e)}"
@@ -321,16 +435,33 @@ class OAuthHandler:
 
     def _store_token(self, token: OAuthToken):
         """
-        Store token with encryption
+        Make ``token`` the current token
 
         Args:
             token: Token to store
         """
         self._token = token
 
-        # Encrypt and store token for additional security
-        token_data = token.access_token.encode('utf-8')
-        self._encrypted_token = self._cipher.encrypt(token_data)
+    def _get_session(self) -> aiohttp.ClientSession:
+        """
+        Session for token requests
+
+        The provider's (pooled) session when there is one, else a persistent
+        session of this handler's own, so renewals reuse warm connections
+        instead of paying a TCP and TLS handshake each.
+        """
+        if self._session_provider is not None:
+            return self._session_provider()
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession()
+        return self._session
+
+    async def close(self):
+        """Stop background renewal and close the handler's own session"""
+        self._stop_refresher()
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
 
     async def revoke_token(self) -> bool:
         """
@@ -346,8 +477,8 @@ class OAuthHandler:
 
             # Note: Implement token revocation if SAP Datasphere supports it
             # For now, just clear the stored token
+            self._stop_refresher()
             self._token = None
-            self._encrypted_token = None
             logger.info("Token cleared from memory")
             return True
 
@@ -364,6 +495,8 @@ class OAuthHandler:
             'time_until_expiry': self._token.time_until_expiry if self._token else None,
             'acquisitions': self._token_acquisition_count,
             'refreshes': self._token_refresh_count,
+            'proactive_refreshes': self._proactive_refresh_count,
+            'background_refresh': self._refresh_task is not None and not self._refresh_task.done(),
             'last_error': self._last_error
         }
 
@@ -381,7 +514,10 @@ async def create_oauth_handler(
     client_secret: str,
     token_url: str,
     scope: Optional[str] = None,
-    acquire_token: bool = True
+    acquire_token: bool = True,
+    refresh_fraction: Optional[float] = None,
+    telemetry_manager: Optional["TelemetryManager"] = None,
+    session_provider: Optional[Callable[[], aiohttp.ClientSession]] = None
 ) -> OAuthHandler:
     """
     Create and initialize an OAuth handler
@@ -392,6 +528,10 @@ async def create_oauth_handler(
         token_url: Token endpoint URL
         scope: Optional OAuth scope
         acquire_token: If True, acquire initial token immediately
+        refresh_fraction: Lifetime fraction after which tokens are renewed in
+            the background (default: DATASPHERE_TOKEN_REFRESH_FRACTION, or 0.8)
+        telemetry_manager: Optional telemetry manager for renewal metrics
+        session_provider: Returns the HTTP session token requests use
 
     Returns:
         Initialized OAuthHandler
@@ -399,11 +539,17 @@ async def create_oauth_handler(
     Raises:
         TokenAcquisitionError: If initial token acquisition fails
     """
+    if refresh_fraction is None:
+        refresh_fraction = float(os.getenv("DATASPHERE_TOKEN_REFRESH_FRACTION", "0.8"))
+
     handler = OAuthHandler(
         client_id=client_id,
         client_secret=client_secret,
         token_url=token_url,
-        scope=scope
+        scope=scope,
+        refresh_fraction=refresh_fraction,
+        telemetry_manager=telemetry_manager,
+        session_provider=session_provider
     )
 
     if acquire_token:
@@ -6,8 +6,9 @@ Provides SQL injection prevention and query sanitization for database operations
 
 import re
 import logging
+from collections import OrderedDict
 from typing import Dict, List, Optional, Set, Tuple
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 from enum import Enum
 
 logger = logging.getLogger(__name__)
@@ -94,11 +95,24 @@ class SQLSanitizer:
         (r'#[^\n]*', ''),                   # MySQL comments
     ]
 
+    # Compiled once per process; analyze_query runs on every execute_query
+    _COMMENT_RE = re.compile('|'.join(p for p, _ in COMMENT_PATTERNS), re.DOTALL)
+    _BLOCKED_RE = re.compile(r'\b(' + '|'.join(sorted(BLOCKED_KEYWORDS)) + r')\b')
+    # One pass decides whether any injection pattern is present; the
+    # individual patterns only run to report a query that is being rejected
+    _INJECTION_RE = re.compile('|'.join(f'(?:{p})' for p in INJECTION_PATTERNS), re.IGNORECASE)
+    _INJECTION_RES = [re.compile(p, re.IGNORECASE) for p in INJECTION_PATTERNS]
+    _WHITESPACE_RE = re.compile(r'\s+')
+    _TABLE_RE = re.compile(r'\b(?:FROM|JOIN)\s+([a-zA-Z_][a-zA-Z0-9_\.]*)', re.IGNORECASE)
+    _SELECT_RE = re.compile(r'\bSELECT\b', re.IGNORECASE)
+    _IDENTIFIER_RE = re.compile(r'\b([a-zA-Z_][a-zA-Z0-9_\.]*)\b')
+
     def __init__(
         self,
         max_query_length: int = 10000,
         max_tables: int = 10,
-        allow_subqueries: bool = True
+        allow_subqueries: bool = True,
+        cache_size: int = 256
     ):
         """
         Initialize SQL sanitizer
@@ -107,22 +121,58 @@ class SQLSanitizer:
             max_query_length: Maximum allowed query length
             max_tables: Maximum number of tables in a query
             allow_subqueries: Whether to allow subqueries
+            cache_size: Analyses kept for repeated query texts (0 disables)
         """
         self.max_query_length = max_query_length
         self.max_tables = max_tables
         self.allow_subqueries = allow_subqueries
+        self.cache_size = max(0, cache_size)
+        self._cache: "OrderedDict[str, QueryAnalysis]" = OrderedDict()
+        self.cache_hits = 0
+        self.cache_misses = 0
         logger.info("SQL sanitizer initialized")
 
     def analyze_query(self, query: str) -> QueryAnalysis:
         """
         Analyze and sanitize a SQL query
 
+        Results are memoized per query text in a bounded LRU; each call gets
+        its own copy, so callers may modify the lists they receive.
+
         Args:
             query: SQL query to analyze
 
         Returns:
             QueryAnalysis with safety assessment and sanitized query
         """
+        cached = self._cache.get(query) if self.cache_size else None
+        if cached is not None:
+            self._cache.move_to_end(query)
+            self.cache_hits += 1
+            return self._copy(cached)
+
+        self.cache_misses += 1
+        analysis = self._analyze(query)
+        if self.cache_size:
+            self._cache[query] = analysis
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return self._copy(analysis)
+
+    def clear_cache(self):
+        """Forget memoized analyses (e.g. after changing the limits)"""
+        self._cache.clear()
+
+    @staticmethod
+    def _copy(analysis: QueryAnalysis) -> QueryAnalysis:
+        return replace(
+            analysis,
+            tables_accessed=list(analysis.tables_accessed),
+            warnings=list(analysis.warnings),
+            errors=list(analysis.errors)
+        )
+
+    def _analyze(self, query: str) -> QueryAnalysis:
         warnings: List[str] = []
         errors: List[str] = []
 
@@ -152,32 +202,26 @@ class SQLSanitizer:
                 sanitized_query=None
             )
 
-        # Step 3: Check for comments BEFORE removal (they're blocked)
-        for pattern, _ in self.COMMENT_PATTERNS:
-            if re.search(pattern, query, flags=re.DOTALL):
-                errors.append("SQL comments are not allowed in queries")
-                break
-
-        # Remove comments for further analysis
-        sanitized = query
-        for pattern, replacement in self.COMMENT_PATTERNS:
-            sanitized = re.sub(pattern, replacement, sanitized, flags=re.DOTALL)
+        # Step 3: Check for comments BEFORE removal (they're blocked), and
+        # remove them for further analysis in the same pass
+        sanitized, comment_count = self._COMMENT_RE.subn('', query)
+        if comment_count:
+            errors.append("SQL comments are not allowed in queries")
 
         # Step 4: Normalize whitespace
-        sanitized = re.sub(r'\s+', ' ', sanitized).strip()
+        sanitized = self._WHITESPACE_RE.sub(' ', sanitized).strip()
 
         # Step 5: Check for blocked keywords
-        upper_query = sanitized.upper()
-        for keyword in self.BLOCKED_KEYWORDS:
-            if re.search(rf'\b{keyword}\b', upper_query):
-                errors.append(f"Blocked keyword detected: {keyword}")
+        for keyword in dict.fromkeys(self._BLOCKED_RE.findall(sanitized.upper())):
+            errors.append(f"Blocked keyword detected: {keyword}")
 
         # Step 6: Check for injection patterns
-        for pattern in self.INJECTION_PATTERNS:
-            if re.search(pattern, sanitized, re.IGNORECASE):
-                errors.append(
-                    "Potential SQL injection pattern detected and blocked"
-                )
+        if self._INJECTION_RE.search(sanitized):
+            for pattern in self._INJECTION_RES:
+                if pattern.search(sanitized):
+                    errors.append(
+                        "Potential SQL injection pattern detected and blocked"
+                    )
 
         # Step 7: Validate operation type
         operation = self._detect_operation(sanitized)
@@ -227,37 +271,14 @@ class SQLSanitizer:
 
         This is a simplified implementation that looks for FROM and JOIN clauses.
         """
-        tables = []
-
-        # Pattern to match table names after FROM and JOIN
-        # Simplified: matches word characters, dots, and underscores
-        from_pattern = r'\bFROM\s+([a-zA-Z_][a-zA-Z0-9_\.]*)'
-        join_pattern = r'\bJOIN\s+([a-zA-Z_][a-zA-Z0-9_\.]*)'
-
-        # Find tables in FROM clause
-        from_matches = re.finditer(from_pattern, query, re.IGNORECASE)
-        for match in from_matches:
-            tables.append(match.group(1))
-
-        # Find tables in JOIN clauses
-        join_matches = re.finditer(join_pattern, query, re.IGNORECASE)
-        for match in join_matches:
-            tables.append(match.group(1))
-
-        # Remove duplicates while preserving order
-        seen = set()
-        unique_tables = []
-        for table in tables:
-            if table not in seen:
-                seen.add(table)
-                unique_tables.append(table)
-
-        return unique_tables
+        # Table names after FROM and JOIN (word characters, dots, underscores),
+        # duplicates removed, in order of appearance
+        return list(dict.fromkeys(self._TABLE_RE.findall(query)))
 
     def _has_subqueries(self, query: str) -> bool:
         """Check if query contains subqueries"""
         # Count SELECT keywords - if more than 1, likely has subqueries
-        select_count = len(re.findall(r'\bSELECT\b', query, re.IGNORECASE))
+        select_count = len(self._SELECT_RE.findall(query))
         return select_count > 1
 
     def _validate_identifiers(self, query: str) -> List[str]:
@@ -270,8 +291,7 @@ class SQLSanitizer:
 
         # Extract potential identifiers (simplified)
         # This pattern matches SQL identifiers
-        identifier_pattern = r'\b([a-zA-Z_][a-zA-Z0-9_\.]*)\b'
-        identifiers = re.findall(identifier_pattern, query)
+        identifiers = self._IDENTIFIER_RE.findall(query)
 
         for identifier in identifiers:
             # Check for suspicious patterns
@@ -326,7 +346,13 @@ class SQLSanitizer:
             "allow_subqueries": self.allow_subqueries,
             "allowed_operations": [op.value for op in SQLOperation],
             "blocked_keywords": list(self.BLOCKED_KEYWORDS),
-            "injection_patterns_detected": len(self.INJECTION_PATTERNS)
+            "injection_patterns_detected": len(self.INJECTION_PATTERNS),
+            "analysis_cache": {
+                "size": len(self._cache),
+                "max_size": self.cache_size,
+                "hits": self.cache_hits,
+                "misses": self.cache_misses
+            }
         }
 
 
@@ -4,8 +4,9 @@ Tool-specific validation rules for SAP Datasphere MCP Server
 Defines validation rules for each MCP tool to ensure safe parameter handling.
 """
 
+from functools import lru_cache
 from typing import Callable, Dict, List
-from auth.input_validator import ValidationRule, ValidationType
+from auth.input_validator import InputValidator, ValidationPlan, ValidationRule, ValidationType
 
 #: Identifiers that are interpolated into URL *path* segments rather than sent
 #: as query values. A path segment containing "/", "?" or ".." changes what the
@@ -31,6 +32,24 @@ class ToolValidators:
         return builder() if builder else []
 
     @staticmethod
+    @lru_cache(maxsize=None)
+    def get_validation_plan(tool_name: str) -> ValidationPlan:
+        """
+        Get the compiled validation plan for a tool
+
+        Compiled on first request and shared afterwards; plans are stateless,
+        so concurrent calls can use the same one.
+
+        Args:
+            tool_name: Name of the tool
+
+        Returns:
+            ValidationPlan (empty if the tool has no rules)
+        """
+        return InputValidator.compile_rules(ToolValidators.get_validator_rules(tool_name))
+
+    @staticmethod
+    @lru_cache(maxsize=None)
     def _rule_builders() -> Dict[str, Callable[[], List[ValidationRule]]]:
         """Single registry of tool name -> rule builder.
 
@@ -40,7 +59,9 @@ class ToolValidators:
         ``find_assets_by_column`` had rules that were never executed because
         ``has_validator`` consulted a hand-written list that omitted them.
 
-        Builders are stored uncalled so membership checks stay cheap.
+        Builders are stored uncalled so membership checks stay cheap, and the
+        mapping itself is built once. The tool registry (``tool_registry``)
+        resolves each tool's rules from here on first dispatch.
         """
         return {
             "list_spaces": ToolValidators._list_spaces_rules,
@@ -235,6 +256,13 @@ class ToolValidators:
                 param_name="case_sensitive",
                 validation_type=ValidationType.BOOLEAN,
                 required=False
+            ),
+            ValidationRule(
+                param_name="data_type",
+                validation_type=ValidationType.STRING,
+                pattern=r"^Edm\.[A-Za-z0-9]+$",
+                required=False,
+                max_length=64
             )
         ]
 
@@ -1087,6 +1115,15 @@ class ToolValidators:
                            required=False, min_length=1, max_length=1000),
             ValidationRule(param_name="top", validation_type=ValidationType.INTEGER, required=False),
             ValidationRule(param_name="skip", validation_type=ValidationType.INTEGER, required=False),
+            ValidationRule(param_name="output_format", validation_type=ValidationType.STRING,
+                           required=False, allowed_values=["json", "ndjson"]),
+            ValidationRule(param_name="page_size", validation_type=ValidationType.INTEGER, required=False),
+            ValidationRule(param_name="max_rows", validation_type=ValidationType.INTEGER, required=False),
+            # Opaque token issued by the server; next links inside it are
+            # re-checked against the tenant host before being followed
+            ValidationRule(param_name="cursor", validation_type=ValidationType.STRING,
+                           required=False, min_length=1, max_length=8192,
+                           pattern=r'^[A-Za-z0-9_\-]+$'),
         ]
 
     @staticmethod
@@ -1161,4 +1198,4 @@ class ToolValidators:
     @staticmethod
     def has_validator(tool_name: str) -> bool:
         """Check if tool has validator rules defined"""
-        return tool_name in ToolValidators.get_all_tool_names()
+        return tool_name in ToolValidators._rule_builders()
@@ -2,22 +2,98 @@
 Cache Manager for SAP Datasphere MCP Server
 
 Implements intelligent caching for frequently accessed data to improve performance
-and reduce redundant API calls. Uses TTL-based expiration and LRU eviction.
+and reduce redundant API calls. Uses TTL-based expiration and size-aware
+eviction: every entry's in-memory size is estimated, the cache is bounded by a
+global and optional per-category byte budget as well as an entry count, and
+victims are chosen by GDSF (Greedy-Dual-Size-Frequency), which prefers to
+evict large, rarely used entries over small hot ones while ageing out entries
+that stop being used.
+
+Callers that can supply a loader use ``get_or_refresh``: expired entries are
+served stale for a per-category window while a single background task
+refreshes them, and hot entries are refreshed shortly before they expire.
+
+An optional persistent store (``cache_store.PersistentCacheStore``) acts as a
+second tier for the stable categories in ``PERSISTENT_CATEGORIES``: writes go
+through to it and in-memory misses are served from it, so restarts and
+sibling workers do not start cold.
+
+Category invalidation and expiry sweeps go through secondary indexes (keys per
+category, and a min-heap of the times entries stop being servable), so they
+cost O(affected entries) rather than a scan of the whole cache. An optional
+asyncio sweeper runs ``cleanup_expired`` periodically.
 """
 
+import asyncio
+import heapq
+import itertools
+import sys
 import time
 import logging
-from typing import Any, Dict, Optional, Tuple, TYPE_CHECKING
+from typing import Any, Awaitable, Callable, Dict, FrozenSet, Optional, Set, Tuple, TYPE_CHECKING
 from datetime import datetime, timedelta
 from collections import OrderedDict
 from dataclasses import dataclass
 from enum import Enum
 
 if TYPE_CHECKING:
+    from cache_store import PersistentCacheStore, StoredEntry
     from telemetry import TelemetryManager
 
 logger = logging.getLogger(__name__)
 
+_SCALAR_TYPES = (str, bytes, bytearray, int, float, bool, type(None))
+
+
+def estimate_size(value: Any) -> int:
+    """
+    Estimate the in-memory footprint of a cached value in bytes
+
+    Walks containers, dataclass/pydantic objects and their attributes, counting
+    each object once. It is an estimate (shared interned objects are charged to
+    every value that references them) but tracks real memory closely enough to
+    budget multi-megabyte responses against tiny descriptors.
+    """
+    seen = set()
+    total = 0
+    stack = [value]
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen:
+            continue
+        seen.add(id(obj))
+        total += sys.getsizeof(obj, 64)
+
+        if isinstance(obj, _SCALAR_TYPES) or isinstance(obj, type):
+            continue
+        if isinstance(obj, dict):
+            stack.extend(obj.keys())
+            stack.extend(obj.values())
+        elif isinstance(obj, (list, tuple, set, frozenset)):
+            stack.extend(obj)
+        elif hasattr(obj, "__dict__"):
+            stack.extend(vars(obj).values())
+    return total
+
+
+def parse_category_budgets(spec: str) -> Dict["CacheCategory", int]:
+    """
+    Parse per-category byte budgets from a "category=MB,..." string
+
+    e.g. ``"catalog_assets=64,spaces=16"``. Unknown categories are ignored with
+    a warning so a typo cannot stop the server from starting.
+    """
+    budgets: Dict[CacheCategory, int] = {}
+    for part in (spec or "").split(","):
+        if not part.strip():
+            continue
+        name, _, megabytes = part.partition("=")
+        try:
+            budgets[CacheCategory(name.strip())] = int(float(megabytes) * 1024 * 1024)
+        except ValueError:
+            logger.warning(f"Ignoring invalid cache budget entry: {part.strip()!r}")
+    return budgets
+
 
 class CacheCategory(Enum):
     """Categories of cached data with different TTL settings"""
@@ -28,6 +104,7 @@ class CacheCategory(Enum):
     TASKS = "tasks"                # Task status (TTL: 30 seconds)
     MARKETPLACE = "marketplace"    # Marketplace packages (TTL: 1 hour)
     CATALOG_ASSETS = "catalog_assets"  # Catalog assets list (TTL: 5 minutes)
+    METADATA = "metadata"          # Parsed asset $metadata schemas (TTL: 30 minutes)
 
 
 @dataclass
@@ -40,11 +117,28 @@ class CacheEntry:
     ttl_seconds: int
     access_count: int = 0
     last_accessed: float = 0.0
+    stale_ttl_seconds: int = 0
+    loader_backed: bool = False  # Stored by get_or_refresh, which may serve it stale
+    size_bytes: int = 0
+    priority: float = 0.0
+    heap_seq: int = 0
 
     def is_expired(self) -> bool:
         """Check if cache entry has exceeded its TTL"""
         return (time.time() - self.created_at) > self.ttl_seconds
 
+    def is_servable_stale(self) -> bool:
+        """Check if an expired entry is still inside its stale-while-revalidate window"""
+        return (time.time() - self.created_at) <= self.ttl_seconds + self.stale_ttl_seconds
+
+    def dead_at(self) -> float:
+        """Time after which the entry can no longer be served, even stale"""
+        return self.created_at + self.ttl_seconds + self.stale_ttl_seconds
+
+    def remaining_ttl(self) -> float:
+        """Seconds until the entry expires (negative once expired)"""
+        return self.ttl_seconds - (time.time() - self.created_at)
+
     def is_valid(self) -> bool:
         """Check if cache entry is still valid"""
         return not self.is_expired()
@@ -61,7 +155,10 @@ class CacheManager:
 
     Features:
     - Category-based TTL (different expiration times for different data types)
-    - LRU eviction when max size reached
+    - Size-aware GDSF eviction under entry-count and byte budgets
+    - Indexed category invalidation and expiry sweeps, optional periodic sweeper
+    - Stale-while-revalidate and refresh-ahead for loader-backed lookups
+    - Optional persistent second tier for stable categories
     - Cache statistics and monitoring
     - Manual invalidation support
     """
@@ -75,9 +172,50 @@ class CacheManager:
         CacheCategory.TASKS: 30,           # 30 seconds
         CacheCategory.MARKETPLACE: 3600,   # 1 hour
         CacheCategory.CATALOG_ASSETS: 300, # 5 minutes
+        CacheCategory.METADATA: 1800,      # 30 minutes
     }
 
-    def __init__(self, max_size: int = 1000, enabled: bool = True, telemetry_manager: Optional["TelemetryManager"] = None):
+    # How long past its TTL an entry may still be served while it is refreshed
+    # in the background (in seconds). 0 disables stale serving for the category:
+    # connection and task status must never be reported from an old snapshot.
+    DEFAULT_STALE_TTL = {
+        CacheCategory.SPACES: 600,         # 10 minutes
+        CacheCategory.SPACE_INFO: 600,     # 10 minutes
+        CacheCategory.TABLE_SCHEMA: 3600,  # 1 hour
+        CacheCategory.CONNECTIONS: 0,
+        CacheCategory.TASKS: 0,
+        CacheCategory.MARKETPLACE: 3600,   # 1 hour
+        CacheCategory.CATALOG_ASSETS: 600, # 10 minutes
+        CacheCategory.METADATA: 3600,      # 1 hour
+    }
+
+    # Categories written through to the persistent store. Connection and task
+    # status are volatile and not worth a disk round trip.
+    PERSISTENT_CATEGORIES: FrozenSet[CacheCategory] = frozenset({
+        CacheCategory.SPACES,
+        CacheCategory.SPACE_INFO,
+        CacheCategory.TABLE_SCHEMA,
+        CacheCategory.MARKETPLACE,
+        CacheCategory.CATALOG_ASSETS,
+        CacheCategory.METADATA,
+    })
+
+    # Persistent writes of entries at least this large (estimated bytes) are
+    # encoded, checksummed and written on a worker thread, not the event loop
+    PERSIST_OFFLOAD_BYTES = 64 * 1024
+
+    def __init__(
+        self,
+        max_size: int = 1000,
+        enabled: bool = True,
+        telemetry_manager: Optional["TelemetryManager"] = None,
+        stale_while_revalidate: bool = True,
+        refresh_ahead_ratio: float = 0.1,
+        hot_access_threshold: int = 3,
+        persistent_store: Optional["PersistentCacheStore"] = None,
+        max_bytes: Optional[int] = 256 * 1024 * 1024,
+        category_max_bytes: Optional[Dict[CacheCategory, int]] = None
+    ):
         """
         Initialize cache manager
 
@@ -85,19 +223,56 @@ class CacheManager:
             max_size: Maximum number of entries to cache
             enabled: Whether caching is enabled
             telemetry_manager: Optional telemetry manager for metrics logging
+            stale_while_revalidate: Serve expired entries within their category's
+                stale window while refreshing them in the background
+            refresh_ahead_ratio: Refresh hot entries once less than this fraction
+                of their TTL remains (0 disables refresh-ahead)
+            hot_access_threshold: Accesses after which an entry counts as hot
+            persistent_store: Optional second-tier store consulted on miss
+            max_bytes: Memory budget for all entries (None for no byte limit)
+            category_max_bytes: Optional memory budget per category
         """
         self.max_size = max_size
         self.enabled = enabled
         self.telemetry_manager = telemetry_manager
+        self.stale_while_revalidate = stale_while_revalidate
+        self.refresh_ahead_ratio = refresh_ahead_ratio
+        self.hot_access_threshold = hot_access_threshold
+        self.persistent_store = persistent_store
+        self.max_bytes = max_bytes
+        self.category_max_bytes: Dict[CacheCategory, int] = dict(category_max_bytes or {})
         self._cache: OrderedDict[str, CacheEntry] = OrderedDict()
+        self._bytes_total = 0
+        self._bytes_by_category: Dict[CacheCategory, int] = {category: 0 for category in CacheCategory}
+        self._keys_by_category: Dict[CacheCategory, Set[str]] = {category: set() for category in CacheCategory}
+        # (dead_at, key) min-heap; items of replaced or removed entries are
+        # skipped when they surface
+        self._expiry_heap: list = []
+        self._sweeper_task: Optional["asyncio.Task"] = None
+        # GDSF state: one lazy min-heap of (priority, seq, key) per category;
+        # superseded heap items are skipped when they surface.
+        self._heaps: Dict[CacheCategory, list] = {category: [] for category in CacheCategory}
+        self._heap_seq = itertools.count()
+        self._inflation = 0.0
+        self._refresh_tasks: Dict[str, "asyncio.Task"] = {}
+        # Keys invalidated while their refresh was in flight: its result is
+        # returned to waiting callers but not cached
+        self._discarded_refreshes: Set[str] = set()
+        # Last queued persistent-store call; later calls wait for it
+        self._persist_tail: Optional["asyncio.Task"] = None
         self._stats = {
             "hits": 0,
             "misses": 0,
+            "stale_hits": 0,
+            "background_refreshes": 0,
+            "refresh_failures": 0,
             "evictions": 0,
             "invalidations": 0,
-            "total_requests": 0
+            "total_requests": 0,
+            "l2_hits": 0,
+            "rejected_oversize": 0
         }
-        logger.info(f"Cache manager initialized (max_size={max_size}, enabled={enabled})")
+        logger.info(f"Cache manager initialized (max_size={max_size}, max_bytes={max_bytes}, enabled={enabled})")
 
     def get(self, key: str, category: CacheCategory) -> Optional[Any]:
         """
@@ -116,22 +291,22 @@ class CacheManager:
             return None
 
         cache_key = self._make_cache_key(key, category)
+        entry = self._lookup(cache_key, category)
 
-        if cache_key in self._cache:
-            entry = self._cache[cache_key]
-
-            # Check if expired
+        if entry is not None:
+            # Check if expired. Loader-backed entries still inside their stale
+            # window are kept so get_or_refresh can serve them while
+            # revalidating; nothing would ever serve any other expired entry.
             if entry.is_expired():
                 logger.debug(f"Cache expired: {cache_key}")
-                del self._cache[cache_key]
+                if not (entry.loader_backed and entry.is_servable_stale()):
+                    self._remove(cache_key)
                 self._stats["misses"] += 1
                 if self.telemetry_manager:
                     self.telemetry_manager.record_cache_event("miss", category.value, "expired")
                 return None
 
-            # Move to end (LRU)
-            self._cache.move_to_end(cache_key)
-            entry.touch()
+            self._touch(entry)
             self._stats["hits"] += 1
 
             # Log cache hit to telemetry
@@ -148,6 +323,210 @@ class CacheManager:
         logger.debug(f"Cache miss: {cache_key}")
         return None
 
+    def peek(self, key: str, category: CacheCategory) -> Optional[Any]:
+        """
+        Return a cached value even if expired, without counting an access
+
+        For loaders that revalidate the previous value (e.g. by ETag) rather
+        than always re-downloading it.
+        """
+        if not self.enabled:
+            return None
+        entry = self._cache.get(self._make_cache_key(key, category))
+        return entry.value if entry is not None else None
+
+    async def get_or_refresh(
+        self,
+        key: str,
+        category: CacheCategory,
+        loader: Callable[[], Awaitable[Any]],
+        ttl: Optional[int] = None
+    ) -> Any:
+        """
+        Get value from cache, loading it on miss and revalidating it when stale
+
+        - Fresh entry: returned; a hot entry close to expiry is also refreshed
+          in the background (refresh-ahead).
+        - Expired entry inside the category's stale window: returned as-is while
+          one background task reloads it.
+        - Missing or too old: ``loader`` is awaited and its result cached.
+          Concurrent misses for the same key share one load.
+
+        Background refresh failures are logged and the stale entry is kept;
+        foreground load failures propagate to the caller.
+
+        Args:
+            key: Cache key
+            category: Category of cached data
+            loader: Coroutine function returning the value to cache
+            ttl: Optional custom TTL in seconds (overrides default)
+
+        Returns:
+            Cached or freshly loaded value
+        """
+        if not self.enabled:
+            return await loader()
+
+        self._stats["total_requests"] += 1
+        cache_key = self._make_cache_key(key, category)
+        entry = await self._lookup_async(cache_key, category)
+
+        if entry is not None:
+            if not entry.is_expired():
+                self._touch(entry)
+                self._stats["hits"] += 1
+                if self.telemetry_manager:
+                    age_seconds = time.time() - entry.created_at
+                    self.telemetry_manager.record_cache_event("hit", category.value, f"age={age_seconds:.1f}s")
+                if self._is_due_for_refresh_ahead(entry):
+                    self._schedule_refresh(cache_key, key, category, loader, ttl)
+                return entry.value
+
+            if entry.is_servable_stale():
+                self._touch(entry)
+                self._stats["stale_hits"] += 1
+                if self.telemetry_manager:
+                    self.telemetry_manager.record_cache_event(
+                        "stale_hit", category.value, f"expired_for={-entry.remaining_ttl():.1f}s"
+                    )
+                logger.debug(f"Cache stale hit: {cache_key}, revalidating in background")
+                self._schedule_refresh(cache_key, key, category, loader, ttl)
+                return entry.value
+
+            self._remove(cache_key)
+
+        self._stats["misses"] += 1
+        if self.telemetry_manager:
+            self.telemetry_manager.record_cache_event(
+                "miss", category.value, "expired" if entry is not None else "not_found"
+            )
+        logger.debug(f"Cache miss: {cache_key}, loading")
+
+        task = self._refresh_tasks.get(cache_key)
+        if task is None:
+            task = self._schedule_refresh(cache_key, key, category, loader, ttl, background=False)
+        return await asyncio.shield(task)
+
+    def _lookup(self, cache_key: str, category: CacheCategory) -> Optional[CacheEntry]:
+        """Find an entry in memory, falling back to (and promoting from) the persistent store"""
+        entry = self._cache.get(cache_key)
+        if entry is not None or not self._reads_persistent(category):
+            return entry
+        return self._promote(cache_key, category, self._read_persistent(cache_key))
+
+    async def _lookup_async(self, cache_key: str, category: CacheCategory) -> Optional[CacheEntry]:
+        """``_lookup`` that reads the persistent store on a worker thread
+
+        An L2 read hashes, decodes and touches a row that can be several MB
+        (the catalog snapshot), so async callers keep it off the event loop.
+        """
+        entry = self._cache.get(cache_key)
+        if entry is not None or not self._reads_persistent(category):
+            return entry
+        stored = await asyncio.to_thread(self._read_persistent, cache_key)
+        # The key may have been loaded or written while the read was running
+        entry = self._cache.get(cache_key)
+        if entry is not None or self._persist_pending():
+            return entry
+        return self._promote(cache_key, category, stored)
+
+    def _reads_persistent(self, category: CacheCategory) -> bool:
+        # A queued delete may not have reached the store yet
+        return (self.persistent_store is not None and category in self.PERSISTENT_CATEGORIES
+                and not self._persist_pending())
+
+    def _read_persistent(self, cache_key: str) -> Optional["StoredEntry"]:
+        try:
+            return self.persistent_store.get(cache_key)
+        except Exception as e:
+            logger.warning(f"Persistent cache read failed for {cache_key}: {e}")
+            return None
+
+    def _promote(self, cache_key: str, category: CacheCategory,
+                 stored: Optional["StoredEntry"]) -> Optional[CacheEntry]:
+        """Copy an entry read from the persistent store into memory"""
+        if stored is None:
+            return None
+
+        # Keep the original creation time so the entry expires on schedule
+        entry = CacheEntry(
+            key=cache_key,
+            value=stored.value,
+            category=category,
+            created_at=stored.created_at,
+            ttl_seconds=stored.ttl_seconds,
+            last_accessed=time.time(),
+            stale_ttl_seconds=stored.stale_ttl_seconds,
+            # Only get_or_refresh stores entries with a stale window
+            loader_backed=stored.stale_ttl_seconds > 0
+        )
+        if not self._store_entry(entry):
+            return None
+        self._stats["l2_hits"] += 1
+        if self.telemetry_manager:
+            self.telemetry_manager.record_cache_event("l2_hit", category.value, "promoted")
+        logger.debug(f"Cache L2 hit: {cache_key}")
+        return entry
+
+    def _is_due_for_refresh_ahead(self, entry: CacheEntry) -> bool:
+        """Check if a fresh entry is hot and close enough to expiry to refresh early"""
+        if self.refresh_ahead_ratio <= 0 or entry.access_count < self.hot_access_threshold:
+            return False
+        return entry.remaining_ttl() < entry.ttl_seconds * self.refresh_ahead_ratio
+
+    def _schedule_refresh(
+        self,
+        cache_key: str,
+        key: str,
+        category: CacheCategory,
+        loader: Callable[[], Awaitable[Any]],
+        ttl: Optional[int],
+        background: bool = True
+    ) -> "asyncio.Task":
+        """Start a reload of ``key`` unless one is already running"""
+        task = self._refresh_tasks.get(cache_key)
+        if task is not None:
+            return task
+
+        task = asyncio.ensure_future(self._refresh(key, category, loader, ttl, background))
+        self._refresh_tasks[cache_key] = task
+        task.add_done_callback(lambda t, k=cache_key: self._finish_refresh(k, t))
+        if background:
+            self._stats["background_refreshes"] += 1
+        return task
+
+    async def _refresh(
+        self,
+        key: str,
+        category: CacheCategory,
+        loader: Callable[[], Awaitable[Any]],
+        ttl: Optional[int],
+        background: bool
+    ) -> Any:
+        """Run ``loader`` and store its result, unless the key was invalidated meanwhile"""
+        cache_key = self._make_cache_key(key, category)
+        try:
+            value = await loader()
+        except Exception as e:
+            self._stats["refresh_failures"] += 1
+            if background:
+                logger.warning(f"Background cache refresh failed for {category.value}:{key}: {e}")
+            raise
+
+        if cache_key in self._discarded_refreshes:
+            logger.debug(f"Not caching refresh of {cache_key}: invalidated while loading")
+            return value
+        self._set(key, value, category, ttl, loader_backed=True)
+        return value
+
+    def _finish_refresh(self, cache_key: str, task: "asyncio.Task"):
+        """Drop a finished refresh task and mark its exception retrieved"""
+        if self._refresh_tasks.get(cache_key) is task:
+            del self._refresh_tasks[cache_key]
+            self._discarded_refreshes.discard(cache_key)
+        if not task.cancelled():
+            task.exception()
+
     def set(self, key: str, value: Any, category: CacheCategory, ttl: Optional[int] = None):
         """
         Store value in cache
@@ -158,6 +537,22 @@ class CacheManager:
             category: Category of data
             ttl: Optional custom TTL in seconds (overrides default)
         """
+        self._set(key, value, category, ttl)
+
+    def _set(
+        self,
+        key: str,
+        value: Any,
+        category: CacheCategory,
+        ttl: Optional[int],
+        loader_backed: bool = False
+    ):
+        """
+        Store a value; only ``get_or_refresh`` results get a stale window
+
+        Nothing serves a plain ``set`` entry once it has expired, so giving
+        it a stale window would only keep it holding cache budget.
+        """
         if not self.enabled:
             return
 
@@ -172,17 +567,194 @@ class CacheManager:
             created_at=time.time(),
             ttl_seconds=ttl_seconds,
             access_count=0,
-            last_accessed=time.time()
+            last_accessed=time.time(),
+            stale_ttl_seconds=(
+                self.DEFAULT_STALE_TTL.get(category, 0)
+                if loader_backed and self.stale_while_revalidate else 0
+            ),
+            loader_backed=loader_backed
         )
 
-        # Evict if at max size
-        if len(self._cache) >= self.max_size:
-            self._evict_lru()
+        if not self._store_entry(entry):
+            # Rejected as oversize: do not persist it, and drop the previous
+            # value there too so a later miss cannot promote it
+            if self.persistent_store is not None and category in self.PERSISTENT_CATEGORIES:
+                self._persist(f"delete for {cache_key}", self.persistent_store.delete, cache_key)
+            return
+
+        if self.persistent_store is not None and category in self.PERSISTENT_CATEGORIES:
+            self._persist(
+                f"write for {cache_key}", self.persistent_store.set,
+                cache_key, value, category.value, entry.created_at, ttl_seconds, entry.stale_ttl_seconds,
+                offload=entry.size_bytes >= self.PERSIST_OFFLOAD_BYTES
+            )
+
+        logger.debug(f"Cache set: {cache_key} (TTL: {ttl_seconds}s, {entry.size_bytes} bytes)")
+
+    def _persist(self, action: str, call: Callable[..., Any], *args: Any, offload: bool = False):
+        """
+        Run a persistent-store call, logging rather than raising on failure
+
+        ``offload`` calls run on a worker thread when an event loop is
+        running. While one is queued, every later call queues behind it, so
+        the store sees writes and deletes in the order they were made.
+        """
+        if offload or self._persist_pending():
+            try:
+                loop = asyncio.get_running_loop()
+            except RuntimeError:
+                loop = None
+            if loop is not None:
+                self._persist_tail = loop.create_task(
+                    self._persist_after(self._persist_tail, action, call, args)
+                )
+                return
+        try:
+            call(*args)
+        except Exception as e:
+            logger.warning(f"Persistent cache {action} failed: {e}")
+
+    async def _persist_after(self, previous: Optional["asyncio.Task"], action: str,
+                             call: Callable[..., Any], args: Tuple[Any, ...]):
+        if previous is not None and not previous.done():
+            await asyncio.wait([previous])
+        try:
+            await asyncio.to_thread(call, *args)
+        except Exception as e:
+            logger.warning(f"Persistent cache {action} failed: {e}")
+
+    def _persist_pending(self) -> bool:
+        return self._persist_tail is not None and not self._persist_tail.done()
+
+    async def flush_persistent(self):
+        """Wait until queued persistent-store writes have been applied"""
+        if self._persist_tail is not None:
+            await asyncio.wait([self._persist_tail])
+
+    def _store_entry(self, entry: CacheEntry) -> bool:
+        """
+        Insert an entry, evicting by GDSF until it fits every budget
+
+        An entry larger than its budget is not admitted (and any previous
+        value under the same key is dropped, so it is never served again).
+
+        Returns:
+            True if the entry was admitted
+        """
+        cache_key = entry.key
+        category = entry.category
+        self._remove(cache_key)
+
+        entry.size_bytes = estimate_size(entry.value)
+        category_budget = self.category_max_bytes.get(category)
+        if (self.max_bytes is not None and entry.size_bytes > self.max_bytes) or \
+                (category_budget is not None and entry.size_bytes > category_budget):
+            self._stats["rejected_oversize"] += 1
+            logger.warning(
+                f"Not caching {cache_key}: {entry.size_bytes} bytes exceeds the cache budget"
+            )
+            return False
+
+        while category_budget is not None and \
+                self._bytes_by_category[category] + entry.size_bytes > category_budget:
+            if not self._evict_one(category):
+                break
+        while self._cache and (
+            len(self._cache) >= self.max_size or
+            (self.max_bytes is not None and self._bytes_total + entry.size_bytes > self.max_bytes)
+        ):
+            if not self._evict_one():
+                break
 
         self._cache[cache_key] = entry
-        self._cache.move_to_end(cache_key)
+        self._bytes_total += entry.size_bytes
+        self._bytes_by_category[category] += entry.size_bytes
+        self._keys_by_category[category].add(cache_key)
+        heapq.heappush(self._expiry_heap, (entry.dead_at(), cache_key))
+        if len(self._expiry_heap) > 2 * len(self._cache) + 64:
+            self._rebuild_expiry_heap()
+        self._push_priority(entry)
+        return True
+
+    def _remove(self, cache_key: str) -> Optional[CacheEntry]:
+        """Remove an entry and release its bytes (its heap item goes stale)"""
+        entry = self._cache.pop(cache_key, None)
+        if entry is not None:
+            self._bytes_total -= entry.size_bytes
+            self._bytes_by_category[entry.category] -= entry.size_bytes
+            self._keys_by_category[entry.category].discard(cache_key)
+        return entry
+
+    def _touch(self, entry: CacheEntry):
+        """Record an access: recency for LRU ordering, frequency for GDSF"""
+        self._cache.move_to_end(entry.key)
+        entry.touch()
+        self._push_priority(entry)
+
+    def _push_priority(self, entry: CacheEntry):
+        """
+        (Re)compute an entry's GDSF priority and push it onto its category heap
+
+        priority = L + frequency / size, where L is the priority of the last
+        evicted entry. Raising L on every eviction ages out entries that were
+        popular once but are no longer accessed.
+        """
+        entry.priority = self._inflation + (entry.access_count + 1) / max(entry.size_bytes, 1)
+        entry.heap_seq = next(self._heap_seq)
+        heap = self._heaps[entry.category]
+        heapq.heappush(heap, (entry.priority, entry.heap_seq, entry.key))
+
+        # Each access leaves a superseded item behind; rebuild once they dominate
+        if len(heap) > 4 * len(self._keys_by_category[entry.category]) + 64:
+            self._rebuild_heap(entry.category)
+
+    def _rebuild_heap(self, category: CacheCategory):
+        """Drop superseded items from a category heap"""
+        heap = []
+        for key in self._keys_by_category[category]:
+            entry = self._cache[key]
+            heap.append((entry.priority, entry.heap_seq, key))
+        heapq.heapify(heap)
+        self._heaps[category] = heap
+
+    def _rebuild_expiry_heap(self):
+        """Drop items of replaced or removed entries from the expiry heap"""
+        self._expiry_heap = [(entry.dead_at(), key) for key, entry in self._cache.items()]
+        heapq.heapify(self._expiry_heap)
+
+    def _heap_head(self, category: CacheCategory) -> Optional[Tuple[float, int, str]]:
+        """Lowest-priority live item of a category heap, discarding superseded ones"""
+        heap = self._heaps[category]
+        while heap:
+            priority, seq, key = heap[0]
+            entry = self._cache.get(key)
+            if entry is not None and entry.heap_seq == seq:
+                return heap[0]
+            heapq.heappop(heap)
+        return None
+
+    def _evict_one(self, category: Optional[CacheCategory] = None) -> bool:
+        """
+        Evict the lowest-priority entry, from one category or across all
 
-        logger.debug(f"Cache set: {cache_key} (TTL: {ttl_seconds}s)")
+        Returns:
+            True if an entry was evicted
+        """
+        categories = [category] if category is not None else list(CacheCategory)
+        heads = [head for head in (self._heap_head(c) for c in categories) if head is not None]
+        if not heads:
+            return False
+
+        priority, _, key = min(heads)
+        self._inflation = priority
+        evicted = self._remove(key)
+        self._stats["evictions"] += 1
+        logger.debug(f"Cache eviction (GDSF): {key} ({evicted.size_bytes} bytes)")
+        return True
+
+    def _discard_refreshes(self, matches: Callable[[str], bool]):
+        """Keep in-flight refreshes of matching keys from caching their result"""
+        self._discarded_refreshes.update(k for k in self._refresh_tasks if matches(k))
 
     def invalidate(self, key: str, category: CacheCategory):
         """
@@ -196,12 +768,16 @@ class CacheManager:
             return
 
         cache_key = self._make_cache_key(key, category)
+        self._discard_refreshes(lambda k: k == cache_key)
 
-        if cache_key in self._cache:
-            del self._cache[cache_key]
+        # Memory first, so a failing store can never leave the stale entry served
+        if self._remove(cache_key) is not None:
             self._stats["invalidations"] += 1
             logger.info(f"Cache invalidated: {cache_key}")
 
+        if self.persistent_store is not None:
+            self._persist(f"delete for {cache_key}", self.persistent_store.delete, cache_key)
+
     def invalidate_category(self, category: CacheCategory):
         """
         Invalidate all entries of a specific category
@@ -212,14 +788,18 @@ class CacheManager:
         if not self.enabled:
             return
 
-        keys_to_remove = [
-            key for key, entry in self._cache.items()
-            if entry.category == category
-        ]
+        keys_to_remove = list(self._keys_by_category[category])
+        prefix = self._make_cache_key("", category)
+        self._discard_refreshes(lambda k: k.startswith(prefix))
 
         for key in keys_to_remove:
-            del self._cache[key]
+            self._remove(key)
             self._stats["invalidations"] += 1
+        self._heaps[category] = []
+
+        if self.persistent_store is not None:
+            self._persist(f"delete for category {category.value}",
+                          self.persistent_store.delete_category, category.value)
 
         logger.info(f"Cache category invalidated: {category.value} ({len(keys_to_remove)} entries)")
 
@@ -229,32 +809,86 @@ class CacheManager:
             return
 
         count = len(self._cache)
+        self._discard_refreshes(lambda k: True)
         self._cache.clear()
+        self._bytes_total = 0
+        self._bytes_by_category = {category: 0 for category in CacheCategory}
+        self._keys_by_category = {category: set() for category in CacheCategory}
+        self._heaps = {category: [] for category in CacheCategory}
+        self._expiry_heap = []
         self._stats["invalidations"] += count
+
+        if self.persistent_store is not None:
+            self._persist("clear", self.persistent_store.clear)
         logger.info(f"Cache cleared: {count} entries removed")
 
-    def cleanup_expired(self):
-        """Remove all expired entries from cache"""
-        if not self.enabled:
-            return
+    def cleanup_expired(self) -> int:
+        """
+        Remove all expired entries from cache (stale-servable entries are kept)
 
-        keys_to_remove = [
-            key for key, entry in self._cache.items()
-            if entry.is_expired()
-        ]
+        Pops the expiry heap up to now, so the cost is proportional to the
+        number of entries that expired rather than the cache size.
 
-        for key in keys_to_remove:
-            del self._cache[key]
+        Returns:
+            Number of entries removed
+        """
+        if not self.enabled:
+            return 0
+
+        now = time.time()
+        removed = 0
+        while self._expiry_heap and self._expiry_heap[0][0] < now:
+            _, key = heapq.heappop(self._expiry_heap)
+            entry = self._cache.get(key)
+            # A replaced entry leaves an item with an earlier time behind
+            if entry is not None and entry.dead_at() < now:
+                self._remove(key)
+                removed += 1
+
+        if self.persistent_store is not None:
+            self._persist("cleanup", self.persistent_store.cleanup_expired)
+
+        if removed:
+            logger.info(f"Cache cleanup: {removed} expired entries removed")
+        return removed
+
+    def start_sweeper(self, interval_seconds: float = 60.0) -> "asyncio.Task":
+        """
+        Start a background task that calls ``cleanup_expired`` periodically
 
-        if keys_to_remove:
-            logger.info(f"Cache cleanup: {len(keys_to_remove)} expired entries removed")
+        Without it, expired entries linger until they are touched or evicted.
+        Must be called from a running event loop; calling it again returns
+        the task already running.
 
-    def _evict_lru(self):
-        """Evict least recently used entry"""
-        if self._cache:
-            evicted_key, evicted_entry = self._cache.popitem(last=False)
-            self._stats["evictions"] += 1
-            logger.debug(f"Cache eviction (LRU): {evicted_key}")
+        Args:
+            interval_seconds: Seconds between sweeps
+        """
+        if self._sweeper_task is not None and not self._sweeper_task.done():
+            return self._sweeper_task
+
+        async def sweep():
+            while True:
+                await asyncio.sleep(interval_seconds)
+                try:
+                    self.cleanup_expired()
+                except Exception as e:
+                    logger.warning(f"Cache sweep failed: {e}")
+
+        self._sweeper_task = asyncio.ensure_future(sweep())
+        logger.info(f"Cache sweeper started (interval={interval_seconds}s)")
+        return self._sweeper_task
+
+    async def stop_sweeper(self):
+        """Stop the background sweeper, if running"""
+        task, self._sweeper_task = self._sweeper_task, None
+        if task is None:
+            return
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+        logger.info("Cache sweeper stopped")
 
     def _make_cache_key(self, key: str, category: CacheCategory) -> str:
         """Create cache key with category prefix"""
@@ -263,35 +897,57 @@ class CacheManager:
     def get_stats(self) -> Dict[str, Any]:
         """Get cache statistics"""
         total_requests = self._stats["total_requests"]
-        hit_rate = (self._stats["hits"] / total_requests * 100) if total_requests > 0 else 0
+        served = self._stats["hits"] + self._stats["stale_hits"]
+        hit_rate = (served / total_requests * 100) if total_requests > 0 else 0
 
-        return {
+        stats = {
             "enabled": self.enabled,
             "size": len(self._cache),
             "max_size": self.max_size,
+            "size_bytes": self._bytes_total,
+            "max_bytes": self.max_bytes,
+            "bytes_by_category": {
+                category.value: size for category, size in self._bytes_by_category.items() if size
+            },
+            "category_max_bytes": {
+                category.value: budget for category, budget in self.category_max_bytes.items()
+            },
+            "rejected_oversize": self._stats["rejected_oversize"],
             "hit_rate_percent": round(hit_rate, 2),
             "hits": self._stats["hits"],
             "misses": self._stats["misses"],
+            "stale_hits": self._stats["stale_hits"],
+            "background_refreshes": self._stats["background_refreshes"],
+            "refresh_failures": self._stats["refresh_failures"],
+            "refreshing": len(self._refresh_tasks),
             "evictions": self._stats["evictions"],
             "invalidations": self._stats["invalidations"],
-            "total_requests": self._stats["total_requests"]
+            "total_requests": self._stats["total_requests"],
+            "l2_hits": self._stats["l2_hits"]
         }
 
+        if self.persistent_store is not None:
+            stats["persistent"] = self.persistent_store.get_stats()
+
+        return stats
+
     def get_cache_info(self) -> Dict[str, Any]:
         """Get detailed cache information"""
-        category_counts = {}
-        for entry in self._cache.values():
-            cat = entry.category.value
-            category_counts[cat] = category_counts.get(cat, 0) + 1
+        category_counts = {
+            category.value: len(keys) for category, keys in self._keys_by_category.items() if keys
+        }
 
+        # Last 10 entries, oldest first, without copying the whole cache
+        recent = list(itertools.islice(reversed(self._cache.items()), 10))[::-1]
         entries_info = []
-        for key, entry in list(self._cache.items())[-10:]:  # Last 10 entries
+        for key, entry in recent:
             entries_info.append({
                 "key": key,
                 "category": entry.category.value,
                 "age_seconds": round(time.time() - entry.created_at, 1),
                 "ttl_seconds": entry.ttl_seconds,
                 "access_count": entry.access_count,
+                "size_bytes": entry.size_bytes,
                 "valid": entry.is_valid()
             })
 
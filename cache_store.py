@@ -0,0 +1,384 @@
+"""
+Persistent second-tier (L2) cache store for the SAP Datasphere MCP Server
+
+``CacheManager`` keeps its working set in process memory, so every restart and
+every worker of a multi-process HTTP deployment starts cold. This module adds
+an optional SQLite-backed tier that the cache manager writes through to and
+consults on an in-memory miss, so stable data (space listings, catalog assets,
+schemas) survives restarts and is shared between workers on one host.
+
+- Entries keep their original creation time and TTLs, so an entry loaded from
+  disk expires exactly when it would have in memory.
+- Every payload is stored with a SHA-256 checksum; a corrupt row is dropped
+  and treated as a miss.
+- Total payload size is bounded; least recently accessed rows are evicted.
+- Rows are namespaced (tenant URL, or "mock"), so one file can never serve
+  one tenant's data to another.
+
+Values are stored as JSON. Pydantic models exported by ``mcp.types`` (the
+``TextContent`` responses) are round-tripped by class name; anything else
+that is not JSON-native is simply not persisted.
+"""
+
+import hashlib
+import importlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Module whose pydantic models may be rebuilt from a stored payload. Models are
+# tagged by their public name in this module, not their defining module, which
+# moves between SDK releases.
+_MODEL_MODULE = "mcp.types"
+_MODEL_TAG = "__model__"
+
+
+class UnpersistableValue(TypeError):
+    """Raised when a value cannot be encoded for the persistent store"""
+
+
+@dataclass
+class StoredEntry:
+    """An entry read back from the persistent store"""
+    value: Any
+    created_at: float
+    ttl_seconds: int
+    stale_ttl_seconds: int
+
+
+def _model_namespace():
+    """The module models are resolved against (imported lazily)"""
+    return importlib.import_module(_MODEL_MODULE)
+
+
+def _encode_default(obj: Any) -> Any:
+    """json.dumps hook: tag allow-listed pydantic models, reject everything else"""
+    name = type(obj).__name__
+    if hasattr(obj, "model_dump") and getattr(_model_namespace(), name, None) is type(obj):
+        return {_MODEL_TAG: name, "data": obj.model_dump()}
+    raise UnpersistableValue(f"{name} is not persistable")
+
+
+def _decode_hook(obj: Dict[str, Any]) -> Any:
+    """json.loads hook: rebuild tagged pydantic models"""
+    name = obj.get(_MODEL_TAG)
+    if name is None:
+        return obj
+    cls = getattr(_model_namespace(), name, None)
+    if not hasattr(cls, "model_validate"):
+        raise ValueError(f"Unknown model {name}")
+    return cls.model_validate(obj["data"])
+
+
+def encode_value(value: Any) -> bytes:
+    """Encode a cache value for storage"""
+    return json.dumps(value, default=_encode_default, separators=(",", ":")).encode("utf-8")
+
+
+def decode_value(payload: bytes) -> Any:
+    """Decode a stored cache value"""
+    return json.loads(payload.decode("utf-8"), object_hook=_decode_hook)
+
+
+class PersistentCacheStore:
+    """
+    SQLite-backed cache tier
+
+    Uses WAL journaling so several worker processes can read while one writes.
+    Calls are synchronous and guarded by a lock, so they can run on a worker
+    thread; ``CacheManager`` moves large writes off the event loop. The sum of
+    payload sizes is kept as a running total rather than re-summed per write.
+    """
+
+    def __init__(self, path: str, namespace: str, max_bytes: int = 256 * 1024 * 1024):
+        """
+        Initialize the store, creating the database file if needed
+
+        Args:
+            path: SQLite database file path
+            namespace: Partition key for rows (tenant URL, or "mock")
+            max_bytes: Budget for the sum of stored payload sizes
+        """
+        self.path = path
+        self.namespace = namespace
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._stats = {
+            "hits": 0,
+            "misses": 0,
+            "writes": 0,
+            "skipped": 0,
+            "checksum_failures": 0,
+            "evictions": 0
+        }
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        if not os.path.exists(path):
+            # Cached catalog data is tenant data: keep the file private
+            os.close(os.open(path, os.O_CREAT | os.O_WRONLY, 0o600))
+
+        self._conn = sqlite3.connect(path, timeout=5.0, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS cache_entries (
+                namespace TEXT NOT NULL,
+                key TEXT NOT NULL,
+                category TEXT NOT NULL,
+                payload BLOB NOT NULL,
+                checksum TEXT NOT NULL,
+                size_bytes INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                ttl_seconds INTEGER NOT NULL,
+                stale_ttl_seconds INTEGER NOT NULL,
+                last_accessed REAL NOT NULL,
+                PRIMARY KEY (namespace, key)
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_cache_entries_lru ON cache_entries (namespace, last_accessed)"
+        )
+        # Payload bytes in this namespace, maintained per write. Other worker
+        # processes share the file, so it is re-summed before evicting.
+        self._total_bytes = self._total_bytes_locked()
+        logger.info(f"Persistent cache store opened at {path} (namespace={namespace}, max_bytes={max_bytes})")
+
+    def get(self, key: str) -> Optional[StoredEntry]:
+        """
+        Read an entry
+
+        Rows past their TTL plus stale window, and rows failing checksum
+        validation, are deleted and reported as a miss.
+
+        Args:
+            key: Full cache key (category-prefixed)
+
+        Returns:
+            Stored entry, or None
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT payload, checksum, created_at, ttl_seconds, stale_ttl_seconds "
+                "FROM cache_entries WHERE namespace = ? AND key = ?",
+                (self.namespace, key)
+            ).fetchone()
+
+            if row is None:
+                self._stats["misses"] += 1
+                return None
+
+            payload, checksum, created_at, ttl_seconds, stale_ttl_seconds = row
+            if time.time() - created_at > ttl_seconds + stale_ttl_seconds:
+                self._delete_locked(key)
+                self._stats["misses"] += 1
+                return None
+
+            if hashlib.sha256(payload).hexdigest() != checksum:
+                logger.warning(f"Persistent cache checksum mismatch for {key}; dropping entry")
+                self._delete_locked(key)
+                self._stats["checksum_failures"] += 1
+                self._stats["misses"] += 1
+                return None
+
+            try:
+                value = decode_value(payload)
+            except Exception as e:
+                logger.warning(f"Persistent cache entry {key} could not be decoded ({e}); dropping entry")
+                self._delete_locked(key)
+                self._stats["misses"] += 1
+                return None
+
+            self._conn.execute(
+                "UPDATE cache_entries SET last_accessed = ? WHERE namespace = ? AND key = ?",
+                (time.time(), self.namespace, key)
+            )
+            self._stats["hits"] += 1
+            return StoredEntry(value, created_at, ttl_seconds, stale_ttl_seconds)
+
+    def set(
+        self,
+        key: str,
+        value: Any,
+        category: str,
+        created_at: float,
+        ttl_seconds: int,
+        stale_ttl_seconds: int = 0
+    ) -> bool:
+        """
+        Write an entry, evicting least recently used rows beyond the budget
+
+        Args:
+            key: Full cache key (category-prefixed)
+            value: Value to store
+            category: Cache category name
+            created_at: Entry creation time (epoch seconds)
+            ttl_seconds: Entry TTL
+            stale_ttl_seconds: Stale-while-revalidate window past the TTL
+
+        Returns:
+            True if written, False if the value is not persistable or too large
+        """
+        try:
+            payload = encode_value(value)
+        except (UnpersistableValue, TypeError, ValueError) as e:
+            logger.debug(f"Not persisting {key}: {e}")
+            self._stats["skipped"] += 1
+            return False
+
+        if len(payload) > self.max_bytes:
+            self._stats["skipped"] += 1
+            return False
+
+        checksum = hashlib.sha256(payload).hexdigest()
+        with self._lock:
+            self._total_bytes -= self._row_size_locked(key)
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache_entries "
+                "(namespace, key, category, payload, checksum, size_bytes, created_at, "
+                "ttl_seconds, stale_ttl_seconds, last_accessed) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (self.namespace, key, category, payload, checksum, len(payload), created_at,
+                 ttl_seconds, stale_ttl_seconds, time.time())
+            )
+            self._stats["writes"] += 1
+            self._total_bytes += len(payload)
+            if self._total_bytes > self.max_bytes:
+                self._evict_locked()
+        return True
+
+    def delete(self, key: str):
+        """Delete one entry"""
+        with self._lock:
+            self._delete_locked(key)
+
+    def delete_category(self, category: str) -> int:
+        """Delete all entries of a category; returns the number removed"""
+        with self._lock:
+            self._total_bytes -= self._conn.execute(
+                "SELECT COALESCE(SUM(size_bytes), 0) FROM cache_entries WHERE namespace = ? AND category = ?",
+                (self.namespace, category)
+            ).fetchone()[0]
+            cursor = self._conn.execute(
+                "DELETE FROM cache_entries WHERE namespace = ? AND category = ?",
+                (self.namespace, category)
+            )
+            return cursor.rowcount
+
+    def clear(self) -> int:
+        """Delete all entries in this namespace; returns the number removed"""
+        with self._lock:
+            cursor = self._conn.execute(
+                "DELETE FROM cache_entries WHERE namespace = ?", (self.namespace,)
+            )
+            self._total_bytes = 0
+            return cursor.rowcount
+
+    def cleanup_expired(self) -> int:
+        """Delete entries past their TTL plus stale window; returns the number removed"""
+        now = time.time()
+        with self._lock:
+            self._total_bytes -= self._conn.execute(
+                "SELECT COALESCE(SUM(size_bytes), 0) FROM cache_entries WHERE namespace = ? "
+                "AND created_at + ttl_seconds + stale_ttl_seconds < ?",
+                (self.namespace, now)
+            ).fetchone()[0]
+            cursor = self._conn.execute(
+                "DELETE FROM cache_entries WHERE namespace = ? "
+                "AND created_at + ttl_seconds + stale_ttl_seconds < ?",
+                (self.namespace, now)
+            )
+            return cursor.rowcount
+
+    def _row_size_locked(self, key: str) -> int:
+        row = self._conn.execute(
+            "SELECT size_bytes FROM cache_entries WHERE namespace = ? AND key = ?",
+            (self.namespace, key)
+        ).fetchone()
+        return row[0] if row else 0
+
+    def _delete_locked(self, key: str):
+        self._total_bytes -= self._row_size_locked(key)
+        self._conn.execute(
+            "DELETE FROM cache_entries WHERE namespace = ? AND key = ?",
+            (self.namespace, key)
+        )
+
+    def _evict_locked(self):
+        """Drop least recently accessed rows until the namespace fits its budget"""
+        self._total_bytes = self._total_bytes_locked()
+        if self._total_bytes <= self.max_bytes:
+            return
+
+        rows = self._conn.execute(
+            "SELECT key FROM cache_entries WHERE namespace = ? ORDER BY last_accessed",
+            (self.namespace,)
+        ).fetchall()
+        for (key,) in rows:
+            if self._total_bytes <= self.max_bytes:
+                break
+            self._delete_locked(key)
+            self._stats["evictions"] += 1
+
+    def _total_bytes_locked(self) -> int:
+        row = self._conn.execute(
+            "SELECT COALESCE(SUM(size_bytes), 0) FROM cache_entries WHERE namespace = ?",
+            (self.namespace,)
+        ).fetchone()
+        return row[0]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get store statistics"""
+        with self._lock:
+            count = self._conn.execute(
+                "SELECT COUNT(*) FROM cache_entries WHERE namespace = ?", (self.namespace,)
+            ).fetchone()[0]
+            total = self._total_bytes = self._total_bytes_locked()
+
+        return {
+            "path": self.path,
+            "entries": count,
+            "size_bytes": total,
+            "max_bytes": self.max_bytes,
+            **self._stats
+        }
+
+    def close(self):
+        """Close the database connection"""
+        with self._lock:
+            self._conn.close()
+
+
+def create_store_from_env(namespace: str) -> Optional[PersistentCacheStore]:
+    """
+    Create the persistent store if ``DATASPHERE_CACHE_PERSISTENT_PATH`` is set
+
+    ``DATASPHERE_CACHE_PERSISTENT_MAX_MB`` bounds its size (default 256).
+    A store that cannot be opened is logged and skipped: the in-memory cache
+    works without it.
+
+    Args:
+        namespace: Partition key for rows (tenant URL, or "mock")
+
+    Returns:
+        Store instance, or None when disabled or unavailable
+    """
+    path = os.getenv("DATASPHERE_CACHE_PERSISTENT_PATH", "").strip()
+    if not path:
+        return None
+
+    max_mb = float(os.getenv("DATASPHERE_CACHE_PERSISTENT_MAX_MB", "256"))
+    try:
+        return PersistentCacheStore(path, namespace=namespace, max_bytes=int(max_mb * 1024 * 1024))
+    except (OSError, sqlite3.Error) as e:
+        logger.warning(f"Persistent cache disabled: could not open {path} ({e})")
+        return None
@@ -0,0 +1,364 @@
+"""In-memory full-text search over the cached catalog asset listing.
+
+The catalog search endpoint returns 404, so ``search_tables``,
+``search_catalog`` and ``search_repository`` search the shared
+``all_catalog_assets`` listing client-side. Each of them used to lower-case
+every name, label and description of every asset on every call and return
+substring hits in listing order. This module indexes the listing once:
+
+- field text is lower-cased once per asset;
+- words (split on punctuation and camelCase) get per-field postings, ranked
+  with BM25 and a per-field weight (a hit in the name outranks one in the
+  description);
+- a trigram index over the field text answers plain substring queries, so
+  every asset the old ``query in field`` test found is still found;
+- query words also match by prefix (``cust`` -> ``customer``) and, from four
+  characters on, within a small edit distance (``custmer``);
+- ``objectType`` / ``spaceName`` postings serve filters and facet counts.
+
+Indexes are rebuilt when the listing is refreshed, and can be patched in
+place with :meth:`CatalogSearchIndex.add` / :meth:`CatalogSearchIndex.remove`.
+"""
+
+import math
+import re
+from bisect import bisect_left
+from dataclasses import dataclass, field
+from typing import Any, Collection, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+# Searchable text fields and their ranking weight.
+FIELD_WEIGHTS = {"name": 3.0, "label": 2.0, "businessName": 2.0, "description": 1.0}
+
+# Exact-valued fields with postings, for filters and facets.
+FACET_FIELDS = ("objectType", "spaceName")
+
+# Relative credit for a query word matched only by prefix or by edit distance.
+PREFIX_FACTOR = 0.7
+FUZZY_FACTOR = 0.4
+# Bonus (times the field weight) when the whole query occurs in the field.
+SUBSTRING_BONUS = 1.5
+
+_K1 = 1.2
+_B = 0.75
+
+_WORD_RE = re.compile(r"[A-Za-z0-9]+")
+_CAMEL_RE = re.compile(r"[A-Z]+(?![a-z])|[A-Z]?[a-z]+|[0-9]+")
+
+
+def tokenize(text: str) -> List[str]:
+    """Lower-case words of ``text``; camelCase words also yield their parts."""
+    tokens = []
+    for word in _WORD_RE.findall(text):
+        tokens.append(word.lower())
+        parts = _CAMEL_RE.findall(word)
+        if len(parts) > 1:
+            tokens.extend(part.lower() for part in parts)
+    return tokens
+
+
+def _trigrams(text: str) -> Set[str]:
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def _within_distance(a: str, b: str, limit: int) -> bool:
+    """Whether the Levenshtein distance between ``a`` and ``b`` is <= ``limit``."""
+    if abs(len(a) - len(b)) > limit:
+        return False
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, start=1):
+        current = [i]
+        for j, cb in enumerate(b, start=1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ca != cb)))
+        if min(current) > limit:
+            return False
+        previous = current
+    return previous[-1] <= limit
+
+
+@dataclass
+class SearchHit:
+    """One matching asset with its relevance score."""
+
+    asset: Dict[str, Any]
+    score: float
+    # Fields that matched, in FIELD_WEIGHTS order.
+    fields: List[str] = field(default_factory=list)
+    doc_id: int = 0
+
+
+class CatalogSearchIndex:
+    """Ranked full-text index over a list of catalog asset dicts."""
+
+    def __init__(self, assets: Iterable[Dict[str, Any]] = ()):
+        self._docs: List[Optional[Dict[str, Any]]] = []
+        # Per document: lower-cased field text, and the raw text it was built from
+        self._text: List[Optional[Dict[str, str]]] = []
+        self._raw: List[Optional[Dict[str, str]]] = []
+        self._lengths: Dict[str, Dict[int, int]] = {f: {} for f in FIELD_WEIGHTS}
+        self._length_totals: Dict[str, int] = {f: 0 for f in FIELD_WEIGHTS}
+        # field -> token -> {doc_id: term frequency}
+        self._postings: Dict[str, Dict[str, Dict[int, int]]] = {f: {} for f in FIELD_WEIGHTS}
+        self._trigram_postings: Dict[str, Set[int]] = {}
+        self._facets: Dict[str, Dict[str, Set[int]]] = {f: {} for f in FACET_FIELDS}
+        self._by_key: Dict[Tuple[Optional[str], Optional[str]], int] = {}
+        self._vocabulary: Dict[str, int] = {}  # token -> number of postings lists using it
+        self._sorted_vocabulary: Optional[List[str]] = None
+        self._live = 0
+        # The listing this index was built from (see ``is_built_from``).
+        self.source: Optional[Sequence[Dict[str, Any]]] = None
+
+        self.extend(assets)
+        if isinstance(assets, list):
+            self.source = assets
+
+    def __len__(self) -> int:
+        return self._live
+
+    def is_built_from(self, assets: Sequence[Dict[str, Any]]) -> bool:
+        """Whether this index was built from this very listing object."""
+        return self.source is assets
+
+    @property
+    def assets(self) -> List[Dict[str, Any]]:
+        """Indexed assets in insertion order."""
+        return [doc for doc in self._docs if doc is not None]
+
+    # ------------------------------------------------------------------
+    # Updates
+    # ------------------------------------------------------------------
+
+    def add(self, asset: Dict[str, Any]) -> int:
+        """Index one asset; returns its document id."""
+        doc_id = len(self._docs)
+        self._docs.append(asset)
+        self._by_key[self._key(asset)] = doc_id
+        text, raw_text = {}, {}
+        grams: Set[str] = set()
+        for name in FIELD_WEIGHTS:
+            value = asset.get(name)
+            raw = value if isinstance(value, str) else ""
+            lowered = raw.lower()
+            text[name] = lowered
+            raw_text[name] = raw
+            grams |= _trigrams(lowered)
+
+            tokens = tokenize(raw)
+            self._lengths[name][doc_id] = len(tokens)
+            self._length_totals[name] += len(tokens)
+            postings = self._postings[name]
+            for token in tokens:
+                docs = postings.setdefault(token, {})
+                if doc_id not in docs:
+                    self._vocabulary[token] = self._vocabulary.get(token, 0) + 1
+                    self._sorted_vocabulary = None
+                docs[doc_id] = docs.get(doc_id, 0) + 1
+        self._text.append(text)
+        self._raw.append(raw_text)
+        for gram in grams:
+            self._trigram_postings.setdefault(gram, set()).add(doc_id)
+        for name in FACET_FIELDS:
+            self._facets[name].setdefault(self._facet_value(asset, name), set()).add(doc_id)
+        self._live += 1
+        return doc_id
+
+    def extend(self, assets: Iterable[Dict[str, Any]]) -> None:
+        """Index several assets (e.g. one page of a catalog crawl)."""
+        for asset in assets:
+            self.add(asset)
+
+    def remove(self, doc_id: int) -> None:
+        """Drop a document from every postings list (no-op if already gone)."""
+        asset = self._docs[doc_id]
+        if asset is None:
+            return
+        text = self._text[doc_id]
+        for name in FIELD_WEIGHTS:
+            self._length_totals[name] -= self._lengths[name].pop(doc_id, 0)
+            postings = self._postings[name]
+            for token in set(tokenize(self._raw[doc_id][name])):
+                docs = postings.get(token)
+                if docs is None or docs.pop(doc_id, None) is None:
+                    continue
+                if not docs:
+                    del postings[token]
+                self._vocabulary[token] -= 1
+                if not self._vocabulary[token]:
+                    del self._vocabulary[token]
+                    self._sorted_vocabulary = None
+        for gram in set().union(*(_trigrams(value) for value in text.values())):
+            docs = self._trigram_postings.get(gram)
+            if docs is not None:
+                docs.discard(doc_id)
+                if not docs:
+                    del self._trigram_postings[gram]
+        for name in FACET_FIELDS:
+            value = self._facet_value(asset, name)
+            docs = self._facets[name].get(value)
+            if docs is not None:
+                docs.discard(doc_id)
+                if not docs:
+                    del self._facets[name][value]
+        if self._by_key.get(self._key(asset)) == doc_id:
+            del self._by_key[self._key(asset)]
+        self._docs[doc_id] = None
+        self._text[doc_id] = None
+        self._raw[doc_id] = None
+        self._live -= 1
+
+    def doc_id(self, space_id: Optional[str], name: Optional[str]) -> Optional[int]:
+        """Document id of the asset ``name`` in ``space_id``, if it is indexed."""
+        return self._by_key.get((space_id, name))
+
+    @staticmethod
+    def _key(asset: Dict[str, Any]) -> Tuple[Optional[str], Optional[str]]:
+        return asset.get("spaceName"), asset.get("name")
+
+    @staticmethod
+    def _facet_value(asset: Dict[str, Any], name: str) -> str:
+        value = asset.get(name)
+        return value if isinstance(value, str) and value else "Unknown"
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def search(self, query: str, fields: Sequence[str] = ("name", "label", "description"),
+               filters: Optional[Dict[str, Collection[str]]] = None) -> List[SearchHit]:
+        """Rank the assets matching ``query`` in ``fields``.
+
+        An asset matches when the whole query occurs in one of the fields (the
+        historical substring rule) or when every query word matches a word of
+        those fields exactly, by prefix or within a small edit distance. An
+        empty query matches every asset, in listing order.
+
+        Args:
+            query: Free text
+            fields: Text fields to search (keys of ``FIELD_WEIGHTS``)
+            filters: ``{facet field: allowed values}``, e.g.
+                ``{"spaceName": ["SALES"]}``
+
+        Returns:
+            Hits by descending score; ties keep listing order.
+        """
+        allowed = self._filter_docs(filters)
+        query_lower = (query or "").lower()
+        if not query_lower.strip():
+            return [SearchHit(asset=self._docs[doc_id], score=0.0, doc_id=doc_id)
+                    for doc_id in sorted(allowed if allowed is not None else self._live_ids())]
+
+        scores: Dict[int, float] = {}
+        matched_fields: Dict[int, Set[str]] = {}
+
+        # Whole-query substring hits (trigram candidates, then verified).
+        for doc_id in self._substring_candidates(query_lower):
+            if allowed is not None and doc_id not in allowed:
+                continue
+            text = self._text[doc_id]
+            for name in fields:
+                if query_lower in text[name]:
+                    scores[doc_id] = scores.get(doc_id, 0.0) + SUBSTRING_BONUS * FIELD_WEIGHTS[name]
+                    matched_fields.setdefault(doc_id, set()).add(name)
+
+        # Word hits: every query word must match somewhere in ``fields``.
+        words = list(dict.fromkeys(tokenize(query)))
+        word_docs: Optional[Set[int]] = None
+        word_scores: Dict[int, float] = {}
+        word_fields: Dict[int, Set[str]] = {}
+        for word in words:
+            docs_for_word: Set[int] = set()
+            for term, factor in self._expand(word):
+                for name in fields:
+                    postings = self._postings[name].get(term)
+                    if not postings:
+                        continue
+                    idf = self._idf(name, len(postings))
+                    average = self._average_length(name)
+                    for doc_id, tf in postings.items():
+                        if allowed is not None and doc_id not in allowed:
+                            continue
+                        norm = tf + _K1 * (1 - _B + _B * self._lengths[name][doc_id] / average)
+                        gain = FIELD_WEIGHTS[name] * factor * idf * tf * (_K1 + 1) / norm
+                        word_scores[doc_id] = word_scores.get(doc_id, 0.0) + gain
+                        word_fields.setdefault(doc_id, set()).add(name)
+                        docs_for_word.add(doc_id)
+            word_docs = docs_for_word if word_docs is None else word_docs & docs_for_word
+            if not word_docs:
+                break
+
+        for doc_id in word_docs or ():
+            scores[doc_id] = scores.get(doc_id, 0.0) + word_scores[doc_id]
+            matched_fields.setdefault(doc_id, set()).update(word_fields[doc_id])
+
+        hits = [
+            SearchHit(asset=self._docs[doc_id], score=round(score, 4),
+                      fields=[name for name in FIELD_WEIGHTS if name in matched_fields[doc_id]],
+                      doc_id=doc_id)
+            for doc_id, score in scores.items()
+        ]
+        hits.sort(key=lambda hit: (-hit.score, hit.doc_id))
+        return hits
+
+    def facet_counts(self, doc_ids: Iterable[int], name: str, limit: int) -> List[Dict[str, Any]]:
+        """``[{"value", "count"}]`` of facet ``name`` over ``doc_ids``, largest first."""
+        doc_ids = set(doc_ids)
+        counts = [(value, len(docs & doc_ids)) for value, docs in self._facets.get(name, {}).items()]
+        counts = [(value, count) for value, count in counts if count]
+        counts.sort(key=lambda item: item[1], reverse=True)
+        return [{"value": value, "count": count} for value, count in counts[:limit]]
+
+    def _live_ids(self) -> List[int]:
+        return [doc_id for doc_id, doc in enumerate(self._docs) if doc is not None]
+
+    def _filter_docs(self, filters: Optional[Dict[str, Collection[str]]]) -> Optional[Set[int]]:
+        if not filters:
+            return None
+        allowed: Optional[Set[int]] = None
+        for name, values in filters.items():
+            docs: Set[int] = set()
+            for value in values:
+                docs |= self._facets.get(name, {}).get(value, set())
+            allowed = docs if allowed is None else allowed & docs
+        return allowed
+
+    def _substring_candidates(self, query_lower: str) -> Iterable[int]:
+        grams = _trigrams(query_lower)
+        if not grams:
+            return self._live_ids()
+        candidates: Optional[Set[int]] = None
+        for gram in sorted(grams, key=lambda g: len(self._trigram_postings.get(g, ()))):
+            docs = self._trigram_postings.get(gram)
+            if not docs:
+                return ()
+            candidates = set(docs) if candidates is None else candidates & docs
+            if not candidates:
+                return ()
+        return candidates
+
+    def _expand(self, word: str) -> List[tuple]:
+        """Vocabulary terms a query word matches, with their credit factor."""
+        expansions = []
+        if word in self._vocabulary:
+            expansions.append((word, 1.0))
+        vocabulary = self._sorted()
+        start = bisect_left(vocabulary, word)
+        for term in vocabulary[start:]:
+            if not term.startswith(word):
+                break
+            if term != word:
+                expansions.append((term, PREFIX_FACTOR))
+        if not expansions and len(word) >= 4:
+            limit = 1 if len(word) < 8 else 2
+            expansions = [(term, FUZZY_FACTOR) for term in vocabulary
+                          if term[0] == word[0] and _within_distance(word, term, limit)]
+        return expansions
+
+    def _sorted(self) -> List[str]:
+        if self._sorted_vocabulary is None:
+            self._sorted_vocabulary = sorted(self._vocabulary)
+        return self._sorted_vocabulary
+
+    def _idf(self, name: str, doc_freq: int) -> float:
+        return math.log(1 + (self._live - doc_freq + 0.5) / (doc_freq + 0.5))
+
+    def _average_length(self, name: str) -> float:
+        return max(1.0, self._length_totals[name] / max(1, self._live))
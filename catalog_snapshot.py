@@ -0,0 +1,339 @@
+"""Paged crawl of the catalog asset listing into one snapshot.
+
+The catalog search tools used to read ``/catalog/assets`` once with
+``$top=500, $skip=0``: on larger tenants everything past the first 500 assets
+was silently invisible, and raising ``$top`` would only trade that for one
+huge blocking response. :func:`crawl_catalog` pages through the whole listing
+instead:
+
+- at most ``concurrency`` pages are in flight at once (a sliding window, so a
+  slow page does not hold back the next requests);
+- pages are handed to ``on_page`` in listing order as soon as they and every
+  page before them have arrived, so a search index can be built while the
+  crawl is still running;
+- the end is the first short page, or ``@odata.count`` when the service
+  reports it;
+- the snapshot records whether it is complete, and when it was taken.
+
+A snapshot is a plain JSON-serialisable dict, so it can be kept in the
+persistent cache tier:
+
+    {"assets": [...], "complete": bool, "fetched_at": epoch seconds,
+     "pages": int, "page_size": int, "reported_total": int | None,
+     "error": str | None}
+
+:func:`stamp` adds what later delta syncs need (``full_sync_at``,
+``delta_field``/``high_water_mark``, ``space_hashes``, ``delta_mode``).
+:func:`sync_catalog` then finds what changed since the snapshot and
+:func:`apply_delta` patches it in place:
+
+- ``modified_filter``: only assets modified since the high-water mark are
+  requested (``$filter=modifiedAt ge ...``). Deletions are invisible to such
+  a query, so callers still crawl in full every so often.
+- ``space_hash``: when the service rejects that filter, the listing is read
+  in full but compared per space by content hash, and only spaces whose hash
+  changed are diffed and patched; unchanged assets keep their identity, so
+  indexes built over them stay valid.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import math
+import time
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# fetch_page(skip, top, filter_expr) -> OData response body ({"value": [...], ...})
+PageFetcher = Callable[[int, int, Optional[str]], Awaitable[Dict[str, Any]]]
+
+# Modification timestamp fields, in order of preference, for delta syncs.
+DELTA_FIELDS = ("modifiedAt", "changedAt", "modified")
+
+MODE_FILTER = "modified_filter"
+MODE_SPACE_HASH = "space_hash"
+
+
+def _asset_key(asset: Dict[str, Any]):
+    return asset.get("spaceName"), asset.get("name") or asset.get("id")
+
+
+async def crawl_catalog(fetch_page: PageFetcher, page_size: int = 500, concurrency: int = 4,
+                        max_pages: int = 200,
+                        on_page: Optional[Callable[[List[Dict[str, Any]]], None]] = None,
+                        filter_expr: Optional[str] = None) -> Dict[str, Any]:
+    """Download the full asset listing page by page.
+
+    Args:
+        fetch_page: Coroutine ``(skip, top, filter_expr)`` returning one page
+        page_size: ``$top`` of every request
+        concurrency: Maximum pages in flight
+        max_pages: Safety bound; a listing longer than this is marked incomplete
+        on_page: Called with each page's new assets, in listing order
+        filter_expr: Optional ``$filter`` sent with every page
+
+    Returns:
+        The snapshot dict (see module docstring). A failure after the first
+        page yields the pages fetched so far with ``complete`` false and the
+        ``error``; a failure of the first page is raised.
+    """
+    started = time.time()
+    assets: List[Dict[str, Any]] = []
+    seen = set()
+    buffered: Dict[int, List[Dict[str, Any]]] = {}
+    next_to_emit = 0
+    error: Optional[str] = None
+
+    first = await fetch_page(0, page_size, filter_expr)
+    first_rows = first.get("value", [])
+    reported_total = first.get("@odata.count")
+    if isinstance(reported_total, int):
+        last_page = max(0, math.ceil(reported_total / page_size) - 1)
+    else:
+        reported_total = None
+        last_page = None
+    if len(first_rows) < page_size:
+        last_page = 0
+    first_key = _asset_key(first_rows[0]) if first_rows else None
+
+    def emit(page_no: int, rows: List[Dict[str, Any]]):
+        nonlocal next_to_emit
+        buffered[page_no] = rows
+        while next_to_emit in buffered and (last_page is None or next_to_emit <= last_page):
+            page = buffered.pop(next_to_emit)
+            next_to_emit += 1
+            fresh = []
+            for asset in page:
+                key = _asset_key(asset)
+                # Assets can shift across page boundaries while the crawl runs
+                if key not in seen:
+                    seen.add(key)
+                    fresh.append(asset)
+            assets.extend(fresh)
+            if on_page is not None and fresh:
+                on_page(fresh)
+
+    emit(0, first_rows)
+
+    # A failed page ends the crawl; pages before it still in flight are awaited
+    # so that the snapshot keeps the longest contiguous prefix.
+    failed_page: Optional[int] = None
+    in_flight: Dict[asyncio.Task, int] = {}
+    next_page = 1
+    try:
+        while True:
+            while (failed_page is None and len(in_flight) < concurrency and next_page < max_pages
+                   and (last_page is None or next_page <= last_page)):
+                task = asyncio.ensure_future(fetch_page(next_page * page_size, page_size, filter_expr))
+                in_flight[task] = next_page
+                next_page += 1
+            if not in_flight:
+                break
+
+            done, _ = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+            for task in sorted(done, key=in_flight.get):
+                page_no = in_flight.pop(task)
+                if last_page is not None and page_no > last_page:
+                    continue
+                if failed_page is not None and page_no > failed_page:
+                    continue
+                try:
+                    rows = task.result().get("value", [])
+                    if rows and _asset_key(rows[0]) == first_key:
+                        raise RuntimeError("the service ignored $skip (page repeats the first page)")
+                except Exception as e:
+                    failed_page = page_no
+                    error = str(e) or type(e).__name__
+                    continue
+                if len(rows) < page_size and (last_page is None or page_no < last_page):
+                    last_page = page_no
+                emit(page_no, rows)
+
+            # Pages past a short (or failed) page are not needed
+            for task, page_no in list(in_flight.items()):
+                if ((last_page is not None and page_no > last_page)
+                        or (failed_page is not None and page_no > failed_page)):
+                    task.cancel()
+                    del in_flight[task]
+    finally:
+        for task in in_flight:
+            if task.done():
+                if not task.cancelled():
+                    task.exception()
+            else:
+                task.cancel()
+
+    if error is not None:
+        logger.warning(f"Catalog crawl stopped after {next_to_emit} pages: {error}")
+    complete = error is None and last_page is not None and next_to_emit > last_page
+    if error is None and not complete:
+        error = f"stopped at the {max_pages}-page limit"
+    logger.info(f"Catalog crawl: {len(assets)} assets in {next_to_emit} pages "
+                f"({time.time() - started:.1f}s, complete={complete})")
+    return {
+        "assets": assets,
+        "complete": complete,
+        "fetched_at": started,
+        "pages": next_to_emit,
+        "page_size": page_size,
+        "reported_total": reported_total,
+        "error": error,
+    }
+
+
+def coverage(snapshot: Dict[str, Any]) -> Dict[str, Any]:
+    """How complete and how old a snapshot is, for tool results."""
+    info = {
+        "assets": len(snapshot["assets"]),
+        "complete": snapshot["complete"],
+        "age_seconds": round(time.time() - snapshot["fetched_at"], 1),
+    }
+    if "last_sync" in snapshot:
+        info["last_sync"] = snapshot["last_sync"]
+    if not snapshot["complete"]:
+        info["warning"] = f"Catalog listing is incomplete ({snapshot.get('error')}); results may be missing assets"
+    return info
+
+
+# ----------------------------------------------------------------------
+# Delta sync
+# ----------------------------------------------------------------------
+
+def _space(asset: Dict[str, Any]) -> str:
+    return asset.get("spaceName") or ""
+
+
+def high_water_mark(assets: Iterable[Dict[str, Any]]) -> Tuple[Optional[str], Optional[str]]:
+    """``(field, latest value)`` of the first modification field the assets carry."""
+    assets = list(assets)
+    for name in DELTA_FIELDS:
+        values = [asset[name] for asset in assets if isinstance(asset.get(name), str)]
+        if values:
+            # ISO 8601 timestamps in one format order lexicographically
+            return name, max(values)
+    return None, None
+
+
+def space_hashes(assets: Iterable[Dict[str, Any]]) -> Dict[str, str]:
+    """Content hash of each space's assets, independent of listing order."""
+    rows: Dict[str, List[str]] = {}
+    for asset in assets:
+        rows.setdefault(_space(asset), []).append(json.dumps(asset, sort_keys=True, default=str))
+    return {space: hashlib.sha256("\n".join(sorted(lines)).encode("utf-8")).hexdigest()
+            for space, lines in rows.items()}
+
+
+def stamp(snapshot: Dict[str, Any], delta_mode: Optional[str] = None) -> Dict[str, Any]:
+    """Record on a fully crawled snapshot what later delta syncs start from."""
+    snapshot["full_sync_at"] = snapshot["fetched_at"]
+    snapshot["delta_field"], snapshot["high_water_mark"] = high_water_mark(snapshot["assets"])
+    snapshot["space_hashes"] = space_hashes(snapshot["assets"])
+    snapshot["delta_mode"] = delta_mode
+    snapshot["last_sync"] = {"mode": "full", "changed": len(snapshot["assets"]), "removed": 0,
+                             "pages": snapshot["pages"]}
+    return snapshot
+
+
+def can_sync(snapshot: Optional[Dict[str, Any]], full_sync_interval: float) -> bool:
+    """Whether ``snapshot`` can be brought up to date by a delta sync."""
+    return (snapshot is not None and snapshot.get("complete") and "full_sync_at" in snapshot
+            and time.time() - snapshot["full_sync_at"] < full_sync_interval)
+
+
+async def sync_catalog(snapshot: Dict[str, Any], fetch_page: PageFetcher, page_size: int = 500,
+                       concurrency: int = 4, max_pages: int = 200) -> Dict[str, Any]:
+    """Find the assets changed since ``snapshot`` (which is not modified).
+
+    Returns:
+        ``{"mode", "changed": [assets], "removed": [(space, name)], "pages"}``;
+        a ``space_hash`` delta also carries the new ``space_hashes``.
+
+    Raises:
+        RuntimeError: When the changes could not be read completely
+    """
+    name, mark = snapshot.get("delta_field"), snapshot.get("high_water_mark")
+    mode = snapshot.get("delta_mode")
+    if mode != MODE_SPACE_HASH and name and mark:
+        try:
+            # "ge", not "gt": re-reading the assets at the mark is harmless
+            changed = await crawl_catalog(fetch_page, page_size, concurrency, max_pages,
+                                          filter_expr=f"{name} ge {mark}")
+        except Exception as e:
+            status = getattr(e, "status", None)
+            if not isinstance(status, int) or not 400 <= status < 500:
+                raise
+            logger.info(f"Catalog listing rejects $filter on {name} ({e}); syncing by space hashes")
+        else:
+            if not changed["complete"]:
+                raise RuntimeError(f"Catalog delta incomplete: {changed['error']}")
+            return {"mode": MODE_FILTER, "changed": changed["assets"], "removed": [],
+                    "pages": changed["pages"]}
+
+    full = await crawl_catalog(fetch_page, page_size, concurrency, max_pages)
+    if not full["complete"]:
+        raise RuntimeError(f"Catalog listing incomplete: {full['error']}")
+    new_hashes = space_hashes(full["assets"])
+    old_hashes = snapshot.get("space_hashes") or {}
+    dirty = {space for space in new_hashes.keys() | old_hashes.keys()
+             if new_hashes.get(space) != old_hashes.get(space)}
+
+    old_assets = {_asset_key(asset): asset for asset in snapshot["assets"] if _space(asset) in dirty}
+    changed, seen = [], set()
+    for asset in full["assets"]:
+        if _space(asset) not in dirty:
+            continue
+        key = _asset_key(asset)
+        seen.add(key)
+        if old_assets.get(key) != asset:
+            changed.append(asset)
+    removed = [key for key in old_assets if key not in seen]
+    return {"mode": MODE_SPACE_HASH, "changed": changed, "removed": removed,
+            "pages": full["pages"], "space_hashes": new_hashes}
+
+
+def apply_delta(snapshot: Dict[str, Any], delta: Dict[str, Any]
+                ) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """Patch ``snapshot`` in place with a :func:`sync_catalog` delta.
+
+    The ``assets`` list stays the same object: changed assets are replaced
+    where they were, new ones appended, removed ones dropped.
+
+    Returns:
+        ``(removed, added)``: asset dicts that left the listing (including the
+        old versions of changed assets) and the ones that entered it, for
+        patching indexes built over it.
+    """
+    assets = snapshot["assets"]
+    positions = {_asset_key(asset): position for position, asset in enumerate(assets)}
+    removed: List[Dict[str, Any]] = []
+    added: List[Dict[str, Any]] = []
+
+    for asset in delta["changed"]:
+        position = positions.get(_asset_key(asset))
+        if position is None:
+            positions[_asset_key(asset)] = len(assets)
+            assets.append(asset)
+        else:
+            removed.append(assets[position])
+            assets[position] = asset
+        added.append(asset)
+
+    gone = {key for key in delta["removed"] if key in positions}
+    if gone:
+        removed.extend(asset for asset in assets if _asset_key(asset) in gone)
+        assets[:] = [asset for asset in assets if _asset_key(asset) not in gone]
+
+    if delta["mode"] == MODE_SPACE_HASH:
+        snapshot["space_hashes"] = delta["space_hashes"]
+    else:
+        snapshot["space_hashes"] = space_hashes(assets)
+    name, mark = high_water_mark(assets)
+    if name is not None:
+        snapshot["delta_field"], snapshot["high_water_mark"] = name, mark
+    snapshot["delta_mode"] = delta["mode"]
+    snapshot["fetched_at"] = time.time()
+    snapshot["last_sync"] = {"mode": delta["mode"], "changed": len(delta["changed"]),
+                             "removed": len(gone), "pages": delta["pages"]}
+    return removed, added
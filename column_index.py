@@ -0,0 +1,341 @@
+"""Tenant-wide inverted index from column names to the assets exposing them.
+
+``find_assets_by_column`` used to download and scan every asset's
+``$metadata`` on each call, and the catalog search tools could not see columns
+at all. This index maps
+
+- the column name (upper-cased),
+- its normalised form (``customer_id``, ``CustomerID`` -> ``CUSTOMERID``), and
+- its EDM data type
+
+to the ``(space, asset)`` pairs exposing it, together with each asset's
+column list (entity, name, type). It is fed from parsed ``$metadata``
+(:class:`metadata_schema.AssetSchema`): every schema the server parses for
+any tool is indexed, and a background crawl fills in the rest of the tenant.
+Re-indexing an asset replaces its postings, so refreshes are incremental.
+
+The index can be persisted to a local JSON file
+(``DATASPHERE_COLUMN_INDEX_PATH``). Like the persistent cache tier, the file
+is private to the user and stamped with a namespace (the tenant URL), so one
+tenant's index is never served to another.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import re
+import time
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+AssetKey = Tuple[str, str]  # (space_id, asset_id)
+
+_NON_ALNUM_RE = re.compile(r"[^0-9A-Z]")
+
+
+def normalize_column(name: str) -> str:
+    """Case- and separator-insensitive form of a column name."""
+    return _NON_ALNUM_RE.sub("", name.upper())
+
+
+class ColumnIndex:
+    """Inverted index of columns across the tenant's assets."""
+
+    FORMAT_VERSION = 1
+
+    def __init__(self, namespace: str = "", path: Optional[str] = None):
+        """
+        Args:
+            namespace: Tenant the indexed assets belong to (URL, or "mock")
+            path: Optional JSON file the index is persisted to
+        """
+        self.namespace = namespace
+        self.path = path
+        # (space, asset) -> {"columns": [[entity, name, type], ...],
+        #                    "asset_type": str | None, "kind": str,
+        #                    "fetched_at": float, "indexed_at": float}
+        self._assets: Dict[AssetKey, Dict[str, Any]] = {}
+        self._by_name: Dict[str, Set[AssetKey]] = {}
+        self._by_normalized: Dict[str, Set[AssetKey]] = {}
+        self._by_type: Dict[str, Set[AssetKey]] = {}
+        # Spaces fully listed by the last crawl, and when it finished; the
+        # index is complete tenant-wide only if that crawl listed every space.
+        self.crawled_spaces: Set[str] = set()
+        self.crawled_at: Optional[float] = None
+        self.complete_at: Optional[float] = None
+
+    def __len__(self) -> int:
+        return len(self._assets)
+
+    # ------------------------------------------------------------------
+    # Updates
+    # ------------------------------------------------------------------
+
+    def add_schema(self, schema, asset_type: Optional[str] = None) -> bool:
+        """Index (or re-index) the columns of a parsed ``AssetSchema``.
+
+        A schema already indexed from the same fetch is skipped, so callers
+        may pass every schema they see. Returns True if the index changed.
+        """
+        key = (schema.space_id, schema.asset_id)
+        current = self._assets.get(key)
+        if current is not None and current["fetched_at"] == schema.fetched_at:
+            # Same document as indexed: only confirm it is still current
+            current["indexed_at"] = time.time()
+            if asset_type and not current["asset_type"]:
+                current["asset_type"] = asset_type
+            return False
+
+        columns = [[entity.name, prop.name, prop.type] for entity in schema.entities for prop in entity.properties]
+        self.add_asset(schema.space_id, schema.asset_id, columns, kind=schema.kind,
+                       asset_type=asset_type or (current or {}).get("asset_type"),
+                       fetched_at=schema.fetched_at)
+        return True
+
+    def add_asset(self, space_id: str, asset_id: str, columns: List[List[str]],
+                  kind: str = "relational", asset_type: Optional[str] = None,
+                  fetched_at: Optional[float] = None, indexed_at: Optional[float] = None):
+        """Replace the postings of one asset with ``columns`` ([entity, name, type])."""
+        key = (space_id, asset_id)
+        self.remove_asset(space_id, asset_id)
+        self._assets[key] = {
+            "columns": [list(column) for column in columns],
+            "asset_type": asset_type,
+            "kind": kind,
+            "fetched_at": fetched_at if fetched_at is not None else time.time(),
+            "indexed_at": indexed_at if indexed_at is not None else time.time(),
+        }
+        for _entity, name, data_type in columns:
+            self._by_name.setdefault(name.upper(), set()).add(key)
+            self._by_normalized.setdefault(normalize_column(name), set()).add(key)
+            if data_type:
+                self._by_type.setdefault(data_type, set()).add(key)
+
+    def remove_asset(self, space_id: str, asset_id: str):
+        """Drop an asset and its postings (no-op if it is not indexed)."""
+        key = (space_id, asset_id)
+        doc = self._assets.pop(key, None)
+        if doc is None:
+            return
+        for _entity, name, data_type in doc["columns"]:
+            self._discard(self._by_name, name.upper(), key)
+            self._discard(self._by_normalized, normalize_column(name), key)
+            if data_type:
+                self._discard(self._by_type, data_type, key)
+
+    def retain_assets(self, space_id: str, asset_ids: Iterable[str]) -> int:
+        """Drop assets of ``space_id`` not in ``asset_ids``; returns how many."""
+        keep = set(asset_ids)
+        gone = [asset for space, asset in self._assets if space == space_id and asset not in keep]
+        for asset_id in gone:
+            self.remove_asset(space_id, asset_id)
+        return len(gone)
+
+    def retain_spaces(self, space_ids: Iterable[str]) -> int:
+        """Drop every asset of spaces not in ``space_ids``; returns how many."""
+        keep = set(space_ids)
+        gone = [key for key in self._assets if key[0] not in keep]
+        for space_id, asset_id in gone:
+            self.remove_asset(space_id, asset_id)
+        return len(gone)
+
+    def mark_complete(self, space_ids: Iterable[str], tenant_space_ids: Optional[Iterable[str]] = None):
+        """Record that every asset of ``space_ids`` has just been indexed.
+
+        The index counts as complete tenant-wide only if ``space_ids`` covers
+        ``tenant_space_ids`` (every space the crawl set out to list); a space
+        whose listing failed leaves per-space answers for the others only.
+        """
+        self.crawled_spaces = set(space_ids)
+        self.crawled_at = time.time()
+        if tenant_space_ids is None or self.crawled_spaces.issuperset(tenant_space_ids):
+            self.complete_at = self.crawled_at
+        else:
+            self.complete_at = None
+
+    @staticmethod
+    def _discard(postings: Dict[str, Set[AssetKey]], term: str, key: AssetKey):
+        keys = postings.get(term)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del postings[term]
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def needs_refresh(self, space_id: str, asset_id: str, max_age_seconds: float) -> bool:
+        """Whether an asset is missing or was indexed more than ``max_age_seconds`` ago."""
+        doc = self._assets.get((space_id, asset_id))
+        return doc is None or time.time() - doc["indexed_at"] > max_age_seconds
+
+    def is_complete(self, max_age_seconds: float, space_id: Optional[str] = None) -> bool:
+        """Whether a crawl finished recently enough to answer from the index alone.
+
+        Without ``space_id`` this requires the last crawl to have listed
+        every space of the tenant.
+        """
+        if space_id is None:
+            return self.complete_at is not None and time.time() - self.complete_at <= max_age_seconds
+        return (self.crawled_at is not None and time.time() - self.crawled_at <= max_age_seconds
+                and space_id in self.crawled_spaces)
+
+    def find(self, column_name: str, case_sensitive: bool = False,
+             space_id: Optional[str] = None, data_type: Optional[str] = None,
+             normalized: bool = False) -> List[Dict[str, Any]]:
+        """Assets exposing ``column_name``, ordered by space and asset.
+
+        Args:
+            column_name: Column to look up
+            case_sensitive: Require the exact spelling
+            space_id: Only assets of this space
+            data_type: Only columns of this EDM type (e.g. ``Edm.String``)
+            normalized: Also ignore separators (``CUSTOMER_ID`` ~ ``CustomerId``)
+
+        Returns:
+            One hit per asset (its first matching column) with ``space_id``,
+            ``asset_name``, ``asset_type``, ``entity``, ``column_name``,
+            ``column_type`` and ``total_columns``.
+        """
+        if normalized:
+            wanted = normalize_column(column_name)
+            candidates = self._by_normalized.get(wanted, set())
+            matches = lambda name: normalize_column(name) == wanted  # noqa: E731
+        else:
+            candidates = self._by_name.get(column_name.upper(), set())
+            if case_sensitive:
+                matches = lambda name: name == column_name  # noqa: E731
+            else:
+                wanted = column_name.upper()
+                matches = lambda name: name.upper() == wanted  # noqa: E731
+        if data_type is not None:
+            candidates = candidates & self._by_type.get(data_type, set())
+
+        hits = []
+        for key in sorted(candidates):
+            if space_id is not None and key[0] != space_id:
+                continue
+            doc = self._assets[key]
+            for entity, name, column_type in doc["columns"]:
+                if matches(name) and (data_type is None or column_type == data_type):
+                    hits.append({
+                        "space_id": key[0],
+                        "asset_name": key[1],
+                        "asset_type": doc["asset_type"] or "Unknown",
+                        "entity": entity,
+                        "column_name": name,
+                        "column_type": column_type or "Unknown",
+                        "total_columns": len(doc["columns"]),
+                    })
+                    break
+        return hits
+
+    def match_columns(self, text: str, space_id: Optional[str] = None) -> Dict[AssetKey, List[str]]:
+        """Assets with a column whose normalised name contains ``text``'s.
+
+        Scans the column vocabulary (distinct names), not the assets, then
+        follows the postings. Returns ``{(space, asset): [column names]}``.
+        """
+        needle = normalize_column(text)
+        if not needle:
+            return {}
+        keys: Set[AssetKey] = set()
+        for term, postings in self._by_normalized.items():
+            if needle in term:
+                keys.update(postings)
+
+        found: Dict[AssetKey, List[str]] = {}
+        for key in keys:
+            if space_id is not None and key[0] != space_id:
+                continue
+            found[key] = [name for _entity, name, _type in self._assets[key]["columns"]
+                          if needle in normalize_column(name)]
+        return found
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "assets": len(self._assets),
+            "distinct_columns": len(self._by_name),
+            "data_types": len(self._by_type),
+            "crawled_spaces": len(self.crawled_spaces),
+            "complete_age_seconds": None if self.complete_at is None else round(time.time() - self.complete_at, 1),
+            "persistent_path": self.path,
+        }
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "version": self.FORMAT_VERSION,
+            "namespace": self.namespace,
+            "complete_at": self.complete_at,
+            "crawled_at": self.crawled_at,
+            "crawled_spaces": sorted(self.crawled_spaces),
+            "assets": [[space, asset, doc] for (space, asset), doc in self._assets.items()],
+        }
+
+    def save(self) -> bool:
+        """Write the index to ``path`` atomically; returns False if not persisted."""
+        if not self.path:
+            return False
+        return self._write(self.to_dict())
+
+    async def save_async(self) -> bool:
+        """``save`` with the JSON encoding and file write on a worker thread.
+
+        The snapshot of the postings is taken on the calling (event loop)
+        thread, so concurrent index updates cannot race the encoder.
+        """
+        if not self.path:
+            return False
+        return await asyncio.to_thread(self._write, self.to_dict())
+
+    def _write(self, data: Dict[str, Any]) -> bool:
+        tmp_path = f"{self.path}.tmp"
+        try:
+            directory = os.path.dirname(os.path.abspath(self.path))
+            os.makedirs(directory, exist_ok=True)
+            # Column lists are tenant metadata: keep the file private
+            fd = os.open(tmp_path, os.O_CREAT | os.O_WRONLY | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, "w") as fh:
+                json.dump(data, fh)
+            os.replace(tmp_path, self.path)
+            return True
+        except OSError as e:
+            logger.warning(f"Column index not persisted to {self.path}: {e}")
+            return False
+
+    @classmethod
+    def load(cls, path: Optional[str], namespace: str = "") -> "ColumnIndex":
+        """Load a persisted index, or start empty.
+
+        A missing, unreadable, foreign-namespace or older-format file yields an
+        empty index bound to ``path``; it is overwritten by the next save.
+        """
+        path = os.path.expanduser(path) if path else None
+        index = cls(namespace=namespace, path=path)
+        if not path or not os.path.exists(path):
+            return index
+        try:
+            with open(path) as fh:
+                data = json.load(fh)
+            if data.get("version") != cls.FORMAT_VERSION or data.get("namespace") != namespace:
+                logger.info(f"Ignoring column index at {path}: different tenant or format")
+                return index
+            for space_id, asset_id, doc in data["assets"]:
+                index.add_asset(space_id, asset_id, doc["columns"], kind=doc["kind"],
+                                asset_type=doc["asset_type"], fetched_at=doc["fetched_at"],
+                                indexed_at=doc["indexed_at"])
+            index.crawled_spaces = set(data["crawled_spaces"])
+            index.complete_at = data["complete_at"]
+            index.crawled_at = data.get("crawled_at", index.complete_at)
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logger.warning(f"Column index at {path} is unreadable, starting empty: {e}")
+            return cls(namespace=namespace, path=path)
+        logger.info(f"Loaded column index from {path}: {len(index)} assets")
+        return index
@@ -0,0 +1,387 @@
+"""
+Columnar client-side aggregation for smart_query
+
+When an asset cannot answer an aggregation itself (no analytical
+consumption), ``smart_query`` fetches raw rows through the relational
+endpoint and aggregates them here. Up to 50,000 row dicts pass through this
+code for each query.
+
+Each column the query references is read out of the rows once. GROUP BY
+keys are factorized into one integer group id per row. Each aggregated column
+is then split into per-group value lists in one pass, which every aggregate
+over that column shares; the reductions themselves (``sum``, ``min``,
+``max``) run in C. Without GROUP BY there is nothing to factorize and each
+column is reduced directly. HAVING and ORDER BY run on the aggregated rows,
+which are few.
+
+Supported SQL subset (the rest of the query is handled upstream):
+
+- ``COUNT(*)``, ``COUNT(col)``, ``SUM``, ``AVG``, ``MIN``, ``MAX``,
+  each optionally ``AS alias``
+- ``GROUP BY col, ...``
+- ``HAVING`` comparisons (``= != <> < <= > >=``) of aggregates, aliases or
+  group columns against literals or other terms, combined with AND/OR
+  (AND binds tighter; no parentheses)
+- ``ORDER BY term [ASC|DESC], ...``, where a term is an output column, an
+  aggregate expression or a 1-based position in the SELECT list
+
+Output matches the previous row-at-a-time implementation exactly, floating
+point sums included: group columns carry the first row's raw value, SUM/AVG
+convert to float and add up with ``sum``, and empty SUM/AVG yield 0.
+"""
+
+import logging
+import re
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+_SELECT_RE = re.compile(r'SELECT\s+(.+?)\s+FROM', re.IGNORECASE | re.DOTALL)
+_AGGREGATE_RE = re.compile(
+    r'(COUNT|SUM|AVG|MIN|MAX)\s*\(\s*([*\w]+)\s*\)\s*(?:as\s+(\w+))?', re.IGNORECASE
+)
+_GROUP_BY_RE = re.compile(
+    r'GROUP\s+BY\s+([\w,\s]+?)(?:\s+ORDER\s+BY|\s+HAVING|\s+LIMIT|$)', re.IGNORECASE
+)
+_HAVING_RE = re.compile(r'\bHAVING\s+(.+?)(?:\s+ORDER\s+BY|\s+LIMIT|\s*;?\s*$)', re.IGNORECASE | re.DOTALL)
+_ORDER_BY_RE = re.compile(r'\bORDER\s+BY\s+(.+?)(?:\s+LIMIT|\s*;?\s*$)', re.IGNORECASE | re.DOTALL)
+_TERM_AGGREGATE_RE = re.compile(r'^(COUNT|SUM|AVG|MIN|MAX)\s*\(\s*([*\w]+)\s*\)$', re.IGNORECASE)
+_CONDITION_RE = re.compile(r'^(.+?)\s*(>=|<=|<>|!=|=|>|<)\s*(.+)$', re.DOTALL)
+_NUMBER_RE = re.compile(r'^-?\d+(?:\.\d+)?$')
+
+_COMPARATORS: Dict[str, Callable[[Any, Any], bool]] = {
+    "=": lambda a, b: a == b,
+    "!=": lambda a, b: a != b,
+    "<>": lambda a, b: a != b,
+    "<": lambda a, b: a < b,
+    "<=": lambda a, b: a <= b,
+    ">": lambda a, b: a > b,
+    ">=": lambda a, b: a >= b,
+}
+
+
+class UnsupportedAggregation(ValueError):
+    """The query uses aggregation syntax this engine does not evaluate"""
+
+
+@dataclass(frozen=True)
+class Aggregate:
+    """One aggregate call: function, input column ("*" for rows) and output name"""
+    func: str
+    column: str
+    output: str
+    hidden: bool = False  # Only referenced by HAVING/ORDER BY, not selected
+
+
+@dataclass
+class AggregationQuery:
+    """The aggregation part of a SQL query"""
+    aggregates: List[Aggregate]
+    group_by: List[str] = field(default_factory=list)
+    having: Optional[str] = None
+    order_by: Optional[str] = None
+    # Output column of each SELECT item, in SELECT order (ORDER BY <n>)
+    select_outputs: List[str] = field(default_factory=list)
+
+
+def parse_aggregation_query(sql: str) -> Optional[AggregationQuery]:
+    """Extract the aggregation spec from SQL; None if it has no aggregates"""
+    select_match = _SELECT_RE.search(sql)
+    if not select_match:
+        return None
+
+    select_text = select_match.group(1)
+    found = _AGGREGATE_RE.findall(select_text)
+    if not found:
+        return None
+
+    group_match = _GROUP_BY_RE.search(sql)
+    group_by = [col.strip() for col in group_match.group(1).split(',')] if group_match else []
+
+    aggregates = []
+    for func, column, alias in found:
+        func = func.upper()
+        output = alias or f"{func}_{column}"
+        if not group_by:
+            output = output.replace("*", "ALL")
+        aggregates.append(Aggregate(func, column, output))
+
+    having_match = _HAVING_RE.search(sql) if group_by else None
+    order_match = _ORDER_BY_RE.search(sql)
+
+    return AggregationQuery(
+        aggregates=aggregates,
+        group_by=group_by,
+        having=having_match.group(1).strip() if having_match else None,
+        order_by=order_match.group(1).strip() if order_match else None,
+        select_outputs=_select_outputs(select_text, aggregates, group_by),
+    )
+
+
+def _select_outputs(select_text: str, aggregates: List[Aggregate], group_by: List[str]) -> List[str]:
+    """Output column of each SELECT item, in order"""
+    items, depth, start = [], 0, 0
+    for index, char in enumerate(select_text):
+        if char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+        elif char == "," and depth == 0:
+            items.append(select_text[start:index])
+            start = index + 1
+    items.append(select_text[start:])
+
+    by_name = {column.lower(): column for column in group_by}
+    outputs = []
+    remaining = iter(aggregates)
+    for item in items:
+        item = item.strip()
+        if _AGGREGATE_RE.search(item):
+            outputs.append(next(remaining).output)
+        else:
+            # Group columns are output under their GROUP BY spelling
+            column = item.split()[0] if item else item
+            outputs.append(by_name.get(column.lower(), column))
+    return outputs
+
+
+def _column(rows: Sequence[Dict[str, Any]], column: str) -> List[Any]:
+    """One column of the rows, read in a single pass"""
+    return [row.get(column) for row in rows]
+
+
+def _factorize(rows: Sequence[Dict[str, Any]], group_by: List[str]) -> Tuple[List[int], List[int]]:
+    """
+    Assign every row a group id
+
+    Rows are grouped by the string form of their group columns (a missing
+    column counts as ""), as the previous implementation did.
+
+    Returns:
+        (group id per row, index of each group's first row)
+    """
+    columns = [[str(row.get(column, '')) for row in rows] for column in group_by]
+    keys = columns[0] if len(columns) == 1 else list(zip(*columns))
+
+    ids: Dict[Any, int] = {}
+    group_ids = [ids.setdefault(key, len(ids)) for key in keys]
+    # Later duplicates overwrite earlier ones, so iterating backwards leaves
+    # each key's first row
+    first_index = dict(zip(reversed(keys), range(len(keys) - 1, -1, -1)))
+    return group_ids, [first_index[key] for key in ids]
+
+
+def _buckets(values: List[Any], group_ids: List[int], groups: int) -> List[List[Any]]:
+    """The non-null values of a column, split by group"""
+    buckets: List[List[Any]] = [[] for _ in range(groups)]
+    appends = [bucket.append for bucket in buckets]
+    for group_id, value in zip(group_ids, values):
+        if value is not None:
+            appends[group_id](value)
+    return buckets
+
+
+def _reduce(func: str, values: List[Any]) -> Any:
+    """One aggregate over the non-null values of one group"""
+    if func == "COUNT":
+        return len(values)
+    if func == "SUM":
+        return sum(map(float, values)) if values else 0
+    if func == "AVG":
+        return sum(map(float, values)) / len(values) if values else 0
+    if not values:
+        return None
+    return max(values) if func == "MAX" else min(values)
+
+
+def aggregate_rows(rows: Sequence[Dict[str, Any]], query: AggregationQuery) -> List[Dict[str, Any]]:
+    """
+    Evaluate an aggregation query over fetched rows
+
+    Raises:
+        UnsupportedAggregation: If HAVING/ORDER BY use syntax outside the subset
+    """
+    aggregates = list(query.aggregates)
+    having = _parse_having(query.having, query, aggregates) if query.having else None
+    ordering = _parse_order_by(query.order_by, query, aggregates) if query.order_by else []
+    columns = list(dict.fromkeys(a.column for a in aggregates if a.column != "*"))
+
+    if not query.group_by:
+        # One group: no ids to assign, each column is read and reduced once
+        non_null = {
+            column: [value for value in _column(rows, column) if value is not None]
+            for column in columns
+        }
+        result = {
+            a.output: len(rows) if a.column == "*" else _reduce(a.func, non_null[a.column])
+            for a in aggregates
+        }
+        results = [result]
+    elif not rows:
+        results = []
+    else:
+        group_ids, first_rows = _factorize(rows, query.group_by)
+        groups = len(first_rows)
+        results = [
+            {column: rows[first].get(column) for column in query.group_by}
+            for first in first_rows
+        ]
+
+        # Every aggregate over a column shares one split of that column
+        buckets = {column: _buckets(_column(rows, column), group_ids, groups) for column in columns}
+        group_sizes: Optional[List[int]] = None
+        for aggregate in aggregates:
+            if aggregate.column == "*":
+                if group_sizes is None:
+                    counter = Counter(group_ids)
+                    group_sizes = [counter[group_id] for group_id in range(groups)]
+                values = group_sizes
+            else:
+                values = [_reduce(aggregate.func, bucket) for bucket in buckets[aggregate.column]]
+            for result, value in zip(results, values):
+                result[aggregate.output] = value
+
+    if having is not None:
+        results = [result for result in results if having(result)]
+
+    for output, descending in reversed(ordering):
+        _stable_sort(results, output, descending)
+
+    hidden = [a.output for a in aggregates if a.hidden]
+    if hidden:
+        for result in results:
+            for output in hidden:
+                result.pop(output, None)
+
+    return results
+
+
+def aggregate_sql(rows: Sequence[Dict[str, Any]], sql: str) -> Optional[List[Dict[str, Any]]]:
+    """
+    Aggregate ``rows`` as ``sql`` asks
+
+    Returns:
+        Aggregated rows, or None if the query has no aggregates or uses
+        syntax the engine cannot evaluate. The caller then returns raw data.
+    """
+    query = parse_aggregation_query(sql)
+    if query is None:
+        return None
+    try:
+        return aggregate_rows(rows, query)
+    except UnsupportedAggregation as e:
+        logger.info(f"Client-side aggregation not applied: {e}")
+        return None
+
+
+# ---------------------------------------------------------------------------
+# HAVING / ORDER BY
+# ---------------------------------------------------------------------------
+
+def _resolve_term(term: str, query: AggregationQuery, aggregates: List[Aggregate]) -> str:
+    """
+    Map a HAVING/ORDER BY term to an output column name
+
+    An aggregate expression that is not selected is added as a hidden
+    aggregate, so ``HAVING SUM(x) > 0`` works without selecting ``SUM(x)``.
+    """
+    term = term.strip()
+    match = _TERM_AGGREGATE_RE.match(term)
+    if match:
+        func, column = match.group(1).upper(), match.group(2)
+        for aggregate in aggregates:
+            if aggregate.func == func and aggregate.column == column:
+                return aggregate.output
+        hidden = Aggregate(func, column, f"__{func}_{column}", hidden=True)
+        aggregates.append(hidden)
+        return hidden.output
+
+    outputs = query.select_outputs or (
+        list(query.group_by) + [a.output for a in aggregates if not a.hidden]
+    )
+    if term.isdigit() and 1 <= int(term) <= len(outputs):
+        return outputs[int(term) - 1]
+    for output in outputs:
+        if output.lower() == term.lower():
+            return output
+    raise UnsupportedAggregation(f"Unknown column '{term}'")
+
+
+def _operand(text: str, query: AggregationQuery,
+             aggregates: List[Aggregate]) -> Callable[[Dict[str, Any]], Any]:
+    text = text.strip()
+    if _NUMBER_RE.match(text):
+        number = float(text)
+        return lambda row: number
+    if len(text) >= 2 and text[0] == text[-1] == "'":
+        literal = text[1:-1].replace("''", "'")
+        return lambda row: literal
+    output = _resolve_term(text, query, aggregates)
+    return lambda row: row.get(output)
+
+
+def _parse_having(text: str, query: AggregationQuery,
+                  aggregates: List[Aggregate]) -> Callable[[Dict[str, Any]], bool]:
+    """Compile HAVING into a predicate over aggregated rows"""
+    if "(" in re.sub(r'(COUNT|SUM|AVG|MIN|MAX)\s*\(\s*[*\w]+\s*\)', '', text, flags=re.IGNORECASE):
+        raise UnsupportedAggregation("Parenthesised HAVING conditions are not supported")
+
+    disjuncts = []
+    for part in re.split(r'\s+OR\s+', text, flags=re.IGNORECASE):
+        conjuncts = []
+        for condition in re.split(r'\s+AND\s+', part, flags=re.IGNORECASE):
+            match = _CONDITION_RE.match(condition.strip())
+            if not match:
+                raise UnsupportedAggregation(f"Cannot evaluate HAVING condition '{condition.strip()}'")
+            left = _operand(match.group(1), query, aggregates)
+            right = _operand(match.group(3), query, aggregates)
+            conjuncts.append((left, _COMPARATORS[match.group(2)], right))
+        disjuncts.append(conjuncts)
+
+    def predicate(row: Dict[str, Any]) -> bool:
+        return any(all(_compare(op, left(row), right(row)) for left, op, right in conjuncts)
+                   for conjuncts in disjuncts)
+
+    return predicate
+
+
+def _compare(op: Callable[[Any, Any], bool], left: Any, right: Any) -> bool:
+    if left is None or right is None:
+        return False
+    try:
+        return op(left, right)
+    except TypeError:
+        return op(str(left), str(right))
+
+
+def _parse_order_by(text: str, query: AggregationQuery,
+                    aggregates: List[Aggregate]) -> List[Tuple[str, bool]]:
+    """ORDER BY terms as (output column, descending)"""
+    ordering = []
+    for part in text.split(','):
+        words = part.strip().rsplit(None, 1)
+        descending = len(words) == 2 and words[1].upper() == "DESC"
+        term = words[0] if len(words) == 2 and words[1].upper() in ("ASC", "DESC") else part.strip()
+        ordering.append((_resolve_term(term, query, aggregates), descending))
+    return ordering
+
+
+def _stable_sort(results: List[Dict[str, Any]], output: str, descending: bool):
+    """Sort by one column; NULLs sort last in either direction"""
+    present = [r for r in results if r.get(output) is not None]
+    missing = [r for r in results if r.get(output) is None]
+    try:
+        present.sort(key=lambda r: r[output], reverse=descending)
+    except TypeError:
+        # Mixed types, e.g. decimals serialized as strings next to numbers
+        present.sort(key=lambda r: _mixed_key(r[output]), reverse=descending)
+    results[:] = present + missing
+
+
+def _mixed_key(value: Any) -> Tuple[int, Any]:
+    try:
+        return (0, float(value))
+    except (TypeError, ValueError):
+        return (1, str(value))
@@ -0,0 +1,197 @@
+"""Parsed, cached ``$metadata`` schemas for Consumption API assets.
+
+Several paths need the same facts about an asset's ``$metadata``: ``$filter``
+validation wants field names and types, the capability layer wants
+``CountRestrictions/Countable``, and ``get_relational_entity_metadata`` /
+``get_analytical_model`` want keys, column details and dimension/measure
+semantics. Each used to download and parse the CSDL document on its own, so a
+single filtered query paid an extra full round trip before it was sent.
+
+This module parses the document **once** per ``(space, asset, kind)`` into a
+compact :class:`AssetSchema` and keeps it in the internal ``CacheManager``
+under ``CacheCategory.METADATA``. Once the entry expires it is revalidated
+with ``If-None-Match`` when the tenant supplied an ``ETag``: an unchanged
+document costs a 304 and no parse.
+
+The schema is cached as a plain dict (``AssetSchema.to_dict``) so it can also
+live in the persistent cache tier.
+"""
+
+import logging
+import time
+import xml.etree.ElementTree as ET
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, List, Optional
+from urllib.parse import quote
+
+import asset_capability
+from cache_manager import CacheCategory
+from odata_v4_annotations import make_semantics_extractor
+
+logger = logging.getLogger(__name__)
+
+SCHEMA_CATEGORY = CacheCategory.METADATA
+
+NAMESPACES = {
+    "edmx": "http://docs.oasis-open.org/odata/ns/edmx",
+    "edm": "http://docs.oasis-open.org/odata/ns/edm",
+    "sap": "http://www.sap.com/Protocols/SAPData",
+}
+
+# Semantics keys kept per property; the raw annotation ``terms`` are dropped.
+_SEMANTIC_KEYS = ("label", "is_dimension", "is_measure", "aggregation",
+                  "unit", "hierarchy", "semantics")
+
+
+class MetadataUnavailable(Exception):
+    """The asset's ``$metadata`` could not be retrieved."""
+
+
+@dataclass
+class PropertySchema:
+    name: str
+    type: str
+    nullable: bool = True
+    max_length: Optional[str] = None
+    precision: Optional[str] = None
+    scale: Optional[str] = None
+    semantics: Dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass
+class EntitySchema:
+    name: str
+    keys: List[str] = field(default_factory=list)
+    properties: List[PropertySchema] = field(default_factory=list)
+    navigation_properties: List[Dict[str, Optional[str]]] = field(default_factory=list)
+
+
+@dataclass
+class AssetSchema:
+    """What one asset's ``$metadata`` says, in the shape its consumers use."""
+
+    space_id: str
+    asset_id: str
+    kind: str
+    entities: List[EntitySchema] = field(default_factory=list)
+    countable: Optional[bool] = None
+    etag: Optional[str] = None
+    fetched_at: float = field(default_factory=time.time)
+
+    def field_names(self) -> List[str]:
+        """Property names across all entity types, in document order."""
+        return [prop.name for entity in self.entities for prop in entity.properties]
+
+    def field_types(self) -> Dict[str, str]:
+        """Property name -> EDM type across all entity types."""
+        return {prop.name: prop.type for entity in self.entities for prop in entity.properties}
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "AssetSchema":
+        entities = [
+            EntitySchema(
+                name=entity["name"],
+                keys=list(entity["keys"]),
+                properties=[PropertySchema(**prop) for prop in entity["properties"]],
+                navigation_properties=list(entity["navigation_properties"]),
+            )
+            for entity in data["entities"]
+        ]
+        return cls(**{**data, "entities": entities})
+
+
+def parse_asset_schema(xml_content: str, space_id: str, asset_id: str, kind: str,
+                       etag: Optional[str] = None) -> AssetSchema:
+    """Parse a CSDL ``$metadata`` document into an :class:`AssetSchema`."""
+    root = ET.fromstring(xml_content)
+    get_semantics = make_semantics_extractor(root, NAMESPACES)
+
+    entities = []
+    for entity_type in root.findall(".//edm:EntityType", NAMESPACES):
+        entity = EntitySchema(name=entity_type.get("Name"))
+
+        key_element = entity_type.find("edm:Key", NAMESPACES)
+        if key_element is not None:
+            entity.keys = [ref.get("Name") for ref in key_element.findall("edm:PropertyRef", NAMESPACES)]
+
+        for prop in entity_type.findall("edm:Property", NAMESPACES):
+            prop_name = prop.get("Name")
+            if not prop_name:
+                continue
+            sem = get_semantics(prop, entity_type)
+            entity.properties.append(PropertySchema(
+                name=prop_name,
+                type=prop.get("Type", ""),
+                nullable=prop.get("Nullable", "true") == "true",
+                max_length=prop.get("MaxLength"),
+                precision=prop.get("Precision"),
+                scale=prop.get("Scale"),
+                semantics={key: sem[key] for key in _SEMANTIC_KEYS},
+            ))
+
+        for nav in entity_type.findall("edm:NavigationProperty", NAMESPACES):
+            entity.navigation_properties.append({
+                "name": nav.get("Name"),
+                "type": nav.get("Type"),
+                "partner": nav.get("Partner"),
+            })
+
+        entities.append(entity)
+
+    return AssetSchema(
+        space_id=space_id,
+        asset_id=asset_id,
+        kind=kind,
+        entities=entities,
+        countable=asset_capability.countability_from_metadata(xml_content),
+        etag=etag,
+    )
+
+
+def _key(space_id: str, asset_id: str, kind: str) -> str:
+    return f"{kind}:{space_id}/{asset_id}"
+
+
+def _seg(value) -> str:
+    """Percent-encode a URL path segment (mirrors the server's ``_seg``)."""
+    return quote(str(value), safe="")
+
+
+def metadata_endpoint(space_id: str, asset_id: str, kind: str) -> str:
+    """Consumption API ``$metadata`` path for an asset."""
+    return f"/api/v1/datasphere/consumption/{_seg(kind)}/{_seg(space_id)}/{_seg(asset_id)}/$metadata"
+
+
+async def get_asset_schema(cache, connector, space_id: str, asset_id: str,
+                           kind: str = "relational") -> AssetSchema:
+    """Return the parsed schema for an asset, fetching it only when needed.
+
+    Raises :class:`MetadataUnavailable` (or the transport error) if the
+    document cannot be fetched and nothing usable is cached. Failures are not
+    cached: the next call tries again.
+    """
+    key = _key(space_id, asset_id, kind)
+
+    async def load() -> Dict[str, Any]:
+        if connector is None:
+            raise MetadataUnavailable("OAuth connector not initialized")
+
+        previous = cache.peek(key, SCHEMA_CATEGORY)
+        etag = previous.get("etag") if previous else None
+        status, xml_content, new_etag = await connector.fetch_text_conditional(
+            metadata_endpoint(space_id, asset_id, kind), etag=etag, timeout=15
+        )
+
+        if status == 304 and previous:
+            logger.debug(f"$metadata unchanged for {kind} {space_id}/{asset_id} (ETag {etag})")
+            return {**previous, "fetched_at": time.time()}
+        if status != 200:
+            raise MetadataUnavailable(f"HTTP {status} from $metadata for {space_id}/{asset_id}")
+
+        return parse_asset_schema(xml_content, space_id, asset_id, kind, etag=new_etag).to_dict()
+
+    data = await cache.get_or_refresh(key, SCHEMA_CATEGORY, load)
+    return AssetSchema.from_dict(data)
@@ -0,0 +1,244 @@
+"""
+Paged OData extraction for the Consumption API
+
+Pulling a large entity in one ``$top=50000`` request holds the whole
+``value`` list (and its serialized copy) in memory, and runs into the client
+timeout on slow tenants. ``PagedExtraction`` walks the entity page by page
+instead:
+
+- If the service pages itself (``@odata.nextLink``), the links are followed
+  in order. They are only followed on the tenant host the connector is
+  configured for, so a link can never send the bearer token elsewhere.
+- Otherwise ``$skip``/``$top`` pages are requested ahead with bounded
+  concurrency and yielded in order. The first short page ends the walk.
+
+The caller processes (masks, serializes) each page as it arrives and drops
+it. When the row budget is reached, or a page fails after some rows were
+delivered, ``position`` says where to resume. ``encode_cursor`` turns that
+into an opaque token. The token is bound to the query it came from, so it
+cannot be replayed against a different entity or filter.
+"""
+
+import asyncio
+import base64
+import binascii
+import hashlib
+import json
+import logging
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Awaitable, Callable, Deque, Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, urljoin, urlsplit
+
+logger = logging.getLogger(__name__)
+
+FetchPage = Callable[[str, Dict[str, Any]], Awaitable[Dict[str, Any]]]
+
+_CURSOR_VERSION = 1
+
+# Paging parameters are not part of a query's identity
+_PAGING_PARAMS = frozenset({"$top", "$skip", "$skiptoken"})
+
+
+class CursorError(ValueError):
+    """An extraction cursor is malformed or belongs to a different query"""
+
+
+@dataclass
+class ExtractionPosition:
+    """Where an extraction resumes: a row offset, or a service-issued next link"""
+    skip: int = 0
+    next_link: Optional[str] = None
+
+
+@dataclass
+class Page:
+    """One page of rows as returned by the service"""
+    rows: List[Dict[str, Any]]
+    number: int
+
+
+def query_fingerprint(endpoint: str, params: Dict[str, Any]) -> str:
+    """Stable identity of an extraction query (paging parameters excluded)"""
+    identity = [endpoint.lstrip("/")] + sorted(
+        f"{k}={v}" for k, v in params.items() if v is not None and k not in _PAGING_PARAMS
+    )
+    return hashlib.sha256("\n".join(identity).encode("utf-8")).hexdigest()[:16]
+
+
+def encode_cursor(position: ExtractionPosition, fingerprint: str) -> str:
+    """Encode a resume position as an opaque, URL-safe token"""
+    payload = {"v": _CURSOR_VERSION, "q": fingerprint, "skip": position.skip}
+    if position.next_link:
+        payload["link"] = position.next_link
+    raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(token: str, fingerprint: str) -> ExtractionPosition:
+    """
+    Decode a cursor produced by ``encode_cursor``
+
+    Raises:
+        CursorError: If the token is malformed or was issued for another query
+    """
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        payload = json.loads(raw.decode("utf-8"))
+    except (binascii.Error, UnicodeDecodeError, ValueError) as e:
+        raise CursorError(f"Malformed cursor: {e}") from None
+
+    if not isinstance(payload, dict) or payload.get("v") != _CURSOR_VERSION:
+        raise CursorError("Unsupported cursor version")
+    if payload.get("q") != fingerprint:
+        raise CursorError("Cursor was issued for a different entity, filter, select or orderby")
+
+    skip = payload.get("skip", 0)
+    link = payload.get("link")
+    if not isinstance(skip, int) or skip < 0 or (link is not None and not isinstance(link, str)):
+        raise CursorError("Malformed cursor")
+    return ExtractionPosition(skip=skip, next_link=link)
+
+
+def resolve_next_link(next_link: str, base_url: str, endpoint: str) -> Tuple[str, Dict[str, str]]:
+    """
+    Turn an ``@odata.nextLink`` into a connector endpoint and params
+
+    Relative links are resolved against the request they came from.
+
+    Raises:
+        ValueError: If the link points outside the configured tenant
+    """
+    base = urlsplit(base_url.rstrip("/") + "/")
+    target = urlsplit(urljoin(f"{base_url.rstrip('/')}/{endpoint.lstrip('/')}", next_link))
+
+    if (target.scheme, target.netloc) != (base.scheme, base.netloc) or not target.path.startswith(base.path):
+        raise ValueError("@odata.nextLink points outside the configured tenant; refusing to follow it")
+
+    return target.path[len(base.path):], dict(parse_qsl(target.query, keep_blank_values=True))
+
+
+class PagedExtraction:
+    """
+    Iterate an OData entity set page by page
+
+    Usage::
+
+        extraction = PagedExtraction(connector.get, endpoint, params, base_url, ...)
+        async for page in extraction.pages():
+            ...  # mask, serialize, drop
+        extraction.position  # None once the entity set is exhausted
+    """
+
+    def __init__(
+        self,
+        fetch: FetchPage,
+        endpoint: str,
+        params: Dict[str, Any],
+        base_url: str,
+        page_size: int = 5000,
+        max_rows: int = 50000,
+        start: Optional[ExtractionPosition] = None,
+        concurrency: int = 4
+    ):
+        """
+        Args:
+            fetch: Coroutine issuing one GET (``DatasphereAuthConnector.get``)
+            endpoint: Entity set endpoint
+            params: Query options other than $top/$skip
+            base_url: Tenant base URL; next links are confined to it
+            page_size: Rows requested per page
+            max_rows: Row budget for this extraction
+            start: Resume position (defaults to the first row)
+            concurrency: $skip pages requested ahead at once
+        """
+        self._fetch = fetch
+        self._endpoint = endpoint
+        self._params = {k: v for k, v in params.items() if k not in _PAGING_PARAMS}
+        self._base_url = base_url
+        self.page_size = max(1, page_size)
+        self.max_rows = max(1, max_rows)
+        self._concurrency = max(1, concurrency)
+
+        #: Where the next unread row starts; None once the set is exhausted
+        self.position: Optional[ExtractionPosition] = start or ExtractionPosition()
+        self.rows_fetched = 0
+        self.pages_fetched = 0
+
+    async def pages(self) -> AsyncIterator[Page]:
+        """Yield pages in order until the set is exhausted or the budget is spent"""
+        if self.position.next_link:
+            async for page in self._follow_links(self.position.next_link):
+                yield page
+            return
+
+        first_top = min(self.page_size, self.max_rows)
+        data = await self._fetch(self._endpoint, self._skip_params(self.position.skip, first_top))
+        rows = data.get("value", [])
+        link = data.get("@odata.nextLink")
+        yield self._page(rows, ExtractionPosition(skip=self.position.skip + len(rows)))
+
+        if link:
+            # Server-driven paging: $skip may be capped or unsupported, so
+            # follow the service's own links from here on
+            self.position = ExtractionPosition(skip=self.position.skip, next_link=link)
+            async for page in self._follow_links(link):
+                yield page
+        elif len(rows) < first_top:
+            self.position = None
+        else:
+            async for page in self._read_ahead(self.position.skip):
+                yield page
+
+    async def _read_ahead(self, skip: int) -> AsyncIterator[Page]:
+        """$skip/$top pages, ``concurrency`` requests in flight, yielded in order"""
+        pending: Deque[Tuple[int, int, asyncio.Future]] = deque()
+        scheduled = self.rows_fetched
+
+        def schedule():
+            nonlocal skip, scheduled
+            while len(pending) < self._concurrency and scheduled < self.max_rows:
+                top = min(self.page_size, self.max_rows - scheduled)
+                task = asyncio.ensure_future(self._fetch(self._endpoint, self._skip_params(skip, top)))
+                pending.append((skip, top, task))
+                skip += top
+                scheduled += top
+
+        try:
+            schedule()
+            while pending:
+                page_skip, top, task = pending.popleft()
+                rows = (await task).get("value", [])
+                yield self._page(rows, ExtractionPosition(skip=page_skip + len(rows)))
+                if len(rows) < top:
+                    self.position = None
+                    return
+                schedule()
+        finally:
+            # Budget spent, short page, failure or the consumer stopped early
+            for _, _, task in pending:
+                task.cancel()
+
+    async def _follow_links(self, link: str) -> AsyncIterator[Page]:
+        """Follow ``@odata.nextLink`` sequentially until the budget is spent"""
+        while link and self.rows_fetched < self.max_rows:
+            endpoint, params = resolve_next_link(link, self._base_url, self._endpoint)
+            data = await self._fetch(endpoint, params)
+            link = data.get("@odata.nextLink")
+            yield self._page(
+                data.get("value", []),
+                ExtractionPosition(skip=self.position.skip, next_link=link) if link else None
+            )
+
+    def _page(self, rows: List[Dict[str, Any]], after: Optional[ExtractionPosition]) -> Page:
+        self.rows_fetched += len(rows)
+        self.pages_fetched += 1
+        self.position = after
+        return Page(rows=rows, number=self.pages_fetched)
+
+    def _skip_params(self, skip: int, top: int) -> Dict[str, Any]:
+        params = dict(self._params)
+        params["$top"] = top
+        if skip:
+            params["$skip"] = skip
+        return params
@@ -23,13 +23,18 @@ DATASPHERE_PII_SALT
     and never logged.
 """
 
+import asyncio
 import fnmatch
 import hashlib
 import json
 import logging
 import os
 import re
-from typing import Any, Dict, List, Optional, Tuple
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from tracing import span
 
 log = logging.getLogger("pii")
 
@@ -39,10 +44,41 @@ log = logging.getLogger("pii")
 
 Action = str  # 'redact' | 'drop' | 'hash' | 'partial:N' | 'tokenize'
 
+# Per-column step kinds of a compiled ``MaskingPlan``.
+_KEEP, _ACT, _SCAN = 0, 1, 2
+
+# Numbered back-references and conditionals change meaning once a pattern is
+# spliced into a larger alternation, so such patterns are scanned one by one.
+_GROUP_REFERENCE_RE = re.compile(r"\\[1-9]|\(\?\(")
+
+
+class MaskingPlan:
+    """
+    Column decisions for one ``(space, asset, column layout)``, resolved once.
+
+    ``steps`` lists ``(column, kind, action)`` in row order; columns removed by
+    the allowlist are absent in enforce mode.  ``touched`` holds the columns
+    the policy always reports for this layout (allowlist and column rules);
+    value-pattern hits are data-dependent and added while masking.
+    """
+
+    __slots__ = ("steps", "touched")
+
+    def __init__(self, steps: Tuple[Tuple[str, int, Optional[Action]], ...], touched: frozenset) -> None:
+        self.steps = steps
+        self.touched = touched
+
 
 class Policy:
     """Parsed representation of a pii_policy.yaml / pii_policy.json file."""
 
+    # Distinct result layouts remembered per policy (oldest evicted first).
+    PLAN_CACHE_SIZE = 256
+
+    # Result sets at least this long are masked on a worker thread by
+    # ``apply_masking_async`` so the event loop keeps serving other calls.
+    OFFLOAD_MIN_ROWS = 1000
+
     def __init__(self, cfg: Dict[str, Any], salt: str) -> None:
         # DATASPHERE_PII_MODE overrides the file-level ``mode`` key.
         env_mode = os.getenv("DATASPHERE_PII_MODE", "").strip()
@@ -58,6 +94,51 @@ class Policy:
         self.patterns: Dict[str, re.Pattern] = {
             name: re.compile(pattern) for name, pattern in raw_patterns.items()
         }
+        self.value_scanner: Optional[Callable[[str], Any]] = _build_value_scanner(self.patterns)
+        self._plans: "OrderedDict[Tuple[str, str, Tuple[str, ...]], MaskingPlan]" = OrderedDict()
+        # Large batches are masked on worker threads, which share this cache.
+        self._plans_lock = threading.Lock()
+
+    def plan_for(self, space: str, asset: str, columns: Tuple[str, ...]) -> MaskingPlan:
+        """Return the cached ``MaskingPlan`` for *columns* of *space/asset*."""
+        key = (space, asset, columns)
+        with self._plans_lock:
+            plan = self._plans.get(key)
+            if plan is not None:
+                self._plans.move_to_end(key)
+                return plan
+
+        plan = _compile_plan(self, space, asset, columns)
+        with self._plans_lock:
+            self._plans[key] = plan
+            if len(self._plans) > self.PLAN_CACHE_SIZE:
+                self._plans.popitem(last=False)
+        return plan
+
+
+def _build_value_scanner(patterns: Dict[str, re.Pattern]) -> Optional[Callable[[str], Any]]:
+    """
+    Fold the value patterns into one ``search`` callable.
+
+    All patterns are joined into a single alternation so each string value is
+    scanned once; patterns that cannot be combined safely (back-references,
+    conflicting group names or inline flags) fall back to a per-pattern scan.
+    """
+    if not patterns:
+        return None
+    compiled = list(patterns.values())
+    if len(compiled) == 1:
+        return compiled[0].search
+    if not any(_GROUP_REFERENCE_RE.search(rx.pattern) for rx in compiled):
+        try:
+            return re.compile("|".join(f"(?:{rx.pattern})" for rx in compiled)).search
+        except re.error:
+            pass
+
+    def search_each(value: str) -> bool:
+        return any(rx.search(value) for rx in compiled)
+
+    return search_each
 
 
 # ---------------------------------------------------------------------------
@@ -201,6 +282,125 @@ def _resolve_column_action(
     return best_action
 
 
+def _compile_plan(
+    policy: Policy,
+    space: str,
+    asset: str,
+    columns: Tuple[str, ...],
+) -> MaskingPlan:
+    """Resolve allowlist and column rules for every column of one layout."""
+    audit_only = policy.mode == "audit_only"
+
+    # Allowlist for this specific asset (space.asset compound key).
+    allowed_columns: Optional[List[str]] = None
+    if policy.allowlist.get("enabled"):
+        allowed_columns = (policy.allowlist.get("assets") or {}).get(f"{space}.{asset}")
+
+    steps: List[Tuple[str, int, Optional[Action]]] = []
+    touched: set = set()
+    for col in columns:
+        # ── 1. Allowlist enforcement ──────────────────────────────────────────
+        if allowed_columns is not None and col not in allowed_columns:
+            touched.add(col)
+            if not audit_only:
+                continue
+
+        # ── 2. Column rule ────────────────────────────────────────────────────
+        action = _resolve_column_action(policy, space, asset, col)
+        if action:
+            touched.add(col)
+            steps.append((col, _KEEP if audit_only else _ACT, action))
+        # ── 3. Value-pattern scan (strings only, best-effort secondary net) ───
+        elif policy.value_scanner is not None:
+            steps.append((col, _SCAN, None))
+        else:
+            steps.append((col, _KEEP, None))
+
+    return MaskingPlan(tuple(steps), frozenset(touched))
+
+
+def _memoized_action(action: Action, salt: str) -> Callable[[Any], Any]:
+    """
+    Return ``_apply_action`` bound to *action*, memoized for one batch.
+
+    Every action works on ``str(value)``, so the string form is the cache key;
+    repeated values (customer IDs, e-mail addresses) are hashed only once.
+    """
+    cache: Dict[str, Any] = {}
+
+    def mask(value: Any) -> Any:
+        if value is None:
+            return None
+        key = str(value)
+        masked = cache.get(key)
+        if masked is None:
+            masked = cache[key] = _apply_action(action, key, salt)
+        return masked
+
+    return mask
+
+
+def _mask_batch(
+    batch: List[Dict[str, Any]],
+    plan: MaskingPlan,
+    policy: Policy,
+    touched: set,
+) -> List[Dict[str, Any]]:
+    """Mask rows sharing one column layout, one column at a time."""
+    audit_only = policy.mode == "audit_only"
+    scan = policy.value_scanner
+    default_mask: Optional[Callable[[Any], Any]] = None
+
+    names: List[str] = []
+    columns: List[List[Any]] = []
+    # ``drop`` leaves NULLs in place (there is nothing to hide), so a dropped
+    # column containing NULLs is removed row by row after assembly.
+    partially_dropped: List[Tuple[str, List[Any]]] = []
+
+    for col, kind, action in plan.steps:
+        values = [row[col] for row in batch]
+
+        if kind == _ACT:
+            if action == "drop":
+                if any(value is None for value in values):
+                    partially_dropped.append((col, values))
+                else:
+                    continue
+            else:
+                values = list(map(_memoized_action(action, policy.salt), values))
+
+        elif kind == _SCAN:
+            verdicts: Dict[str, bool] = {}
+            hits: List[int] = []
+            for i, value in enumerate(values):
+                if isinstance(value, str):
+                    hit = verdicts.get(value)
+                    if hit is None:
+                        hit = verdicts[value] = bool(scan(value))
+                    if hit:
+                        hits.append(i)
+            if hits:
+                touched.add(col)
+                if not audit_only:
+                    if default_mask is None:
+                        default_mask = _memoized_action(policy.default_action, policy.salt)
+                    for i in hits:
+                        values[i] = default_mask(values[i])
+
+        names.append(col)
+        columns.append(values)
+
+    if not names:
+        return [{} for _ in batch]
+
+    out = [dict(zip(names, cells)) for cells in zip(*columns)]
+    for col, values in partially_dropped:
+        for new_row, value in zip(out, values):
+            if value is not None:
+                del new_row[col]
+    return out
+
+
 # ---------------------------------------------------------------------------
 # Public API
 # ---------------------------------------------------------------------------
@@ -237,52 +437,35 @@ def apply_masking(
     if policy is None or policy.mode == "off" or not rows:
         return rows, []
 
-    audit_only: bool = (policy.mode == "audit_only")
+    with span("pii_masking"):
+        return _mask_rows(rows, space_id, asset_id, policy)
 
-    # Build allowlist for this specific asset (space.asset compound key).
-    asset_key = f"{space_id}.{asset_id}"
-    allowed_columns: Optional[List[str]] = None
-    if policy.allowlist.get("enabled"):
-        allowed_columns = (policy.allowlist.get("assets") or {}).get(asset_key)
 
+def _mask_rows(
+    rows: List[Dict[str, Any]],
+    space_id: str,
+    asset_id: str,
+    policy: Policy,
+) -> Tuple[List[Dict[str, Any]], List[str]]:
+    """Body of ``apply_masking`` for an active policy (timed as one span).
+
+    Consecutive rows with the same column layout form one batch that is masked
+    column-wise with the plan compiled for that layout, so a homogeneous result
+    set resolves its columns once and hashes each distinct value once.
+    """
     touched: set = set()
     out: List[Dict[str, Any]] = []
 
-    for row in rows:
-        new_row: Dict[str, Any] = {}
-
-        for col, val in row.items():
-            # ── 1. Allowlist enforcement ──────────────────────────────────────
-            if allowed_columns is not None and col not in allowed_columns:
-                touched.add(col)
-                if not audit_only:
-                    # Drop column — do not include in output row.
-                    continue
-
-            # ── 2. Column rule ────────────────────────────────────────────────
-            action = _resolve_column_action(policy, space_id, asset_id, col)
-            new_val = val
-
-            if action:
-                touched.add(col)
-                if not audit_only:
-                    new_val = _apply_action(action, val, policy.salt)
-                    if new_val == "__DROP__":
-                        # ``drop`` action: exclude the column entirely.
-                        continue
-
-            # ── 3. Value-pattern scan (strings only, best-effort secondary net) ─
-            elif isinstance(val, str):
-                for _name, rx in policy.patterns.items():
-                    if rx.search(val):
-                        touched.add(col)
-                        if not audit_only:
-                            new_val = _apply_action(policy.default_action, val, policy.salt)
-                        break
-
-            new_row[col] = new_val
-
-        out.append(new_row)
+    start = 0
+    layout = tuple(rows[0])
+    for end in range(1, len(rows) + 1):
+        next_layout = tuple(rows[end]) if end < len(rows) else None
+        if next_layout == layout:
+            continue
+        plan = policy.plan_for(space_id, asset_id, layout)
+        touched.update(plan.touched)
+        out.extend(_mask_batch(rows[start:end], plan, policy, touched))
+        start, layout = end, next_layout
 
     masked_field_names = sorted(touched)
 
@@ -298,3 +481,21 @@ def apply_masking(
     )
 
     return out, masked_field_names
+
+
+async def apply_masking_async(
+    rows: List[Dict[str, Any]],
+    space_id: str,
+    asset_id: str,
+    policy: Optional[Policy],
+) -> Tuple[List[Dict[str, Any]], List[str]]:
+    """
+    ``apply_masking`` for coroutine callers.
+
+    Result sets of ``Policy.OFFLOAD_MIN_ROWS`` rows or more are masked on a
+    worker thread so hashing a large extraction does not stall other tool
+    calls on the same event loop; smaller ones are masked inline.
+    """
+    if policy is None or policy.mode == "off" or len(rows) < policy.OFFLOAD_MIN_ROWS:
+        return apply_masking(rows, space_id, asset_id, policy)
+    return await asyncio.to_thread(apply_masking, rows, space_id, asset_id, policy)
@@ -0,0 +1,1027 @@
+"""
+SQL-subset parser and OData pushdown planner
+
+``execute_query`` and ``smart_query`` accept SQL, but Datasphere serves
+OData. This module parses a single-table SELECT into a small AST. The
+planner then sends as much of it as the target asset can take to the
+service:
+
+============  ==============================================================
+SQL           OData
+============  ==============================================================
+projection    ``$select`` (aliases are renamed locally)
+WHERE         ``$filter`` for each translatable top-level AND conjunct
+ORDER BY      ``$orderby``
+LIMIT/OFFSET  ``$top``/``$skip`` (only when nothing is left to do locally)
+GROUP BY      ``$apply=filter(...)/groupby((...),aggregate(...))`` on
+              analytical assets
+============  ==============================================================
+
+Whatever cannot be pushed down runs locally on the fetched rows: the
+remaining predicates, the aggregation (``columnar_aggregation``), and the
+limit. A query that is fully pushed down fetches exactly the rows it
+returns.
+
+Supported subset::
+
+    SELECT [*|col [AS a]|AGG(col|*) [AS a], ...]
+    FROM [schema.]table
+    [WHERE predicate] [GROUP BY col, ...] [HAVING predicate]
+    [ORDER BY term [ASC|DESC], ...] [LIMIT n [OFFSET m]]
+
+Predicates: comparisons, ``[NOT] IN``, ``[NOT] BETWEEN``, ``[NOT] LIKE``,
+``IS [NOT] NULL``, ``NOT``, ``AND``, ``OR`` and parentheses. Joins,
+subqueries, DISTINCT and expressions raise ``SqlParseError``. The callers
+then fall back to their regex-based handling.
+"""
+
+import re
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from columnar_aggregation import Aggregate, AggregationQuery, aggregate_rows
+
+AGGREGATE_FUNCTIONS = frozenset({"COUNT", "SUM", "AVG", "MIN", "MAX"})
+
+#: OData ``$apply`` aggregation methods for the SQL aggregates that have one.
+#: COUNT(col) counts non-null values, which no OData method expresses, so it
+#: is aggregated locally.
+_APPLY_METHODS = {"SUM": "sum", "AVG": "average", "MIN": "min", "MAX": "max"}
+
+_ODATA_OPERATORS = {"=": "eq", "!=": "ne", "<>": "ne", "<": "lt", "<=": "le", ">": "gt", ">=": "ge"}
+_MIRRORED = {"=": "=", "!=": "!=", "<>": "<>", "<": ">", "<=": ">=", ">": "<", ">=": "<="}
+
+_RESERVED = frozenset({
+    "SELECT", "FROM", "WHERE", "GROUP", "BY", "HAVING", "ORDER", "LIMIT", "OFFSET",
+    "AND", "OR", "NOT", "IN", "BETWEEN", "LIKE", "IS", "NULL", "AS", "ASC", "DESC",
+    "JOIN", "UNION", "DISTINCT", "TRUE", "FALSE",
+})
+
+_TOKEN_RE = re.compile(r"""
+    \s*(?:
+        (?P<string>'(?:[^']|'')*')
+      | (?P<number>\d+(?:\.\d+)?)
+      | (?P<quoted>"[^"]+")
+      | (?P<word>[A-Za-z_][A-Za-z0-9_]*)
+      | (?P<op><=|>=|<>|!=|=|<|>)
+      | (?P<punct>[(),.*;\-])
+    )""", re.VERBOSE)
+
+_IDENTIFIER_RE = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+
+class SqlParseError(ValueError):
+    """The query is outside the supported SQL subset"""
+
+
+# ---------------------------------------------------------------------------
+# AST
+# ---------------------------------------------------------------------------
+
+@dataclass(frozen=True)
+class Column:
+    name: str
+
+
+@dataclass(frozen=True)
+class Literal:
+    value: Any
+
+
+@dataclass(frozen=True)
+class AggregateCall:
+    func: str
+    column: str  # "*" for COUNT(*)
+
+
+Operand = Union[Column, Literal, AggregateCall]
+
+
+@dataclass(frozen=True)
+class Comparison:
+    left: Operand
+    op: str
+    right: Operand
+
+
+@dataclass(frozen=True)
+class InList:
+    operand: Operand
+    values: Tuple[Any, ...]
+    negated: bool = False
+
+
+@dataclass(frozen=True)
+class Between:
+    operand: Operand
+    low: Any
+    high: Any
+    negated: bool = False
+
+
+@dataclass(frozen=True)
+class Like:
+    operand: Operand
+    pattern: str
+    negated: bool = False
+    # Compiled once when the node is built, not per evaluated row
+    regex: "re.Pattern[str]" = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "regex", _like_regex(self.pattern))
+
+
+@dataclass(frozen=True)
+class IsNull:
+    operand: Operand
+    negated: bool = False
+
+
+@dataclass(frozen=True)
+class BoolOp:
+    op: str  # "and" | "or"
+    operands: Tuple["Predicate", ...]
+
+
+@dataclass(frozen=True)
+class Not:
+    operand: "Predicate"
+
+
+Predicate = Union[Comparison, InList, Between, Like, IsNull, BoolOp, Not]
+
+
+@dataclass(frozen=True)
+class SelectItem:
+    expr: Union[Column, AggregateCall]
+    alias: Optional[str] = None
+
+
+@dataclass(frozen=True)
+class OrderItem:
+    term: Union[Column, AggregateCall, int]  # int: 1-based select position
+    descending: bool = False
+
+
+@dataclass
+class SelectStatement:
+    """A parsed single-table SELECT"""
+    items: List[SelectItem]  # empty for SELECT *
+    table: str
+    schema: Optional[str] = None
+    where: Optional[Predicate] = None
+    group_by: List[str] = field(default_factory=list)
+    having: Optional[Predicate] = None
+    having_sql: Optional[str] = None
+    order_by: List[OrderItem] = field(default_factory=list)
+    order_by_sql: Optional[str] = None
+    limit: Optional[int] = None
+    offset: int = 0
+
+    @property
+    def aggregates(self) -> List[SelectItem]:
+        return [item for item in self.items if isinstance(item.expr, AggregateCall)]
+
+    @property
+    def has_aggregation(self) -> bool:
+        return bool(self.group_by or self.having or self.aggregates)
+
+
+# ---------------------------------------------------------------------------
+# Parser
+# ---------------------------------------------------------------------------
+
+def _tokenize(sql: str) -> List[Tuple[str, Any, int, int]]:
+    tokens = []
+    position = 0
+    stripped = sql.rstrip()
+    while position < len(stripped):
+        match = _TOKEN_RE.match(stripped, position)
+        if not match or match.end() == position:
+            raise SqlParseError(f"Unexpected character at position {position}: {stripped[position:position + 10]!r}")
+        kind = group = match.lastgroup
+        text = match.group(group)
+        if kind == "string":
+            value: Any = text[1:-1].replace("''", "'")
+        elif kind == "number":
+            value = float(text) if "." in text else int(text)
+        elif kind == "quoted":
+            kind, value = "ident", text[1:-1]
+        elif kind == "word":
+            upper = text.upper()
+            kind, value = ("keyword", upper) if upper in _RESERVED or upper in AGGREGATE_FUNCTIONS else ("ident", text)
+        else:
+            value = text
+        tokens.append((kind, value, match.start(group), match.end(group)))
+        position = match.end()
+    return tokens
+
+
+class _Parser:
+    def __init__(self, sql: str):
+        self.sql = sql
+        self.tokens = _tokenize(sql)
+        self.index = 0
+        self._allow_aggregates = False
+
+    # -- token helpers --------------------------------------------------
+
+    def peek(self, offset: int = 0) -> Tuple[str, Any, int, int]:
+        index = self.index + offset
+        if index < len(self.tokens):
+            return self.tokens[index]
+        return ("eof", None, len(self.sql), len(self.sql))
+
+    def advance(self) -> Tuple[str, Any, int, int]:
+        token = self.peek()
+        self.index += 1
+        return token
+
+    def at_keyword(self, *words: str) -> bool:
+        kind, value, _, _ = self.peek()
+        return kind == "keyword" and value in words
+
+    def accept_keyword(self, *words: str) -> bool:
+        if self.at_keyword(*words):
+            self.index += 1
+            return True
+        return False
+
+    def expect_keyword(self, word: str):
+        if not self.accept_keyword(word):
+            raise SqlParseError(f"Expected {word} near {self._near()}")
+
+    def accept_punct(self, char: str) -> bool:
+        kind, value, _, _ = self.peek()
+        if kind == "punct" and value == char:
+            self.index += 1
+            return True
+        return False
+
+    def expect_punct(self, char: str):
+        if not self.accept_punct(char):
+            raise SqlParseError(f"Expected '{char}' near {self._near()}")
+
+    def identifier(self) -> str:
+        kind, value, _, _ = self.peek()
+        if kind != "ident":
+            raise SqlParseError(f"Expected a column or table name near {self._near()}")
+        self.index += 1
+        return value
+
+    def _near(self) -> str:
+        kind, value, start, _ = self.peek()
+        return "end of query" if kind == "eof" else repr(self.sql[start:start + 20])
+
+    # -- grammar --------------------------------------------------------
+
+    def statement(self) -> SelectStatement:
+        self.expect_keyword("SELECT")
+        if self.at_keyword("DISTINCT"):
+            raise SqlParseError("DISTINCT is not supported")
+        items = self.select_list()
+
+        self.expect_keyword("FROM")
+        schema, table = None, self.identifier()
+        if self.accept_punct("."):
+            schema, table = table, self.identifier()
+        if self.accept_keyword("AS") or self.peek()[0] == "ident":
+            self.identifier()  # Table alias; columns may be qualified with it
+        if self.at_keyword("JOIN") or self.accept_punct(","):
+            raise SqlParseError("Joins are not supported; query one table at a time")
+
+        statement = SelectStatement(items=items, table=table, schema=schema)
+
+        if self.accept_keyword("WHERE"):
+            statement.where = self.predicate()
+        if self.accept_keyword("GROUP"):
+            self.expect_keyword("BY")
+            statement.group_by = [self.identifier()]
+            while self.accept_punct(","):
+                statement.group_by.append(self.identifier())
+        if self.accept_keyword("HAVING"):
+            start = self.peek()[2]
+            statement.having = self.predicate(allow_aggregates=True)
+            statement.having_sql = self.sql[start:self.tokens[self.index - 1][3]]
+        if self.accept_keyword("ORDER"):
+            self.expect_keyword("BY")
+            start = self.peek()[2]
+            statement.order_by = [self.order_item()]
+            while self.accept_punct(","):
+                statement.order_by.append(self.order_item())
+            statement.order_by_sql = self.sql[start:self.tokens[self.index - 1][3]]
+        if self.accept_keyword("LIMIT"):
+            statement.limit = self.integer()
+            if self.accept_keyword("OFFSET"):
+                statement.offset = self.integer()
+
+        self.accept_punct(";")
+        if self.peek()[0] != "eof":
+            raise SqlParseError(f"Unsupported SQL near {self._near()}")
+        return statement
+
+    def integer(self) -> int:
+        kind, value, _, _ = self.advance()
+        if kind != "number" or not isinstance(value, int):
+            raise SqlParseError("LIMIT and OFFSET take a whole number")
+        return value
+
+    def select_list(self) -> List[SelectItem]:
+        if self.accept_punct("*"):
+            return []
+        items = [self.select_item()]
+        while self.accept_punct(","):
+            items.append(self.select_item())
+        return items
+
+    def select_item(self) -> SelectItem:
+        expr: Union[Column, AggregateCall]
+        if self.at_keyword(*AGGREGATE_FUNCTIONS):
+            expr = self.aggregate_call()
+        else:
+            expr = Column(self.identifier())
+            if self.accept_punct("."):
+                expr = Column(self.identifier())  # table-qualified column
+        alias = None
+        if self.accept_keyword("AS") or self.peek()[0] == "ident":
+            alias = self.identifier()
+        return SelectItem(expr, alias)
+
+    def aggregate_call(self) -> AggregateCall:
+        func = self.advance()[1]
+        self.expect_punct("(")
+        if self.at_keyword("DISTINCT"):
+            raise SqlParseError(f"{func}(DISTINCT ...) is not supported")
+        column = "*" if self.accept_punct("*") else self.identifier()
+        self.expect_punct(")")
+        if column == "*" and func != "COUNT":
+            raise SqlParseError(f"{func}(*) is not valid SQL")
+        return AggregateCall(func, column)
+
+    def order_item(self) -> OrderItem:
+        kind, value, _, _ = self.peek()
+        term: Union[Column, AggregateCall, int]
+        if kind == "number" and isinstance(value, int):
+            self.index += 1
+            term = value
+        elif self.at_keyword(*AGGREGATE_FUNCTIONS):
+            term = self.aggregate_call()
+        else:
+            term = Column(self.identifier())
+        descending = False
+        if self.accept_keyword("DESC"):
+            descending = True
+        else:
+            self.accept_keyword("ASC")
+        return OrderItem(term, descending)
+
+    def predicate(self, allow_aggregates: bool = False) -> Predicate:
+        self._allow_aggregates = allow_aggregates
+        return self.disjunction()
+
+    def disjunction(self) -> Predicate:
+        operands = [self.conjunction()]
+        while self.accept_keyword("OR"):
+            operands.append(self.conjunction())
+        return operands[0] if len(operands) == 1 else BoolOp("or", tuple(operands))
+
+    def conjunction(self) -> Predicate:
+        operands = [self.negation()]
+        while self.accept_keyword("AND"):
+            operands.append(self.negation())
+        return operands[0] if len(operands) == 1 else BoolOp("and", tuple(operands))
+
+    def negation(self) -> Predicate:
+        if self.accept_keyword("NOT"):
+            return Not(self.negation())
+        if self.accept_punct("("):
+            inner = self.disjunction()
+            self.expect_punct(")")
+            return inner
+        return self.condition()
+
+    def condition(self) -> Predicate:
+        left = self.operand()
+        kind, value, _, _ = self.peek()
+        if kind == "op":
+            self.index += 1
+            return Comparison(left, value, self.operand())
+
+        if self.accept_keyword("IS"):
+            negated = self.accept_keyword("NOT")
+            self.expect_keyword("NULL")
+            return IsNull(left, negated)
+
+        negated = self.accept_keyword("NOT")
+        if self.accept_keyword("IN"):
+            self.expect_punct("(")
+            values = [self.literal()]
+            while self.accept_punct(","):
+                values.append(self.literal())
+            self.expect_punct(")")
+            return InList(left, tuple(values), negated)
+        if self.accept_keyword("BETWEEN"):
+            low = self.literal()
+            self.expect_keyword("AND")
+            return Between(left, low, self.literal(), negated)
+        if self.accept_keyword("LIKE"):
+            pattern = self.literal()
+            if not isinstance(pattern, str):
+                raise SqlParseError("LIKE takes a string pattern")
+            return Like(left, pattern, negated)
+        raise SqlParseError(f"Expected a comparison near {self._near()}")
+
+    def operand(self) -> Operand:
+        if self.at_keyword(*AGGREGATE_FUNCTIONS):
+            if not self._allow_aggregates:
+                raise SqlParseError("Aggregates are only allowed in SELECT, HAVING and ORDER BY")
+            return self.aggregate_call()
+        kind, _, _, _ = self.peek()
+        if kind == "ident":
+            name = self.identifier()
+            if self.accept_punct("."):
+                name = self.identifier()
+            return Column(name)
+        return Literal(self.literal())
+
+    def literal(self) -> Any:
+        if self.accept_keyword("NULL"):
+            return None
+        if self.accept_keyword("TRUE"):
+            return True
+        if self.accept_keyword("FALSE"):
+            return False
+        sign = -1 if self.accept_punct("-") else 1
+        kind, value, _, _ = self.peek()
+        if kind == "number":
+            self.index += 1
+            return sign * value
+        if kind == "string" and sign == 1:
+            self.index += 1
+            return value
+        raise SqlParseError(f"Expected a literal value near {self._near()}")
+
+
+def parse_select(sql: str) -> SelectStatement:
+    """
+    Parse a single-table SELECT
+
+    Raises:
+        SqlParseError: If the query is outside the supported subset
+    """
+    return _Parser(sql).statement()
+
+
+# ---------------------------------------------------------------------------
+# Predicates: OData translation and local evaluation
+# ---------------------------------------------------------------------------
+
+def _odata_literal(value: Any) -> Optional[str]:
+    if value is None:
+        return "null"
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, (int, float)):
+        return repr(value)
+    if "'" in value:
+        # The Consumption API has no escape for quotes in values (see odata_filter)
+        return None
+    return f"'{value}'"
+
+
+def to_odata_filter(predicate: Predicate, federated: bool = False) -> Optional[str]:
+    """
+    Translate a predicate to an OData ``$filter`` expression
+
+    Args:
+        predicate: WHERE predicate (or part of one)
+        federated: The asset is lineage-limited, so only eq/and/or are usable
+
+    Returns:
+        The expression, or None if any part of it cannot be expressed
+    """
+    if isinstance(predicate, BoolOp):
+        parts = [to_odata_filter(p, federated) for p in predicate.operands]
+        if any(part is None for part in parts):
+            return None
+        return f" {predicate.op} ".join(
+            f"({part})" if isinstance(p, BoolOp) else part for p, part in zip(predicate.operands, parts)
+        )
+
+    if isinstance(predicate, Not):
+        inner = to_odata_filter(predicate.operand, federated)
+        return None if inner is None or federated else f"not ({inner})"
+
+    if isinstance(predicate, Comparison):
+        left, op, right = predicate.left, predicate.op, predicate.right
+        if isinstance(left, Literal) and isinstance(right, Column):
+            left, op, right = right, _MIRRORED[op], left
+        if not (isinstance(left, Column) and isinstance(right, Literal)):
+            return None
+        if federated and op != "=":
+            return None
+        value = _odata_literal(right.value)
+        return None if value is None else f"{left.name} {_ODATA_OPERATORS[op]} {value}"
+
+    if not isinstance(getattr(predicate, "operand", None), Column):
+        return None
+    column = predicate.operand.name
+
+    if isinstance(predicate, IsNull):
+        if predicate.negated and federated:
+            return None
+        return f"{column} {'ne' if predicate.negated else 'eq'} null"
+
+    if isinstance(predicate, InList):
+        values = [_odata_literal(v) for v in predicate.values]
+        if any(v is None for v in values) or (predicate.negated and federated):
+            return None
+        if predicate.negated:
+            return " and ".join(f"{column} ne {v}" for v in values)
+        return "(" + " or ".join(f"{column} eq {v}" for v in values) + ")"
+
+    if isinstance(predicate, Between):
+        low, high = _odata_literal(predicate.low), _odata_literal(predicate.high)
+        if low is None or high is None or federated:
+            return None
+        if predicate.negated:
+            return f"({column} lt {low} or {column} gt {high})"
+        return f"{column} ge {low} and {column} le {high}"
+
+    if isinstance(predicate, Like):
+        return _like_to_odata(column, predicate, federated)
+
+    return None
+
+
+def _like_to_odata(column: str, predicate: Like, federated: bool) -> Optional[str]:
+    pattern = predicate.pattern
+    core = pattern.strip("%")
+    if "%" in core or "_" in core or "'" in core:
+        return None
+    starts, ends = pattern.startswith("%"), pattern.endswith("%")
+    if not starts and not ends:
+        expression = f"{column} eq '{core}'"
+        if predicate.negated:
+            expression = f"{column} ne '{core}'"
+            return None if federated else expression
+        return expression
+    if federated:
+        return None
+    if starts and ends:
+        expression = f"contains({column},'{core}')"
+    elif ends:
+        expression = f"startswith({column},'{core}')"
+    else:
+        expression = f"endswith({column},'{core}')"
+    return f"not {expression}" if predicate.negated else expression
+
+
+def conjuncts(predicate: Optional[Predicate]) -> List[Predicate]:
+    """Top-level AND operands of a predicate"""
+    if predicate is None:
+        return []
+    if isinstance(predicate, BoolOp) and predicate.op == "and":
+        return [c for operand in predicate.operands for c in conjuncts(operand)]
+    return [predicate]
+
+
+def predicate_columns(predicate: Predicate) -> List[str]:
+    """Columns a predicate reads, in first-use order"""
+    found: Dict[str, None] = {}
+
+    def visit(node: Any):
+        if isinstance(node, Column):
+            found[node.name] = None
+        elif isinstance(node, BoolOp):
+            for operand in node.operands:
+                visit(operand)
+        elif isinstance(node, Not):
+            visit(node.operand)
+        elif isinstance(node, Comparison):
+            visit(node.left)
+            visit(node.right)
+        elif hasattr(node, "operand"):
+            visit(node.operand)
+
+    visit(predicate)
+    return list(found)
+
+
+def _value(operand: Operand, row: Dict[str, Any]) -> Any:
+    if isinstance(operand, Column):
+        return row.get(operand.name)
+    if isinstance(operand, Literal):
+        return operand.value
+    raise SqlParseError("Aggregates cannot be evaluated per row")
+
+
+def _coerce(left: Any, right: Any) -> Tuple[Any, Any]:
+    """Compare numbers with numeric strings (decimals often arrive as strings)"""
+    if isinstance(left, str) and isinstance(right, (int, float)) and not isinstance(right, bool):
+        try:
+            return float(left), right
+        except ValueError:
+            return left, str(right)
+    if isinstance(right, str) and isinstance(left, (int, float)) and not isinstance(left, bool):
+        right, left = _coerce(right, left)
+    return left, right
+
+
+def _compare(left: Any, op: str, right: Any) -> bool:
+    if left is None or right is None:
+        return False
+    left, right = _coerce(left, right)
+    try:
+        if op == "=":
+            return left == right
+        if op in ("!=", "<>"):
+            return left != right
+        if op == "<":
+            return left < right
+        if op == "<=":
+            return left <= right
+        if op == ">":
+            return left > right
+        return left >= right
+    except TypeError:
+        return False
+
+
+def _like_regex(pattern: str) -> "re.Pattern[str]":
+    parts = (".*" if ch == "%" else "." if ch == "_" else re.escape(ch) for ch in pattern)
+    return re.compile("".join(parts), re.DOTALL)
+
+
+def evaluate(predicate: Predicate, row: Dict[str, Any]) -> bool:
+    """Evaluate a WHERE predicate against one row (NULL comparisons are false)"""
+    if isinstance(predicate, BoolOp):
+        if predicate.op == "and":
+            return all(evaluate(p, row) for p in predicate.operands)
+        return any(evaluate(p, row) for p in predicate.operands)
+    if isinstance(predicate, Not):
+        return not evaluate(predicate.operand, row)
+    if isinstance(predicate, Comparison):
+        return _compare(_value(predicate.left, row), predicate.op, _value(predicate.right, row))
+
+    value = _value(predicate.operand, row)
+    if isinstance(predicate, IsNull):
+        return (value is None) != predicate.negated
+    if value is None:
+        return False
+    if isinstance(predicate, InList):
+        return any(_compare(value, "=", v) for v in predicate.values) != predicate.negated
+    if isinstance(predicate, Between):
+        inside = _compare(value, ">=", predicate.low) and _compare(value, "<=", predicate.high)
+        return inside != predicate.negated
+    if isinstance(predicate, Like):
+        return bool(predicate.regex.fullmatch(str(value))) != predicate.negated
+    return False
+
+
+# ---------------------------------------------------------------------------
+# Planner
+# ---------------------------------------------------------------------------
+
+TARGET_ANALYTICAL = "analytical"
+TARGET_RELATIONAL = "relational"
+
+#: Upper bound on raw rows fetched for local processing
+LOCAL_FETCH_LIMIT = 50000
+
+#: Rows per request when fetching rows for local processing
+LOCAL_FETCH_PAGE_SIZE = 10000
+
+
+@dataclass
+class QueryPlan:
+    """OData request parameters plus the work left to do on the fetched rows"""
+    statement: SelectStatement
+    target: str
+    params: Dict[str, Any]
+    residual: Optional[Predicate] = None
+    aggregation: Optional[AggregationQuery] = None
+    rename: Dict[str, str] = field(default_factory=dict)
+    project: Optional[List[str]] = None  # Selected source columns, when trimming locally
+    local_offset: int = 0
+    local_limit: Optional[int] = None
+    fetch_limit: Optional[int] = None  # Raw-row cap when local work reads a bounded fetch
+    pushed: List[str] = field(default_factory=list)
+    local: List[str] = field(default_factory=list)
+
+    @property
+    def fully_pushed(self) -> bool:
+        return not self.local
+
+    def describe(self) -> str:
+        pushed = ", ".join(self.pushed) or "nothing"
+        local = ", ".join(self.local) or "nothing"
+        return f"pushed down: {pushed}; local: {local}"
+
+    def is_truncated(self, raw_rows: List[Dict[str, Any]], rows: List[Dict[str, Any]]) -> bool:
+        """
+        True if hitting ``fetch_limit`` may have changed the result
+
+        An aggregate over a capped fetch is wrong as soon as the cap is hit;
+        a locally filtered projection only when it came up short of its limit.
+        """
+        if self.fetch_limit is None or len(raw_rows) < self.fetch_limit:
+            return False
+        return self.aggregation is not None or self.local_limit is None or len(rows) < self.local_limit
+
+    def execute_locally(self, rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Finish the query on the rows the service returned
+
+        Raises:
+            columnar_aggregation.UnsupportedAggregation: If HAVING/ORDER BY
+                reference something the local aggregation cannot resolve
+        """
+        if self.residual is not None:
+            rows = [row for row in rows if evaluate(self.residual, row)]
+        if self.aggregation is not None:
+            rows = aggregate_rows(rows, self.aggregation)
+        if self.project is not None:
+            rows = [{self.rename.get(key, key): row.get(key) for key in self.project} for row in rows]
+        elif self.rename:
+            rows = [{self.rename.get(key, key): value for key, value in row.items()} for row in rows]
+        if self.local_offset:
+            rows = rows[self.local_offset:]
+        if self.local_limit is not None:
+            rows = rows[:self.local_limit]
+        return rows
+
+
+def _output_name(item: SelectItem, grouped: bool) -> str:
+    """Output column name, matching the legacy client-side aggregation"""
+    if isinstance(item.expr, Column):
+        return item.alias or item.expr.name
+    name = item.alias or f"{item.expr.func}_{item.expr.column}"
+    return name if grouped else name.replace("*", "ALL")
+
+
+def plan_select(
+    statement: SelectStatement,
+    target: str,
+    max_rows: int,
+    fetch_limit: int,
+    federated_filters: bool = False,
+    push_filters: bool = True,
+) -> QueryPlan:
+    """
+    Decide what the service computes and what is left for ``execute_locally``
+
+    Args:
+        statement: Parsed query
+        target: ``TARGET_ANALYTICAL`` (accepts ``$apply``) or ``TARGET_RELATIONAL``
+        max_rows: Cap on the rows returned to the caller
+        fetch_limit: Cap on raw rows fetched when local work remains
+        federated_filters: The asset is known to be lineage-limited, so only
+            eq/and/or predicates are pushed
+        push_filters: False pushes no predicates (used after the service
+            rejected a filter), so WHERE is evaluated locally
+    """
+    plan = QueryPlan(statement=statement, target=target, params={})
+    row_cap = min(statement.limit, max_rows) if statement.limit is not None else max_rows
+
+    # WHERE: push each translatable top-level conjunct, keep the rest
+    pushed_filters, residual = [], []
+    for conjunct in conjuncts(statement.where):
+        expression = to_odata_filter(conjunct, federated_filters) if push_filters else None
+        if expression is None:
+            residual.append(conjunct)
+        else:
+            # Conjuncts are never AND nodes, so only an OR needs its own parentheses
+            pushed_filters.append(f"({expression})" if isinstance(conjunct, BoolOp) else expression)
+    odata_filter = " and ".join(pushed_filters) or None
+    if residual:
+        plan.residual = residual[0] if len(residual) == 1 else BoolOp("and", tuple(residual))
+        plan.local.append("WHERE")
+
+    if statement.has_aggregation:
+        pushed = (target == TARGET_ANALYTICAL and plan.residual is None and _apply_pushable(statement)
+                  and _push_aggregation(plan, statement, odata_filter, row_cap))
+        if not pushed:
+            _local_aggregation(plan, statement, odata_filter, fetch_limit, row_cap)
+    else:
+        _plan_projection(plan, statement, odata_filter, fetch_limit, row_cap)
+    return plan
+
+
+def _apply_pushable(statement: SelectStatement) -> bool:
+    if statement.having is not None:
+        return False
+    for item in statement.aggregates:
+        if item.expr.column == "*":
+            if item.expr.func != "COUNT":
+                return False
+        elif item.expr.func not in _APPLY_METHODS:
+            return False
+    return True
+
+
+def _apply_alias(name: str, used: Dict[str, None]) -> str:
+    """A valid, unique OData alias for an output column"""
+    alias = name if _IDENTIFIER_RE.match(name) else re.sub(r"\W", "_", name.replace("*", "ALL"))
+    while alias in used:
+        alias += "_"
+    used[alias] = None
+    return alias
+
+
+def _push_aggregation(plan: QueryPlan, statement: SelectStatement,
+                      odata_filter: Optional[str], row_cap: int) -> bool:
+    """Push the whole aggregation as ``$apply``; False if ORDER BY cannot follow it"""
+    used: Dict[str, None] = dict.fromkeys(statement.group_by)
+    rename: Dict[str, str] = {}
+    by_call: Dict[Tuple[str, str], str] = {}
+    by_name: Dict[str, str] = {}
+    expressions = []
+    for item in statement.aggregates:
+        output = _output_name(item, bool(statement.group_by))
+        alias = _apply_alias(output, used)
+        if alias != output:
+            rename[alias] = output
+        by_call.setdefault((item.expr.func, item.expr.column), alias)
+        by_name.setdefault(output.lower(), alias)
+        if item.expr.column == "*":
+            expressions.append(f"$count as {alias}")
+        else:
+            expressions.append(f"{item.expr.column} with {_APPLY_METHODS[item.expr.func]} as {alias}")
+
+    order = _resolve_order(statement, lambda term: _aggregate_order_name(term, statement, by_call, by_name))
+    if order is None:
+        return False
+
+    steps = []
+    if odata_filter:
+        steps.append(f"filter({odata_filter})")
+    aggregate = f"aggregate({','.join(expressions)})" if expressions else None
+    if statement.group_by:
+        group = f"({','.join(statement.group_by)})"
+        steps.append(f"groupby({group},{aggregate})" if aggregate else f"groupby({group})")
+    elif aggregate:
+        steps.append(aggregate)
+    plan.params["$apply"] = "/".join(steps)
+    plan.pushed.append("$apply " + ("filter/" if odata_filter else "") + ("groupby" if statement.group_by else "aggregate"))
+    plan.rename.update(rename)
+    if rename:
+        plan.local.append("rename")
+
+    if order:
+        plan.params["$orderby"] = order
+        plan.pushed.append("$orderby")
+    plan.params["$top"] = row_cap
+    plan.pushed.append("$top")
+    if statement.offset:
+        plan.params["$skip"] = statement.offset
+        plan.pushed.append("$skip")
+    return True
+
+
+def _aggregate_order_name(term: Any, statement: SelectStatement,
+                          by_call: Dict[Tuple[str, str], str], by_name: Dict[str, str]) -> Optional[str]:
+    if isinstance(term, AggregateCall):
+        return by_call.get((term.func, term.column))
+    if isinstance(term, int):
+        # Positions count SELECT items in order, whatever their kind
+        if not 1 <= term <= len(statement.items):
+            return None
+        item = statement.items[term - 1]
+        if isinstance(item.expr, AggregateCall):
+            return by_name.get(_output_name(item, bool(statement.group_by)).lower())
+        term = item.expr
+    for column in statement.group_by:
+        if column.lower() == term.name.lower():
+            return column
+    return by_name.get(term.name.lower())
+
+
+def _aggregation_output(item: SelectItem, group_by: List[str]) -> str:
+    """Column a SELECT item appears under in locally aggregated rows"""
+    if isinstance(item.expr, AggregateCall):
+        return _output_name(item, bool(group_by))
+    for column in group_by:
+        if column.lower() == item.expr.name.lower():
+            return column
+    return item.expr.name
+
+
+def _local_aggregation(plan: QueryPlan, statement: SelectStatement,
+                       odata_filter: Optional[str], fetch_limit: int, row_cap: int):
+    grouped = bool(statement.group_by)
+    plan.aggregation = AggregationQuery(
+        aggregates=[
+            Aggregate(item.expr.func, item.expr.column, _output_name(item, grouped))
+            for item in statement.aggregates
+        ],
+        group_by=list(statement.group_by),
+        having=statement.having_sql,
+        order_by=statement.order_by_sql,
+        select_outputs=[_aggregation_output(item, statement.group_by) for item in statement.items],
+    )
+
+    needed = dict.fromkeys(statement.group_by)
+    needed.update(dict.fromkeys(i.expr.column for i in statement.aggregates if i.expr.column != "*"))
+    if statement.having is not None:
+        needed.update(dict.fromkeys(c for c in _aggregate_columns(statement.having) if c != "*"))
+    for order in statement.order_by:
+        if isinstance(order.term, AggregateCall) and order.term.column != "*":
+            needed[order.term.column] = None
+    if plan.residual is not None:
+        needed.update(dict.fromkeys(predicate_columns(plan.residual)))
+    if needed:
+        plan.params["$select"] = ",".join(needed)
+        plan.pushed.append("$select")
+    if odata_filter:
+        plan.params["$filter"] = odata_filter
+        plan.pushed.append("$filter")
+    plan.params["$top"] = fetch_limit
+    plan.fetch_limit = fetch_limit
+    plan.local.append("aggregation")
+    plan.local_offset = statement.offset
+    plan.local_limit = row_cap
+
+
+def _aggregate_columns(predicate: Predicate) -> List[str]:
+    found: List[str] = []
+
+    def visit(node: Any):
+        if isinstance(node, AggregateCall):
+            found.append(node.column)
+        elif isinstance(node, BoolOp):
+            for operand in node.operands:
+                visit(operand)
+        elif isinstance(node, Not):
+            visit(node.operand)
+        elif isinstance(node, Comparison):
+            visit(node.left)
+            visit(node.right)
+        elif hasattr(node, "operand"):
+            visit(node.operand)
+
+    visit(predicate)
+    return found
+
+
+def _plan_projection(plan: QueryPlan, statement: SelectStatement,
+                     odata_filter: Optional[str], fetch_limit: int, row_cap: int):
+    if statement.items:
+        selected = dict.fromkeys(item.expr.name for item in statement.items)
+        for item in statement.items:
+            if item.alias and item.alias != item.expr.name:
+                plan.rename[item.expr.name] = item.alias
+        if plan.residual is not None or plan.rename:
+            # Residual predicates may need columns that are not selected
+            plan.project = list(selected)
+            selected.update(dict.fromkeys(predicate_columns(plan.residual) if plan.residual else []))
+        plan.params["$select"] = ",".join(selected)
+        plan.pushed.append("$select")
+        if plan.rename:
+            plan.local.append("rename")
+
+    if odata_filter:
+        plan.params["$filter"] = odata_filter
+        plan.pushed.append("$filter")
+
+    aliases = {item.alias.lower(): item.expr.name for item in statement.items if item.alias}
+    positions = [item.expr.name for item in statement.items]
+
+    def column_name(term: Any) -> Optional[str]:
+        if isinstance(term, int):
+            return positions[term - 1] if 1 <= term <= len(positions) else None
+        if isinstance(term, Column):
+            return aliases.get(term.name.lower(), term.name)
+        return None
+
+    order = _resolve_order(statement, column_name)
+    if order is None:
+        raise SqlParseError("ORDER BY must name a column or select position")
+    if order:
+        # Filtering locally keeps the service's order, so ORDER BY is always pushed
+        plan.params["$orderby"] = order
+        plan.pushed.append("$orderby")
+
+    if plan.residual is None:
+        plan.params["$top"] = row_cap
+        plan.pushed.append("$top")
+        if statement.offset:
+            plan.params["$skip"] = statement.offset
+            plan.pushed.append("$skip")
+    else:
+        plan.params["$top"] = fetch_limit
+        plan.fetch_limit = fetch_limit
+        plan.local_offset = statement.offset
+        plan.local_limit = row_cap
+        plan.local.append("LIMIT")
+
+
+def _resolve_order(statement: SelectStatement, name_of) -> Optional[str]:
+    """Render ORDER BY as ``$orderby``; None if a term cannot be named"""
+    terms = []
+    for item in statement.order_by:
+        name = name_of(item.term)
+        if name is None:
+            return None
+        terms.append(f"{name} desc" if item.descending else name)
+    return ",".join(terms)
@@ -7,12 +7,14 @@ Provides insights for optimization and troubleshooting.
 
 import time
 import logging
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 from datetime import datetime, timedelta
 from collections import defaultdict, deque
 from dataclasses import dataclass, field
 from enum import Enum
 
+import tracing
+
 logger = logging.getLogger(__name__)
 
 
@@ -57,6 +59,62 @@ class TelemetryStats:
     error_counts: Dict[str, int] = field(default_factory=dict)
 
 
+#: Upper bounds (ms) of the latency histogram buckets; the last bucket is open
+LATENCY_BUCKETS_MS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000)
+
+#: Stages that run inside the handler span; what is left of the handler
+#: after them is reported as "handler_self" (our own post-processing). The
+#: union of their intervals is subtracted, so concurrent requests and an
+#: oauth_token span within upstream_http are not subtracted twice.
+HANDLER_NESTED_STAGES = ("upstream_http", "pii_masking", "oauth_token")
+
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram (constant memory, O(buckets) record)"""
+
+    def __init__(self, bounds: Tuple[float, ...] = LATENCY_BUCKETS_MS):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def record(self, duration_ms: float):
+        """Add one observation"""
+        index = 0
+        while index < len(self.bounds) and duration_ms > self.bounds[index]:
+            index += 1
+        self.counts[index] += 1
+        self.count += 1
+        self.total_ms += duration_ms
+        self.max_ms = max(self.max_ms, duration_ms)
+
+    def percentile(self, fraction: float) -> float:
+        """Upper bound of the bucket holding the given fraction of observations"""
+        if not self.count:
+            return 0.0
+        target = fraction * self.count
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if seen >= target:
+                return float(self.bounds[index]) if index < len(self.bounds) else self.max_ms
+        return self.max_ms
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Summary plus non-empty buckets keyed by upper bound ("le")"""
+        labels = [f"le_{bound}ms" for bound in self.bounds] + ["inf"]
+        return {
+            "count": self.count,
+            "avg_ms": round(self.total_ms / self.count, 2) if self.count else 0.0,
+            "p50_ms": self.percentile(0.50),
+            "p95_ms": self.percentile(0.95),
+            "p99_ms": self.percentile(0.99),
+            "max_ms": round(self.max_ms, 2),
+            "buckets": {label: n for label, n in zip(labels, self.counts) if n}
+        }
+
+
 class TelemetryManager:
     """
     Telemetry and monitoring manager
@@ -68,16 +126,19 @@ class TelemetryManager:
     - Performance metrics
     - Cache effectiveness
     - Sliding window for recent metrics
+    - Per-stage latency histograms from call traces (see ``tracing``)
     """
 
-    def __init__(self, max_history: int = 1000):
+    def __init__(self, max_history: int = 1000, enable_spans: bool = True):
         """
         Initialize telemetry manager
 
         Args:
             max_history: Maximum number of recent metrics to keep
+            enable_spans: Record per-stage latency spans for each tool call
         """
         self.max_history = max_history
+        self.enable_spans = enable_spans
         self._metrics: deque[ToolMetric] = deque(maxlen=max_history)
         self._tool_usage = defaultdict(int)
         self._tool_errors = defaultdict(int)
@@ -88,6 +149,16 @@ class TelemetryManager:
         self._validation_failures = 0
         self._authorization_denials = 0
         self._cache_events = defaultdict(lambda: defaultdict(int))  # {category: {event_type: count}}
+        self._pool_events = defaultdict(int)  # {event_type: count}
+        self._pool_wait_ms: deque[float] = deque(maxlen=max_history)
+        self._pool_in_use = 0
+        self._pool_in_use_peak = 0
+        self._pool_limit: Optional[int] = None
+        self._stage_histograms: Dict[str, LatencyHistogram] = defaultdict(LatencyHistogram)
+        self._tool_stage_ms = defaultdict(lambda: defaultdict(float))  # {tool: {stage: total ms}}
+        self._traced_calls = defaultdict(int)  # {tool: traced call count}
+        self._token_events = defaultdict(int)  # {"proactive"|"on_demand"|"failed": count}
+        self._token_latency = LatencyHistogram()
 
         logger.info(f"Telemetry manager initialized (max_history={max_history})")
 
@@ -155,19 +226,171 @@ class TelemetryManager:
         Record a cache event (hit/miss)
 
         Args:
-            event_type: Type of event ("hit" or "miss")
+            event_type: Type of event ("hit", "stale_hit", "l2_hit" or "miss")
             category: Cache category (e.g., "catalog_assets", "spaces")
             details: Optional details about the event
         """
         self._cache_events[category][event_type] += 1
 
-        if event_type == "hit":
+        if event_type in ("hit", "stale_hit"):
             self._cache_hits += 1
         elif event_type == "miss":
             self._cache_misses += 1
 
         logger.debug(f"Cache {event_type}: {category} ({details})")
 
+    def record_connection_pool_event(
+        self,
+        event_type: str,
+        wait_ms: Optional[float] = None,
+        in_use: Optional[int] = None,
+        limit: Optional[int] = None
+    ):
+        """
+        Record an HTTP connection pool event
+
+        Args:
+            event_type: "created", "reused", "queued" (waited for a free slot)
+                or "coalesced" (GET joined an identical in-flight request)
+            wait_ms: Time spent waiting for a connection, for "queued" events
+            in_use: Connections checked out of the pool at the time of the event
+            limit: Configured pool size
+        """
+        self._pool_events[event_type] += 1
+
+        if wait_ms is not None:
+            self._pool_wait_ms.append(wait_ms)
+
+        if in_use is not None:
+            self._pool_in_use = in_use
+            self._pool_in_use_peak = max(self._pool_in_use_peak, in_use)
+
+        if limit is not None:
+            self._pool_limit = limit
+
+        logger.debug(f"Connection pool {event_type} (in_use={in_use}, wait_ms={wait_ms})")
+
+    def record_token_refresh(self, duration_ms: float, success: bool, proactive: bool):
+        """
+        Record an OAuth token renewal
+
+        Args:
+            duration_ms: Time spent on the token endpoint, retries included
+            success: Whether a token was obtained
+            proactive: Renewed in the background before expiry, rather than
+                by a caller that found no valid token
+        """
+        self._token_events["proactive" if proactive else "on_demand"] += 1
+        if success:
+            self._token_latency.record(duration_ms)
+        else:
+            self._token_events["failed"] += 1
+
+        logger.debug(f"Token renewal (proactive={proactive}, success={success}, {duration_ms:.1f}ms)")
+
+    def get_token_refresh_stats(self) -> Dict[str, Any]:
+        """Get OAuth token renewal counts and latency"""
+        return {
+            "proactive": self._token_events["proactive"],
+            "on_demand": self._token_events["on_demand"],
+            "failed": self._token_events["failed"],
+            "latency": self._token_latency.to_dict()
+        }
+
+    def start_call_trace(self, tool_name: str) -> Optional[Tuple[tracing.CallTrace, Any]]:
+        """
+        Begin collecting spans for a tool call
+
+        Returns:
+            Handle for ``finish_call_trace``, or None when spans are disabled
+        """
+        if not self.enable_spans:
+            return None
+        return tracing.start_trace(tool_name)
+
+    def finish_call_trace(self, handle: Optional[Tuple[tracing.CallTrace, Any]]):
+        """
+        Stop a call trace and fold its spans into the stage histograms
+
+        Every span is recorded individually (each upstream request is one
+        observation); per-tool figures are summed per call.
+        """
+        if handle is None:
+            return
+        trace, token = handle
+        tracing.end_trace(trace, token)
+
+        for stage, duration_ms, _ in trace.spans:
+            self._stage_histograms[stage].record(duration_ms)
+
+        totals = trace.totals()
+        if "handler" in totals:
+            nested = trace.covered_ms(HANDLER_NESTED_STAGES)
+            totals["handler_self"] = max(0.0, totals["handler"] - nested)
+            self._stage_histograms["handler_self"].record(totals["handler_self"])
+
+        self._traced_calls[trace.tool_name] += 1
+        tool_totals = self._tool_stage_ms[trace.tool_name]
+        for stage, duration_ms in totals.items():
+            tool_totals[stage] += duration_ms
+
+        logger.debug(
+            f"Latency breakdown for {trace.tool_name}: "
+            + ", ".join(f"{stage}={ms:.1f}ms" for stage, ms in totals.items())
+        )
+
+    def record_stage(self, tool_name: str, stage: str, duration_ms: float):
+        """
+        Record a stage timed after the call's trace was finished
+
+        The transport serialises a ``ToolResult`` only once ``handle_call_tool``
+        has returned; its time is folded into the same histograms and per-tool
+        totals as the traced stages.
+        """
+        if not self.enable_spans:
+            return
+        self._stage_histograms[stage].record(duration_ms)
+        self._tool_stage_ms[tool_name][stage] += duration_ms
+
+    def get_latency_breakdown(self) -> Dict[str, Any]:
+        """Per-stage latency histograms, and per-tool average milliseconds per stage"""
+        return {
+            "enabled": self.enable_spans,
+            "by_stage": {
+                stage: histogram.to_dict()
+                for stage, histogram in sorted(self._stage_histograms.items())
+            },
+            "by_tool": {
+                tool: {
+                    stage: round(total_ms / max(1, self._traced_calls[tool]), 2)
+                    for stage, total_ms in sorted(stages.items())
+                }
+                for tool, stages in self._tool_stage_ms.items()
+            }
+        }
+
+    def get_connection_pool_stats(self) -> Dict[str, Any]:
+        """Get connection pool occupancy, reuse and wait-time metrics"""
+        created = self._pool_events["created"]
+        reused = self._pool_events["reused"]
+        waits = list(self._pool_wait_ms)
+
+        return {
+            "connections_created": created,
+            "connections_reused": reused,
+            "reuse_rate_percent": round(
+                (reused / (created + reused) * 100) if (created + reused) > 0 else 0.0,
+                2
+            ),
+            "queued_requests": self._pool_events["queued"],
+            "coalesced_requests": self._pool_events["coalesced"],
+            "avg_wait_ms": round(sum(waits) / len(waits), 2) if waits else 0.0,
+            "max_wait_ms": round(max(waits), 2) if waits else 0.0,
+            "in_use": self._pool_in_use,
+            "in_use_peak": self._pool_in_use_peak,
+            "limit": self._pool_limit
+        }
+
     def get_stats(self, window_minutes: Optional[int] = None) -> TelemetryStats:
         """
         Get aggregated statistics
@@ -331,6 +554,9 @@ class TelemetryManager:
                 ),
                 "by_category": dict(self._cache_events)
             },
+            "connection_pool": self.get_connection_pool_stats(),
+            "latency_breakdown": self.get_latency_breakdown(),
+            "token_refresh": self.get_token_refresh_stats(),
             "security": {
                 "validation_failures": stats.validation_failures,
                 "authorization_denials": stats.authorization_denials
@@ -370,6 +596,14 @@ class TelemetryManager:
         self._cache_misses = 0
         self._validation_failures = 0
         self._authorization_denials = 0
+        self._pool_events.clear()
+        self._pool_wait_ms.clear()
+        self._pool_in_use_peak = self._pool_in_use
+        self._stage_histograms.clear()
+        self._tool_stage_ms.clear()
+        self._traced_calls.clear()
+        self._token_events.clear()
+        self._token_latency = LatencyHistogram()
         self._start_time = time.time()
         logger.info("Telemetry statistics reset")
 
@@ -0,0 +1,316 @@
+"""Tests for CacheManager expiry, stale-while-revalidate, refresh-ahead,
+size-aware eviction and the category/expiry indexes.
+
+Entry ages are simulated by back-dating ``created_at``; no sleeping on TTLs.
+
+Run with:  pytest tests/test_cache_manager.py -v
+"""
+
+import asyncio
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from cache_manager import (  # noqa: E402
+    CacheCategory,
+    CacheManager,
+    estimate_size,
+    parse_category_budgets,
+)
+
+
+class Loader:
+    """Counting async loader returning "v1", "v2", ..."""
+
+    def __init__(self, delay=0.0, fail=False):
+        self.calls = 0
+        self.delay = delay
+        self.fail = fail
+
+    async def __call__(self):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError("upstream down")
+        return f"v{self.calls}"
+
+
+def _age(cache, key, category, seconds):
+    """Pretend the entry was written ``seconds`` ago."""
+    entry = cache._cache[cache._make_cache_key(key, category)]
+    entry.created_at -= seconds
+    # The expiry index is keyed at insert time; re-key after back-dating
+    cache._rebuild_expiry_heap()
+
+
+async def _drain(cache):
+    while cache._refresh_tasks:
+        await asyncio.gather(*cache._refresh_tasks.values(), return_exceptions=True)
+
+
+async def test_miss_loads_and_caches():
+    cache = CacheManager()
+    loader = Loader()
+    assert await cache.get_or_refresh("k", CacheCategory.SPACES, loader) == "v1"
+    assert await cache.get_or_refresh("k", CacheCategory.SPACES, loader) == "v1"
+    assert loader.calls == 1
+
+
+async def test_concurrent_misses_share_one_load():
+    cache = CacheManager()
+    loader = Loader(delay=0.01)
+    results = await asyncio.gather(*[
+        cache.get_or_refresh("k", CacheCategory.SPACES, loader) for _ in range(5)
+    ])
+    assert results == ["v1"] * 5
+    assert loader.calls == 1
+
+
+async def test_stale_entry_is_served_while_one_refresh_runs():
+    cache = CacheManager()
+    loader = Loader(delay=0.01)
+    await cache.get_or_refresh("k", CacheCategory.SPACES, loader)
+    _age(cache, "k", CacheCategory.SPACES, 301)
+
+    first = await cache.get_or_refresh("k", CacheCategory.SPACES, loader)
+    second = await cache.get_or_refresh("k", CacheCategory.SPACES, loader)
+    assert (first, second) == ("v1", "v1")
+    assert len(cache._refresh_tasks) == 1
+
+    await _drain(cache)
+    assert loader.calls == 2
+    assert await cache.get_or_refresh("k", CacheCategory.SPACES, loader) == "v2"
+    assert cache.get_stats()["stale_hits"] == 2
+
+
+async def test_entry_past_stale_window_is_reloaded_in_foreground():
+    cache = CacheManager()
+    loader = Loader()
+    await cache.get_or_refresh("k", CacheCategory.SPACES, loader)
+    _age(cache, "k", CacheCategory.SPACES, 300 + 600 + 1)
+    assert await cache.get_or_refresh("k", CacheCategory.SPACES, loader) == "v2"
+
+
+async def test_categories_without_stale_window_never_serve_stale():
+    cache = CacheManager()
+    loader = Loader()
+    await cache.get_or_refresh("k", CacheCategory.TASKS, loader)
+    _age(cache, "k", CacheCategory.TASKS, 31)
+    assert await cache.get_or_refresh("k", CacheCategory.TASKS, loader) == "v2"
+
+
+async def test_failed_background_refresh_keeps_stale_value():
+    cache = CacheManager()
+    await cache.get_or_refresh("k", CacheCategory.SPACES, Loader())
+    _age(cache, "k", CacheCategory.SPACES, 301)
+
+    failing = Loader(fail=True)
+    assert await cache.get_or_refresh("k", CacheCategory.SPACES, failing) == "v1"
+    await _drain(cache)
+    assert await cache.get_or_refresh("k", CacheCategory.SPACES, failing) == "v1"
+    assert cache.get_stats()["refresh_failures"] >= 1
+
+
+async def test_failed_foreground_load_propagates_and_caches_nothing():
+    cache = CacheManager()
+    with pytest.raises(RuntimeError):
+        await cache.get_or_refresh("k", CacheCategory.SPACES, Loader(fail=True))
+    assert cache.get("k", CacheCategory.SPACES) is None
+
+
+async def test_hot_entry_is_refreshed_ahead_of_expiry():
+    cache = CacheManager(hot_access_threshold=2, refresh_ahead_ratio=0.1)
+    loader = Loader()
+    await cache.get_or_refresh("k", CacheCategory.SPACES, loader)
+    await cache.get_or_refresh("k", CacheCategory.SPACES, loader)
+    _age(cache, "k", CacheCategory.SPACES, 290)
+
+    assert await cache.get_or_refresh("k", CacheCategory.SPACES, loader) == "v1"
+    await _drain(cache)
+    assert loader.calls == 2
+
+
+async def test_cold_entry_is_not_refreshed_ahead():
+    cache = CacheManager(hot_access_threshold=5)
+    loader = Loader()
+    await cache.get_or_refresh("k", CacheCategory.SPACES, loader)
+    _age(cache, "k", CacheCategory.SPACES, 290)
+    await cache.get_or_refresh("k", CacheCategory.SPACES, loader)
+    await _drain(cache)
+    assert loader.calls == 1
+
+
+def test_plain_get_does_not_return_stale_values():
+    cache = CacheManager()
+    cache.set("k", "v", CacheCategory.SPACES)
+    _age(cache, "k", CacheCategory.SPACES, 301)
+    assert cache.get("k", CacheCategory.SPACES) is None
+
+
+async def test_plain_get_evicts_what_only_it_would_read():
+    cache = CacheManager()
+    cache.set("plain", "v", CacheCategory.SPACES)
+    await cache.get_or_refresh("loaded", CacheCategory.SPACES, Loader())
+    _age(cache, "plain", CacheCategory.SPACES, 301)
+    _age(cache, "loaded", CacheCategory.SPACES, 301)
+
+    assert cache.get("plain", CacheCategory.SPACES) is None
+    assert cache.get("loaded", CacheCategory.SPACES) is None
+    assert set(cache._cache) == {"spaces:loaded"}  # still servable by get_or_refresh
+
+
+@pytest.mark.parametrize("invalidate", [
+    lambda cache: cache.invalidate("k", CacheCategory.SPACES),
+    lambda cache: cache.invalidate_category(CacheCategory.SPACES),
+    lambda cache: cache.invalidate_all(),
+])
+async def test_invalidation_during_a_refresh_is_not_undone(invalidate):
+    cache = CacheManager()
+    loader = Loader(delay=0.01)
+    await cache.get_or_refresh("k", CacheCategory.SPACES, loader)
+    _age(cache, "k", CacheCategory.SPACES, 301)
+    assert await cache.get_or_refresh("k", CacheCategory.SPACES, loader) == "v1"  # refresh starts
+
+    invalidate(cache)
+    await _drain(cache)
+    assert cache.peek("k", CacheCategory.SPACES) is None
+    assert await cache.get_or_refresh("k", CacheCategory.SPACES, loader) == "v3"
+    assert cache.peek("k", CacheCategory.SPACES) == "v3"  # later loads are cached again
+
+
+def test_disabled_stale_window_drops_expired_entries():
+    cache = CacheManager(stale_while_revalidate=False)
+    cache.set("k", "v", CacheCategory.SPACES)
+    _age(cache, "k", CacheCategory.SPACES, 301)
+    cache.cleanup_expired()
+    assert cache.get_stats()["size"] == 0
+
+
+def test_replacing_a_key_at_capacity_does_not_evict():
+    cache = CacheManager(max_size=2)
+    cache.set("a", 1, CacheCategory.SPACES)
+    cache.set("b", 2, CacheCategory.SPACES)
+    cache.set("a", 3, CacheCategory.SPACES)
+    assert cache.get("b", CacheCategory.SPACES) == 2
+    assert cache.get_stats()["evictions"] == 0
+
+
+def test_size_estimate_grows_with_payload():
+    small = [{"name": "SALES"}]
+    large = [{"name": "SALES", "description": "x" * 10_000}]
+    assert estimate_size(large) > estimate_size(small) + 10_000
+
+
+def test_byte_budget_is_enforced_and_reported():
+    cache = CacheManager(max_bytes=50_000)
+    for i in range(20):
+        cache.set(f"k{i}", "x" * 5_000, CacheCategory.CATALOG_ASSETS)
+
+    stats = cache.get_stats()
+    assert stats["size_bytes"] <= 50_000
+    assert stats["evictions"] > 0
+    assert stats["bytes_by_category"]["catalog_assets"] == stats["size_bytes"]
+
+
+def test_large_cold_entry_is_evicted_before_small_hot_ones():
+    cache = CacheManager(max_bytes=60_000)
+    cache.set("descriptor", {"countable": True}, CacheCategory.TABLE_SCHEMA)
+    cache.get("descriptor", CacheCategory.TABLE_SCHEMA)
+    cache.set("big_result", "x" * 40_000, CacheCategory.SPACES)
+    cache.set("another_big_result", "y" * 30_000, CacheCategory.SPACES)
+
+    assert cache.get("descriptor", CacheCategory.TABLE_SCHEMA) == {"countable": True}
+    assert cache.get("big_result", CacheCategory.SPACES) is None
+    assert cache.get("another_big_result", CacheCategory.SPACES) is not None
+
+
+def test_category_budget_only_evicts_within_category():
+    cache = CacheManager(category_max_bytes={CacheCategory.CATALOG_ASSETS: 20_000})
+    cache.set("other", "z" * 15_000, CacheCategory.SPACES)
+    cache.set("a", "x" * 15_000, CacheCategory.CATALOG_ASSETS)
+    cache.set("b", "y" * 15_000, CacheCategory.CATALOG_ASSETS)
+
+    assert cache.get("a", CacheCategory.CATALOG_ASSETS) is None
+    assert cache.get("b", CacheCategory.CATALOG_ASSETS) is not None
+    assert cache.get("other", CacheCategory.SPACES) is not None
+
+
+def test_oversize_entry_is_rejected_and_drops_the_old_value():
+    cache = CacheManager(max_bytes=10_000)
+    cache.set("k", "small", CacheCategory.SPACES)
+    cache.set("k", "x" * 20_000, CacheCategory.SPACES)
+
+    assert cache.get("k", CacheCategory.SPACES) is None
+    assert cache.get_stats()["rejected_oversize"] == 1
+    assert cache.get_stats()["size_bytes"] == 0
+
+
+def test_entry_count_limit_still_applies():
+    cache = CacheManager(max_size=3)
+    for i in range(5):
+        cache.set(f"k{i}", i, CacheCategory.SPACES)
+    assert cache.get_stats()["size"] == 3
+
+
+def test_category_budget_spec_parsing():
+    budgets = parse_category_budgets("catalog_assets=64, spaces=0.5,bogus=3")
+    assert budgets == {
+        CacheCategory.CATALOG_ASSETS: 64 * 1024 * 1024,
+        CacheCategory.SPACES: 512 * 1024,
+    }
+
+
+def test_category_invalidation_only_touches_that_category():
+    cache = CacheManager()
+    for i in range(5):
+        cache.set(f"s{i}", i, CacheCategory.SPACES)
+        cache.set(f"c{i}", i, CacheCategory.CATALOG_ASSETS)
+
+    cache.invalidate_category(CacheCategory.SPACES)
+    info = cache.get_cache_info()
+    assert info["categories"] == {"catalog_assets": 5}
+    assert info["stats"]["invalidations"] == 5
+
+
+async def test_cleanup_removes_only_entries_past_their_stale_window():
+    cache = CacheManager()
+    for key in ("dead", "stale", "fresh"):
+        await cache.get_or_refresh(key, CacheCategory.SPACES, Loader())
+    _age(cache, "dead", CacheCategory.SPACES, 901)
+    _age(cache, "stale", CacheCategory.SPACES, 301)
+
+    assert cache.cleanup_expired() == 1
+    assert set(cache._cache) == {"spaces:stale", "spaces:fresh"}
+
+
+def test_cleanup_removes_expired_plain_entries_at_their_ttl():
+    cache = CacheManager()
+    cache.set("k", 1, CacheCategory.TABLE_SCHEMA, ttl=0)
+    cache.set("other", 2, CacheCategory.TABLE_SCHEMA)
+    _age(cache, "k", CacheCategory.TABLE_SCHEMA, 1)
+
+    assert cache.cleanup_expired() == 1
+    assert cache.get_stats()["size"] == 1
+    assert cache._bytes_by_category[CacheCategory.TABLE_SCHEMA] == estimate_size(2)
+
+
+def test_replaced_entry_is_not_swept_by_its_old_expiry():
+    cache = CacheManager()
+    cache.set("k", 1, CacheCategory.TASKS, ttl=0)
+    cache.set("k", 2, CacheCategory.TASKS, ttl=300)
+    assert cache.cleanup_expired() == 0
+    assert cache.get("k", CacheCategory.TASKS) == 2
+
+
+async def test_sweeper_removes_expired_entries_in_background():
+    cache = CacheManager()
+    cache.set("k", 1, CacheCategory.TASKS, ttl=0)
+    await asyncio.sleep(0.01)
+
+    cache.start_sweeper(interval_seconds=0.01)
+    await asyncio.sleep(0.05)
+    await cache.stop_sweeper()
+    assert cache.get_stats()["size"] == 0
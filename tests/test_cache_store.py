@@ -0,0 +1,214 @@
+"""Tests for the persistent (L2) cache store and its CacheManager integration.
+
+Run with:  pytest tests/test_cache_store.py -v
+"""
+
+import os
+import sqlite3
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from mcp import types  # noqa: E402
+
+from cache_manager import CacheCategory, CacheManager  # noqa: E402
+from cache_store import PersistentCacheStore, create_store_from_env  # noqa: E402
+
+
+def _store(tmp_path, namespace="https://tenant.example", **kwargs):
+    return PersistentCacheStore(str(tmp_path / "cache.db"), namespace=namespace, **kwargs)
+
+
+def test_round_trips_json_and_text_content(tmp_path):
+    store = _store(tmp_path)
+    value = [types.TextContent(type="text", text="Found 2 spaces")]
+    assert store.set("spaces:all", value, "spaces", time.time(), 300)
+    assert store.set("catalog_assets:all", [{"name": "SALES", "n": 1}], "catalog_assets", time.time(), 300)
+
+    restored = store.get("spaces:all").value
+    assert isinstance(restored[0], types.TextContent)
+    assert restored[0].text == "Found 2 spaces"
+    assert store.get("catalog_assets:all").value == [{"name": "SALES", "n": 1}]
+
+
+def test_unpersistable_values_are_skipped(tmp_path):
+    store = _store(tmp_path)
+    assert not store.set("k", object(), "table_schema", time.time(), 300)
+    assert store.get("k") is None
+    assert store.get_stats()["skipped"] == 1
+
+
+def test_expired_rows_are_dropped(tmp_path):
+    store = _store(tmp_path)
+    store.set("k", "v", "spaces", time.time() - 1000, ttl_seconds=300, stale_ttl_seconds=600)
+    assert store.get("k") is None
+    assert store.get_stats()["entries"] == 0
+
+
+def test_checksum_mismatch_is_treated_as_miss(tmp_path):
+    store = _store(tmp_path)
+    store.set("k", {"a": 1}, "spaces", time.time(), 300)
+    with sqlite3.connect(store.path) as conn:
+        conn.execute("UPDATE cache_entries SET payload = ? WHERE key = 'k'", (b'{"a":2}',))
+
+    assert store.get("k") is None
+    assert store.get_stats()["checksum_failures"] == 1
+
+
+def test_size_budget_evicts_least_recently_accessed(tmp_path):
+    store = _store(tmp_path, max_bytes=250)
+    store.set("a", "x" * 100, "spaces", time.time(), 300)
+    store.set("b", "y" * 100, "spaces", time.time(), 300)
+    store.get("a")
+    store.set("c", "z" * 100, "spaces", time.time(), 300)
+
+    assert store.get("b") is None
+    assert store.get("a") is not None
+    assert store.get("c") is not None
+
+
+def test_namespaces_are_isolated(tmp_path):
+    _store(tmp_path, namespace="mock").set("k", "mock value", "spaces", time.time(), 300)
+    assert _store(tmp_path, namespace="https://tenant.example").get("k") is None
+
+
+def test_new_cache_manager_is_warm_after_restart(tmp_path):
+    first = CacheManager(persistent_store=_store(tmp_path))
+    first.set("all", [{"id": "SALES"}], CacheCategory.SPACES)
+
+    second = CacheManager(persistent_store=_store(tmp_path))
+    assert second.get("all", CacheCategory.SPACES) == [{"id": "SALES"}]
+    assert second.get_stats()["l2_hits"] == 1
+
+
+async def test_promoted_entry_keeps_original_age(tmp_path):
+    async def load():
+        return "v"
+
+    first = CacheManager(persistent_store=_store(tmp_path))
+    await first.get_or_refresh("all", CacheCategory.SPACES, load)
+    await first.flush_persistent()
+    with sqlite3.connect(str(tmp_path / "cache.db")) as conn:
+        conn.execute("UPDATE cache_entries SET created_at = created_at - 400")
+    # Checksum covers the payload only, so back-dating keeps the row valid
+
+    async def reload():
+        return "new"
+
+    second = CacheManager(persistent_store=_store(tmp_path))
+    # Expired but inside the stale window: served while it is reloaded
+    assert await second.get_or_refresh("all", CacheCategory.SPACES, reload) == "v"
+    assert second.get_stats()["stale_hits"] == 1
+
+
+def test_volatile_categories_are_not_persisted(tmp_path):
+    store = _store(tmp_path)
+    CacheManager(persistent_store=store).set("status", "ok", CacheCategory.TASKS)
+    assert store.get_stats()["entries"] == 0
+
+
+def test_invalidation_reaches_the_store(tmp_path):
+    store = _store(tmp_path)
+    cache = CacheManager(persistent_store=store)
+    cache.set("a", 1, CacheCategory.SPACES)
+    cache.set("b", 2, CacheCategory.CATALOG_ASSETS)
+
+    cache.invalidate_category(CacheCategory.SPACES)
+    assert store.get("spaces:a") is None
+    assert store.get("catalog_assets:b") is not None
+
+    cache.invalidate_all()
+    assert store.get_stats()["entries"] == 0
+
+
+def test_store_errors_do_not_keep_stale_entries_in_memory(tmp_path):
+    store = _store(tmp_path)
+    cache = CacheManager(persistent_store=store)
+    for key in ("a", "b", "c"):
+        cache.set(key, key, CacheCategory.SPACES)
+    store.close()  # every store call now raises sqlite3.ProgrammingError
+
+    cache.invalidate("a", CacheCategory.SPACES)
+    assert cache.get("a", CacheCategory.SPACES) is None
+    cache.invalidate_category(CacheCategory.SPACES)
+    assert cache.get("b", CacheCategory.SPACES) is None
+    cache.set("d", "d", CacheCategory.SPACES)
+    cache.invalidate_all()
+    assert cache.get("d", CacheCategory.SPACES) is None
+    cache.cleanup_expired()
+
+
+def test_oversize_values_are_not_persisted(tmp_path):
+    store = _store(tmp_path)
+    cache = CacheManager(persistent_store=store, max_bytes=1024)
+    cache.set("small", "x", CacheCategory.SPACES)
+    cache.set("big", "y" * 4096, CacheCategory.SPACES)
+    assert store.get("spaces:small") is not None
+    assert store.get("spaces:big") is None
+
+    cache.set("small", "z" * 4096, CacheCategory.SPACES)  # the old value must not come back
+    assert store.get("spaces:small") is None
+    assert cache.get("small", CacheCategory.SPACES) is None
+    assert cache.get_stats()["rejected_oversize"] == 2
+
+
+def test_running_byte_total_tracks_the_table(tmp_path):
+    store = _store(tmp_path)
+    store.set("spaces:a", "x" * 100, "spaces", time.time(), 300)
+    store.set("spaces:a", "x" * 50, "spaces", time.time(), 300)   # replaced
+    store.set("catalog_assets:b", "y" * 70, "catalog_assets", time.time(), 300)
+    store.set("spaces:old", "z", "spaces", time.time() - 1000, 300)
+    store.cleanup_expired()
+    assert store._total_bytes == 52 + 72
+
+    store.delete_category("catalog_assets")
+    assert store._total_bytes == 52
+    store.delete("spaces:a")
+    assert store._total_bytes == 0 == store.get_stats()["size_bytes"]
+
+
+async def test_large_writes_leave_the_event_loop_and_stay_ordered(tmp_path, monkeypatch):
+    store = _store(tmp_path)
+    cache = CacheManager(persistent_store=store)
+    monkeypatch.setattr(CacheManager, "PERSIST_OFFLOAD_BYTES", 1024)
+    snapshot = [{"name": f"ASSET_{i}"} for i in range(100)]
+
+    cache.set("snapshot", snapshot, CacheCategory.CATALOG_ASSETS)
+    assert store.get("catalog_assets:snapshot") is None  # queued on a worker thread
+    cache.invalidate("snapshot", CacheCategory.CATALOG_ASSETS)
+    cache.set("small", 1, CacheCategory.SPACES)
+    # Until the queue drains, the store is not consulted on a miss
+    assert cache.get("snapshot", CacheCategory.CATALOG_ASSETS) is None
+
+    await cache.flush_persistent()
+    assert store.get("catalog_assets:snapshot") is None  # the delete ran after the write
+    assert store.get("spaces:small").value == 1
+
+    cache.set("snapshot", snapshot, CacheCategory.CATALOG_ASSETS)
+    await cache.flush_persistent()
+    assert CacheManager(persistent_store=store).get("snapshot", CacheCategory.CATALOG_ASSETS) == snapshot
+
+
+async def test_cold_reads_in_get_or_refresh_leave_the_event_loop(tmp_path, monkeypatch):
+    snapshot = [{"name": f"ASSET_{i}"} for i in range(100)]
+    CacheManager(persistent_store=_store(tmp_path)).set("snapshot", snapshot, CacheCategory.CATALOG_ASSETS)
+
+    store = _store(tmp_path)
+    read_on = []
+    original_get = store.get
+    monkeypatch.setattr(store, "get", lambda key: read_on.append(threading.get_ident()) or original_get(key))
+
+    async def load():
+        raise AssertionError("served from the persistent store")
+
+    cache = CacheManager(persistent_store=store)
+    assert await cache.get_or_refresh("snapshot", CacheCategory.CATALOG_ASSETS, load) == snapshot
+    assert read_on and threading.get_ident() not in read_on
+    assert cache.get_stats()["l2_hits"] == 1
+
+
+def test_store_is_disabled_without_path(monkeypatch):
+    monkeypatch.delenv("DATASPHERE_CACHE_PERSISTENT_PATH", raising=False)
+    assert create_store_from_env("mock") is None
@@ -0,0 +1,129 @@
+"""Tests for the in-memory catalog search index (catalog_search.py).
+
+Run with:  pytest tests/test_catalog_search.py -v
+"""
+
+import json
+import os
+import sys
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+os.environ.setdefault("USE_MOCK_DATA", "true")
+
+import sap_datasphere_mcp_server as srv  # noqa: E402
+from catalog_search import CatalogSearchIndex, tokenize  # noqa: E402
+from column_index import ColumnIndex  # noqa: E402
+
+ASSETS = [
+    {"name": "SALES_ORDERS", "spaceName": "SALES", "objectType": "View",
+     "label": "Sales Orders", "description": "Orders placed by each customer"},
+    {"name": "CustomerMaster", "spaceName": "MASTER", "objectType": "Table",
+     "label": "Customer Master", "description": "Master data"},
+    {"name": "FIN_TRANSACTIONS", "spaceName": "FINANCE", "objectType": "AnalyticalModel",
+     "label": "Financial Transactions", "description": "Postings per customer account",
+     "businessName": "Ledger"},
+    {"name": "EMPLOYEES", "spaceName": "HR", "objectType": "Table", "label": None},
+]
+
+
+def _names(hits):
+    return [hit.asset["name"] for hit in hits]
+
+
+def test_tokenize_splits_punctuation_and_camel_case():
+    assert tokenize("CustomerMaster SALES_ORDERS") == ["customermaster", "customer", "master", "sales", "orders"]
+
+
+def test_substring_matches_are_kept_and_ranked_by_field():
+    index = CatalogSearchIndex(ASSETS)
+    # The historical rule: query contained in name, label or description
+    expected = {a["name"] for a in ASSETS
+                if any("customer" in (a.get(f) or "").lower() for f in ("name", "label", "description"))}
+    hits = index.search("customer")
+    assert set(_names(hits)) == expected
+    assert _names(hits)[0] == "CustomerMaster"  # name match outranks description matches
+    assert hits[0].fields == ["name", "label"]
+    assert index.search("omer mas")[0].asset["name"] == "CustomerMaster"
+
+
+def test_prefix_and_fuzzy_word_matches():
+    index = CatalogSearchIndex(ASSETS)
+    assert _names(index.search("financ trans")) == ["FIN_TRANSACTIONS"]
+    assert _names(index.search("transactons")) == ["FIN_TRANSACTIONS"]
+    assert index.search("zzz") == []
+
+
+def test_fields_filters_and_empty_query():
+    index = CatalogSearchIndex(ASSETS)
+    assert _names(index.search("ledger")) == []
+    assert _names(index.search("ledger", fields=("name", "businessName", "description"))) == ["FIN_TRANSACTIONS"]
+    assert _names(index.search("customer", filters={"spaceName": ["SALES"]})) == ["SALES_ORDERS"]
+    assert _names(index.search("", filters={"objectType": ["Table"]})) == ["CustomerMaster", "EMPLOYEES"]
+
+
+def test_facets_and_in_place_updates():
+    index = CatalogSearchIndex(ASSETS)
+    doc_ids = [hit.doc_id for hit in index.search("")]
+    assert index.facet_counts(doc_ids, "objectType", 1) == [{"value": "Table", "count": 2}]
+
+    index.remove(index.doc_id("MASTER", "CustomerMaster"))
+    assert len(index) == 3
+    assert "CustomerMaster" not in _names(index.search("customer"))
+    index.add({"name": "CUSTOMERS_V2", "spaceName": "MASTER", "objectType": "View"})
+    assert _names(index.search("customers"))[0] == "CUSTOMERS_V2"
+    assert index.facet_counts(range(10), "spaceName", 10)[-1]["count"] == 1
+
+
+@pytest.fixture
+def listing(monkeypatch):
+    """Serve ASSETS as the cached catalog listing, counting index builds."""
+    assets = [dict(asset) for asset in ASSETS]
+    builds = []
+
+    async def snapshot():
+        return {"assets": assets, "complete": True, "fetched_at": time.time()}
+
+    class CountingIndex(CatalogSearchIndex):
+        def __init__(self, *args, **kwargs):
+            builds.append(1)
+            super().__init__(*args, **kwargs)
+
+    monkeypatch.setattr(srv, "_get_catalog_snapshot", snapshot)
+    monkeypatch.setattr(srv, "CatalogSearchIndex", CountingIndex)
+    monkeypatch.setattr(srv, "_catalog_search_index", None)
+    monkeypatch.setattr(srv, "column_index", ColumnIndex())
+    monkeypatch.setattr(srv, "_schedule_column_index_refresh", lambda: None)
+    monkeypatch.setattr(srv, "datasphere_connector", object())
+    monkeypatch.setitem(srv.DATASPHERE_CONFIG, "use_mock_data", False)
+    return assets, builds
+
+
+async def _call(name, arguments, prefix=""):
+    result = await srv._execute_tool(name, arguments)
+    return json.loads(result[0].text[len(prefix):])
+
+
+async def test_search_catalog_ranks_facets_and_leaves_listing_untouched(listing):
+    assets, builds = listing
+    payload = await _call("search_catalog", {"query": "customer", "include_why_found": True,
+                                             "facets": "objectType", "include_count": True},
+                          prefix="Catalog Search Results:\n\n")
+
+    assert [a["name"] for a in payload["value"]][0] == "CustomerMaster"
+    assert payload["count"] == 3
+    assert payload["value"][0]["_whyFound"].startswith("name: 'CustomerMaster'")
+    assert {f["value"]: f["count"] for f in payload["facets"]["objectType"]} == {
+        "Table": 1, "View": 1, "AnalyticalModel": 1}
+    assert all("_whyFound" not in asset for asset in assets)
+
+    await _call("search_tables", {"search_term": "orders", "space_id": "SALES"})
+    assert len(builds) == 1  # one index per listing
+
+
+async def test_search_repository_filters_by_type_and_space(listing):
+    payload = await _call("search_repository", {"search_terms": "customer", "object_types": ["View", "Table"]},
+                          prefix="Repository Search Results:\n\n")
+    assert [o["name"] for o in payload["objects"]] == ["CustomerMaster", "SALES_ORDERS"]
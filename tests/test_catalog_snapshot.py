@@ -0,0 +1,208 @@
+"""Tests for the paged catalog crawl (catalog_snapshot.py).
+
+Run with:  pytest tests/test_catalog_snapshot.py -v
+"""
+
+import asyncio
+import json
+import os
+import random
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+os.environ.setdefault("USE_MOCK_DATA", "true")
+
+import catalog_snapshot  # noqa: E402
+import sap_datasphere_mcp_server as srv  # noqa: E402
+from cache_manager import CacheManager  # noqa: E402
+from column_index import ColumnIndex  # noqa: E402
+
+
+class FilterRejected(Exception):
+    status = 400
+
+
+class Listing:
+    """/catalog/assets with ``total`` assets, answering pages in random order."""
+
+    def __init__(self, total, report_count=False, fail_at_skip=None, supports_filter=False):
+        self.assets = [{"name": f"ASSET_{i:05d}", "spaceName": f"S{i % 3}",
+                        "modifiedAt": "2024-01-01T00:00:00Z" if i == 0 else "2023-12-31T00:00:00Z"}
+                       for i in range(total)]
+        self.report_count = report_count
+        self.fail_at_skip = fail_at_skip
+        self.supports_filter = supports_filter
+        self.requests = []
+        self.in_flight = 0
+        self.peak_in_flight = 0
+
+    async def fetch_page(self, skip, top, filter_expr=None):
+        self.requests.append((skip, filter_expr) if filter_expr else skip)
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(random.uniform(0, 0.005))
+        finally:
+            self.in_flight -= 1
+        if skip == self.fail_at_skip:
+            raise RuntimeError("HTTP 500")
+        rows = self.assets
+        if filter_expr:
+            if not self.supports_filter:
+                raise FilterRejected("400, message='Bad Request'")
+            field, op, mark = filter_expr.split(" ")
+            assert (field, op) == ("modifiedAt", "ge")
+            rows = [asset for asset in rows if asset["modifiedAt"] >= mark]
+        body = {"value": rows[skip:skip + top]}
+        if self.report_count:
+            body["@odata.count"] = len(self.assets)
+        return body
+
+    # DatasphereAuthConnector.get, for the server-level tests
+    async def get(self, endpoint, params=None):
+        return await self.fetch_page(params["$skip"], params["$top"], params.get("$filter"))
+
+
+async def test_crawl_collects_every_page_in_order_within_the_bound():
+    listing = Listing(1234)
+    pages = []
+    snapshot = await catalog_snapshot.crawl_catalog(listing.fetch_page, page_size=100, concurrency=3,
+                                                    on_page=pages.append)
+
+    assert snapshot["assets"] == listing.assets
+    assert [asset for page in pages for asset in page] == listing.assets
+    assert snapshot["complete"] and snapshot["error"] is None
+    assert snapshot["pages"] == 13
+    assert 1 < listing.peak_in_flight <= 3
+
+
+async def test_reported_count_avoids_probing_past_the_end():
+    listing = Listing(1000, report_count=True)
+    snapshot = await catalog_snapshot.crawl_catalog(listing.fetch_page, page_size=100, concurrency=4)
+    assert snapshot["complete"] and snapshot["reported_total"] == 1000
+    assert sorted(listing.requests) == list(range(0, 1000, 100))
+
+
+async def test_failed_page_keeps_the_prefix_and_marks_incomplete():
+    listing = Listing(1000, fail_at_skip=300)
+    snapshot = await catalog_snapshot.crawl_catalog(listing.fetch_page, page_size=100, concurrency=2)
+    assert not snapshot["complete"]
+    assert "HTTP 500" in snapshot["error"]
+    assert snapshot["assets"] == listing.assets[:300]
+    assert "incomplete" in catalog_snapshot.coverage(snapshot)["warning"]
+
+
+async def test_page_limit_and_ignored_skip_are_reported():
+    snapshot = await catalog_snapshot.crawl_catalog(Listing(1000).fetch_page, page_size=100, max_pages=3)
+    assert not snapshot["complete"] and len(snapshot["assets"]) == 300
+
+    async def ignores_skip(skip, top, filter_expr=None):
+        return {"value": [{"name": f"A{i}", "spaceName": "S"} for i in range(top)]}
+
+    snapshot = await catalog_snapshot.crawl_catalog(ignores_skip, page_size=10)
+    assert not snapshot["complete"] and "$skip" in snapshot["error"]
+    assert len(snapshot["assets"]) == 10
+
+
+async def test_first_page_failure_is_raised():
+    with pytest.raises(RuntimeError):
+        await catalog_snapshot.crawl_catalog(Listing(10, fail_at_skip=0).fetch_page)
+
+
+@pytest.fixture
+def tenant(monkeypatch):
+    def install(listing):
+        monkeypatch.setattr(srv, "datasphere_connector", listing)
+        monkeypatch.setattr(srv, "cache_manager", CacheManager())
+        monkeypatch.setattr(srv, "_catalog_search_index", None)
+        monkeypatch.setattr(srv, "column_index", ColumnIndex())
+        monkeypatch.setattr(srv, "_schedule_column_index_refresh", lambda: None)
+        monkeypatch.setattr(srv, "CATALOG_PAGE_SIZE", 100)
+        monkeypatch.setitem(srv.DATASPHERE_CONFIG, "use_mock_data", False)
+        return listing
+    return install
+
+
+async def test_search_sees_assets_beyond_the_first_page(tenant):
+    listing = tenant(Listing(750))
+    result = await srv._execute_tool("search_tables", {"search_term": "ASSET_0074"})
+    payload = json.loads(result[0].text)
+
+    assert [a["name"] for a in payload["results"]][:1] == ["ASSET_00740"]
+    assert payload["catalog_snapshot"]["assets"] == 750
+    assert payload["catalog_snapshot"]["complete"] is True
+    # The index was built during the crawl, not rebuilt afterwards
+    assert srv._catalog_search_index.is_built_from(srv.cache_manager.peek(
+        "catalog_snapshot", srv.CacheCategory.CATALOG_ASSETS)["assets"])
+    # 8 pages, plus at most one window of probes past the short last page
+    assert 8 <= len(listing.requests) < 8 + srv.CATALOG_CRAWL_CONCURRENCY
+
+
+def _expire_snapshot():
+    """Back-date the cached snapshot past its TTL (it stays servable stale)."""
+    cache = srv.cache_manager
+    entry = cache._cache[cache._make_cache_key("catalog_snapshot", srv.CacheCategory.CATALOG_ASSETS)]
+    entry.created_at -= entry.ttl_seconds + 1
+    cache._rebuild_expiry_heap()
+
+
+async def test_incomplete_crawl_keeps_the_last_complete_snapshot(tenant):
+    tenant(Listing(300))
+    first = await srv._get_catalog_snapshot()
+    srv.datasphere_connector = Listing(300, fail_at_skip=200)
+    _expire_snapshot()
+
+    assert await srv._get_catalog_snapshot() is first  # stale: refreshed in the background
+    await asyncio.gather(*srv.cache_manager._refresh_tasks.values(), return_exceptions=True)
+
+    assert srv.cache_manager.peek("catalog_snapshot", srv.CacheCategory.CATALOG_ASSETS) is first
+    assert srv.cache_manager.get_stats()["refresh_failures"] == 1
+
+
+async def _expire_and_refresh():
+    """Let the cached snapshot expire and wait for its background refresh."""
+    _expire_snapshot()
+    await srv._get_catalog_snapshot()
+    await asyncio.gather(*srv.cache_manager._refresh_tasks.values())
+    return await srv._get_catalog_snapshot()
+
+
+async def test_delta_sync_requests_only_modified_assets_and_patches_in_place(tenant):
+    listing = tenant(Listing(300, supports_filter=True))
+    snapshot = await srv._get_catalog_snapshot()
+    assets, index = snapshot["assets"], srv._catalog_search_index_for(snapshot)
+
+    listing.assets[5] = {**listing.assets[5], "label": "Revenue Forecast", "modifiedAt": "2024-02-01T00:00:00Z"}
+    listing.assets.append({"name": "NEW_ASSET", "spaceName": "S1", "modifiedAt": "2024-02-02T00:00:00Z"})
+    listing.requests.clear()
+
+    synced = await _expire_and_refresh()
+
+    assert synced is snapshot and synced["assets"] is assets
+    assert listing.requests == [(0, "modifiedAt ge 2024-01-01T00:00:00Z")]
+    assert len(assets) == 301 and assets[5]["label"] == "Revenue Forecast"
+    assert synced["high_water_mark"] == "2024-02-02T00:00:00Z"
+    assert synced["last_sync"] == {"mode": "modified_filter", "changed": 3, "removed": 0, "pages": 1}
+    assert srv._catalog_search_index_for(synced) is index
+    assert [hit.asset["name"] for hit in index.search("forecast")] == ["ASSET_00005"]
+    assert [hit.asset["name"] for hit in index.search("NEW_ASSET")] == ["NEW_ASSET"]
+
+
+async def test_rejected_filter_falls_back_to_space_hashes(tenant):
+    listing = tenant(Listing(30))
+    snapshot = await srv._get_catalog_snapshot()
+    untouched = snapshot["assets"][2]  # space S2
+    index = srv._catalog_search_index_for(snapshot)
+
+    del listing.assets[0]  # ASSET_00000, space S0
+    listing.assets[0] = {**listing.assets[0], "description": "renamed"}  # ASSET_00001, space S1
+    synced = await _expire_and_refresh()
+
+    assert synced is snapshot and synced["delta_mode"] == "space_hash"
+    assert synced["last_sync"]["changed"] == 1 and synced["last_sync"]["removed"] == 1
+    assert [asset["name"] for asset in synced["assets"]] == [asset["name"] for asset in listing.assets]
+    assert untouched in synced["assets"] and any(a is untouched for a in synced["assets"])
+    assert "ASSET_00000" not in [hit.asset["name"] for hit in index.search("ASSET_00000")]
+    assert [hit.asset["name"] for hit in index.search("renamed")] == ["ASSET_00001"]
@@ -0,0 +1,121 @@
+"""Tests for the tenant-wide column inverted index (column_index.py).
+
+Run with:  pytest tests/test_column_index.py -v
+"""
+
+import json
+import os
+import stat
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from column_index import ColumnIndex, normalize_column  # noqa: E402
+from metadata_schema import AssetSchema, EntitySchema, PropertySchema  # noqa: E402
+
+
+def _schema(space, asset, *columns, fetched_at=1.0):
+    props = [PropertySchema(name=name, type=data_type) for name, data_type in columns]
+    return AssetSchema(space_id=space, asset_id=asset, kind="relational",
+                       entities=[EntitySchema(name=asset, properties=props)], fetched_at=fetched_at)
+
+
+def _index():
+    index = ColumnIndex(namespace="https://tenant.example")
+    index.add_schema(_schema("S1", "ORDERS", ("ORDER_ID", "Edm.String"), ("CustomerId", "Edm.String")), "View")
+    index.add_schema(_schema("S2", "CUSTOMERS", ("CUSTOMER_ID", "Edm.Int32"), ("NAME", "Edm.String")), "Table")
+    return index
+
+
+def test_normalize_column_ignores_case_and_separators():
+    assert normalize_column("customer_id") == normalize_column("CustomerID") == "CUSTOMERID"
+
+
+def test_find_by_name_type_and_normalised_form():
+    index = _index()
+    assert [h["asset_name"] for h in index.find("customer_id")] == ["CUSTOMERS"]
+    assert index.find("customer_id", case_sensitive=True) == []
+    assert [h["asset_name"] for h in index.find("customer_id", normalized=True)] == ["ORDERS", "CUSTOMERS"]
+    assert index.find("CUSTOMER_ID", data_type="Edm.String") == []
+    hit = index.find("NAME", space_id="S2")[0]
+    assert hit == {"space_id": "S2", "asset_name": "CUSTOMERS", "asset_type": "Table", "entity": "CUSTOMERS",
+                   "column_name": "NAME", "column_type": "Edm.String", "total_columns": 2}
+
+
+def test_reindexing_replaces_postings():
+    index = _index()
+    index.add_schema(_schema("S2", "CUSTOMERS", ("CUST_NO", "Edm.String"), fetched_at=2.0))
+    assert index.find("CUSTOMER_ID") == []
+    assert index.find("CUST_NO")[0]["asset_type"] == "Table"  # type survives re-indexing
+    assert "CUSTOMER_ID" not in index._by_name
+
+
+def test_same_fetch_is_not_reindexed():
+    index = _index()
+    assert index.add_schema(_schema("S1", "ORDERS", ("OTHER", "Edm.String"))) is False
+    assert index.find("ORDER_ID")
+
+
+def test_match_columns_scans_the_vocabulary():
+    index = _index()
+    assert index.match_columns("customer") == {("S1", "ORDERS"): ["CustomerId"],
+                                               ("S2", "CUSTOMERS"): ["CUSTOMER_ID"]}
+    assert index.match_columns("customer", space_id="S1") == {("S1", "ORDERS"): ["CustomerId"]}
+    assert index.match_columns("--") == {}
+
+
+def test_retain_drops_vanished_assets_and_spaces():
+    index = _index()
+    assert index.retain_assets("S1", []) == 1
+    assert index.retain_spaces(["S1"]) == 1
+    assert len(index) == 0 and index._by_type == {}
+
+
+def test_completeness_is_time_and_space_bound():
+    index = _index()
+    assert not index.is_complete(60)
+    index.mark_complete(["S1", "S2"])
+    assert index.is_complete(60) and index.is_complete(60, "S2")
+    assert not index.is_complete(60, "S3")
+    index.complete_at -= 120
+    assert not index.is_complete(60)
+
+
+def test_partial_crawl_is_not_complete_tenant_wide():
+    index = _index()
+    index.mark_complete(["S1"], tenant_space_ids=["S1", "S2"])
+    assert index.is_complete(60, "S1")
+    assert not index.is_complete(60) and not index.is_complete(60, "S2")
+
+
+def test_persistence_round_trip_is_private_and_namespaced(tmp_path):
+    path = str(tmp_path / "index" / "columns.json")
+    index = _index()
+    index.path = path
+    index.mark_complete(["S1", "S2"])
+    assert index.save()
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o600
+
+    loaded = ColumnIndex.load(path, namespace="https://tenant.example")
+    assert loaded.to_dict() == index.to_dict()
+    assert loaded.find("NAME")[0]["asset_type"] == "Table"
+
+    assert len(ColumnIndex.load(path, namespace="https://other.example")) == 0
+
+
+async def test_save_async_writes_the_same_file(tmp_path):
+    index = _index()
+    index.path = str(tmp_path / "columns.json")
+    index.mark_complete(["S1"], tenant_space_ids=["S1", "S2"])
+    assert await index.save_async()
+    loaded = ColumnIndex.load(index.path, namespace="https://tenant.example")
+    assert loaded.to_dict() == index.to_dict()
+    assert loaded.is_complete(60, "S1") and not loaded.is_complete(60)
+
+
+def test_unreadable_file_starts_empty(tmp_path):
+    path = tmp_path / "columns.json"
+    path.write_text(json.dumps({"version": 1, "namespace": "", "assets": [["S", "A"]]}))
+    index = ColumnIndex.load(str(path))
+    assert len(index) == 0
+    assert index.path == str(path)
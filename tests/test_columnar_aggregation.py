@@ -0,0 +1,204 @@
+"""Tests for the columnar client-side aggregation used by smart_query.
+
+Run with:  pytest tests/test_columnar_aggregation.py -v
+"""
+
+import os
+import random
+import sys
+import time
+from collections import defaultdict
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from columnar_aggregation import (  # noqa: E402
+    UnsupportedAggregation,
+    aggregate_rows,
+    aggregate_sql,
+    parse_aggregation_query,
+)
+
+ROWS = [
+    {"REGION": "EU", "PRODUCT": "A", "AMOUNT": 10, "QTY": 1},
+    {"REGION": "US", "PRODUCT": "A", "AMOUNT": 5, "QTY": None},
+    {"REGION": "EU", "PRODUCT": "B", "AMOUNT": "2.5", "QTY": 3},
+    {"REGION": "APJ", "PRODUCT": "B", "AMOUNT": None, "QTY": 4},
+    {"REGION": "US", "PRODUCT": "B", "AMOUNT": 7, "QTY": 2},
+]
+
+
+def test_simple_aggregation_returns_one_row_with_legacy_names():
+    result = aggregate_sql(ROWS, "SELECT COUNT(*), COUNT(QTY), SUM(AMOUNT), AVG(AMOUNT), "
+                                 "MIN(QTY), MAX(QTY) FROM SALES")
+    assert result == [{
+        "COUNT_ALL": 5, "COUNT_QTY": 4, "SUM_AMOUNT": 24.5,
+        "AVG_AMOUNT": 24.5 / 4, "MIN_QTY": 1, "MAX_QTY": 4,
+    }]
+
+
+def test_empty_input_keeps_legacy_defaults():
+    assert aggregate_sql([], "SELECT COUNT(*), SUM(A), AVG(A), MIN(A) FROM T") == [
+        {"COUNT_ALL": 0, "SUM_A": 0, "AVG_A": 0, "MIN_A": None}
+    ]
+    assert aggregate_sql([], "SELECT R, COUNT(*) FROM T GROUP BY R") == []
+
+
+def test_group_by_keeps_first_seen_order_and_aliases():
+    result = aggregate_sql(ROWS, "SELECT REGION, SUM(AMOUNT) AS total, COUNT(*) FROM SALES GROUP BY REGION")
+    assert result == [
+        {"REGION": "EU", "total": 12.5, "COUNT_*": 2},
+        {"REGION": "US", "total": 12.0, "COUNT_*": 2},
+        {"REGION": "APJ", "total": 0, "COUNT_*": 1},
+    ]
+
+
+def test_multi_column_group_by():
+    result = aggregate_sql(ROWS, "SELECT REGION, PRODUCT, MAX(AMOUNT) FROM SALES GROUP BY REGION, PRODUCT")
+    assert len(result) == 5
+    assert result[0] == {"REGION": "EU", "PRODUCT": "A", "MAX_AMOUNT": 10}
+
+
+def test_group_keys_compare_as_strings():
+    rows = [{"K": 1, "V": 1}, {"K": "1", "V": 2}]
+    assert aggregate_sql(rows, "SELECT K, SUM(V) FROM T GROUP BY K") == [{"K": 1, "SUM_V": 3.0}]
+
+
+def test_having_filters_groups_including_unselected_aggregates():
+    result = aggregate_sql(
+        ROWS, "SELECT REGION, COUNT(*) AS n FROM SALES GROUP BY REGION HAVING SUM(AMOUNT) > 12 AND n >= 2"
+    )
+    assert result == [{"REGION": "EU", "n": 2}]
+
+
+def test_having_or_and_string_literals():
+    result = aggregate_sql(
+        ROWS, "SELECT REGION, COUNT(*) AS n FROM SALES GROUP BY REGION HAVING REGION = 'APJ' OR n > 1"
+    )
+    assert [r["REGION"] for r in result] == ["EU", "US", "APJ"]
+
+
+def test_having_that_filters_everything_is_not_a_failure():
+    assert aggregate_sql(ROWS, "SELECT REGION, COUNT(*) FROM SALES GROUP BY REGION HAVING COUNT(*) > 9") == []
+
+
+def test_order_by_alias_expression_and_position():
+    base = "SELECT REGION, MAX(QTY) AS qty FROM SALES GROUP BY REGION ORDER BY "
+    assert [r["REGION"] for r in aggregate_sql(ROWS, base + "qty DESC")] == ["APJ", "EU", "US"]
+    assert [r["REGION"] for r in aggregate_sql(ROWS, base + "MAX(QTY)")] == ["US", "EU", "APJ"]
+    assert [r["REGION"] for r in aggregate_sql(ROWS, base + "1 ASC LIMIT 10")] == ["APJ", "EU", "US"]
+
+
+def test_order_by_position_follows_the_select_list():
+    result = aggregate_sql(ROWS, "SELECT SUM(AMOUNT) AS total, REGION FROM SALES "
+                                 "GROUP BY REGION ORDER BY 1 DESC")
+    assert [r["REGION"] for r in result] == ["EU", "US", "APJ"]
+    result = aggregate_sql(ROWS, "SELECT SUM(AMOUNT) AS total, region FROM SALES "
+                                 "GROUP BY REGION ORDER BY 2 DESC")
+    assert [r["REGION"] for r in result] == ["US", "EU", "APJ"]
+
+
+def test_order_by_puts_nulls_last():
+    result = aggregate_sql(ROWS, "SELECT PRODUCT, REGION, MIN(AMOUNT) AS m FROM SALES "
+                                 "GROUP BY PRODUCT, REGION ORDER BY m DESC")
+    assert [r["m"] for r in result] == [10, 7, 5, "2.5", None]
+
+
+def test_unsupported_clauses_fall_back_to_raw_data():
+    assert aggregate_sql(ROWS, "SELECT * FROM SALES") is None
+    assert aggregate_sql(ROWS, "SELECT REGION, COUNT(*) FROM SALES GROUP BY REGION "
+                               "HAVING (COUNT(*) > 1 OR SUM(QTY) > 3)") is None
+    query = parse_aggregation_query("SELECT REGION, COUNT(*) FROM SALES GROUP BY REGION ORDER BY NOPE")
+    with pytest.raises(UnsupportedAggregation):
+        aggregate_rows(ROWS, query)
+
+
+def test_parse_extracts_clauses():
+    query = parse_aggregation_query(
+        "SELECT REGION, AVG(AMOUNT) AS avg_amount FROM SALES GROUP BY REGION HAVING COUNT(*) > 1 "
+        "ORDER BY avg_amount DESC LIMIT 5"
+    )
+    assert query.group_by == ["REGION"]
+    assert [a.output for a in query.aggregates] == ["avg_amount"]
+    assert query.having == "COUNT(*) > 1"
+    assert query.order_by == "avg_amount DESC"
+
+
+# ---------------------------------------------------------------------------
+# Regression against the row-at-a-time implementation this engine replaced
+# ---------------------------------------------------------------------------
+
+def _legacy_reduce(rows, func, column):
+    if func == "COUNT":
+        return len(rows) if column == "*" else sum(1 for row in rows if row.get(column) is not None)
+    values = [row.get(column) for row in rows if row.get(column) is not None]
+    if func == "SUM":
+        return sum(float(v) for v in values) if values else 0
+    if func == "AVG":
+        return (sum(float(v) for v in values) / len(values)) if values else 0
+    if func == "MIN":
+        return min(values) if values else None
+    return max(values) if values else None
+
+
+def _legacy_aggregate(rows, sql):
+    """The previous smart_query aggregation, minus its regex parsing"""
+    query = parse_aggregation_query(sql)
+    calls = [(a.func, a.column, a.output) for a in query.aggregates]
+    if not query.group_by:
+        return [{output: _legacy_reduce(rows, func, column) for func, column, output in calls}]
+    groups = defaultdict(list)
+    for row in rows:
+        groups[tuple(str(row.get(col, '')) for col in query.group_by)].append(row)
+    results = []
+    for members in groups.values():
+        result = {col: members[0].get(col) for col in query.group_by}
+        for func, column, output in calls:
+            result[output] = _legacy_reduce(members, func, column)
+        results.append(result)
+    return results
+
+
+SHAPES = {
+    "two_column_group": "SELECT REGION, PRODUCT, SUM(AMOUNT), COUNT(*) FROM T GROUP BY REGION, PRODUCT",
+    "no_group": "SELECT COUNT(*), SUM(AMOUNT), AVG(AMOUNT), MAX(QTY) FROM T",
+    "one_column_four_aggregates": "SELECT REGION, COUNT(*), SUM(AMOUNT), AVG(AMOUNT), MAX(QTY) "
+                                  "FROM T GROUP BY REGION",
+}
+
+
+@pytest.fixture(scope="module")
+def fetched_rows():
+    rng = random.Random(7)
+    return [
+        {
+            "REGION": rng.choice(["EU", "US", "APJ", "LATAM"]),
+            "PRODUCT": f"P{rng.randrange(50)}",
+            "AMOUNT": rng.random() * 100 if rng.random() > 0.05 else None,
+            "QTY": rng.randrange(10),
+        }
+        for _ in range(50000)
+    ]
+
+
+def _best_ms(func, runs=5):
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings) * 1000
+
+
+@pytest.mark.parametrize("shape", SHAPES)
+def test_results_match_the_previous_implementation(fetched_rows, shape):
+    assert aggregate_sql(fetched_rows, SHAPES[shape]) == _legacy_aggregate(fetched_rows, SHAPES[shape])
+
+
+@pytest.mark.parametrize("shape", SHAPES)
+def test_faster_than_the_previous_implementation(fetched_rows, shape):
+    sql = SHAPES[shape]
+    legacy_ms = _best_ms(lambda: _legacy_aggregate(fetched_rows, sql))
+    columnar_ms = _best_ms(lambda: aggregate_sql(fetched_rows, sql))
+    assert columnar_ms < legacy_ms, f"{shape}: {columnar_ms:.1f} ms vs {legacy_ms:.1f} ms before"
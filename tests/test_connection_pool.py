@@ -0,0 +1,139 @@
+"""Tests for the shared keep-alive connection pool of the Datasphere connector.
+
+Requests go to a local aiohttp test server, so no tenant is needed.
+
+Run with:  pytest tests/test_connection_pool.py -v
+"""
+
+import asyncio
+import os
+import sys
+from types import SimpleNamespace
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from auth.datasphere_auth_connector import (  # noqa: E402
+    ConnectionPoolConfig,
+    DatasphereAuthConnector,
+    DatasphereConfig,
+)
+from telemetry import TelemetryManager  # noqa: E402
+
+POOL_ENV = {
+    "DATASPHERE_HTTP_MAX_CONNECTIONS": "8",
+    "DATASPHERE_HTTP_MAX_CONNECTIONS_PER_HOST": "4",
+    "DATASPHERE_HTTP_KEEPALIVE_SECONDS": "12.5",
+    "DATASPHERE_HTTP_DNS_CACHE_TTL": "0",
+    "DATASPHERE_HTTP_COALESCE_GETS": "FALSE",
+}
+
+
+class StaticTokenHandler:
+    """OAuth handler stand-in that always hands out the same token."""
+
+    async def get_token(self, force_refresh=False):
+        return SimpleNamespace(authorization="Bearer test", access_token="test")
+
+    async def revoke_token(self):
+        pass
+
+    async def close(self):
+        pass
+
+
+def _connector(base_url="https://tenant.example", telemetry=None, **pool):
+    config = DatasphereConfig(
+        base_url=base_url,
+        client_id="client",
+        client_secret="secret",
+        token_url=f"{base_url}/oauth/token",
+        tenant_id="tenant",
+        pool=ConnectionPoolConfig(**pool),
+    )
+    return DatasphereAuthConnector(config, StaticTokenHandler(), telemetry_manager=telemetry)
+
+
+@pytest.fixture
+async def upstream():
+    async def spaces(request):
+        await asyncio.sleep(float(request.query.get("delay", 0)))
+        return web.json_response({"value": [{"name": "SALES"}]})
+
+    app = web.Application()
+    app.router.add_get("/api/spaces", spaces)
+    server = TestServer(app)
+    await server.start_server()
+    yield str(server.make_url("")).rstrip("/")
+    await server.close()
+
+
+def test_pool_config_defaults_when_env_unset(monkeypatch):
+    for name in POOL_ENV:
+        monkeypatch.delenv(name, raising=False)
+    assert ConnectionPoolConfig.from_env() == ConnectionPoolConfig()
+
+
+def test_pool_config_reads_env(monkeypatch):
+    for name, value in POOL_ENV.items():
+        monkeypatch.setenv(name, value)
+    assert ConnectionPoolConfig.from_env() == ConnectionPoolConfig(
+        max_connections=8,
+        max_connections_per_host=4,
+        keepalive_timeout=12.5,
+        dns_cache_ttl=0,
+        coalesce_gets=False,
+    )
+
+
+async def test_session_is_shared_until_closed():
+    connector = _connector()
+    session = connector._ensure_session()
+    assert connector._ensure_session() is session
+
+    await connector.close()
+    assert session.closed
+    assert connector.get_pool_stats()["in_use"] == 0
+
+    replacement = connector._ensure_session()
+    assert replacement is not session and not replacement.closed
+    await connector.close()
+
+
+async def test_sequential_requests_reuse_one_connection(upstream):
+    telemetry = TelemetryManager()
+    connector = _connector(upstream, telemetry)
+    try:
+        for _ in range(3):
+            assert await connector._make_request("GET", "/api/spaces") == {"value": [{"name": "SALES"}]}
+
+        stats = connector.get_pool_stats()
+        assert (stats["connections_created"], stats["connections_reused"]) == (1, 2)
+        assert stats["in_use"] == 0
+
+        reported = telemetry.get_connection_pool_stats()
+        assert (reported["connections_created"], reported["connections_reused"]) == (1, 2)
+        assert reported["limit"] == ConnectionPoolConfig().max_connections
+    finally:
+        await connector.close()
+
+
+async def test_requests_waiting_for_the_pool_are_reported(upstream):
+    telemetry = TelemetryManager()
+    connector = _connector(upstream, telemetry, max_connections=1, max_connections_per_host=1)
+    try:
+        await asyncio.gather(*[
+            connector._make_request("GET", "/api/spaces", params={"delay": "0.05"})
+            for _ in range(2)
+        ])
+
+        reported = telemetry.get_connection_pool_stats()
+        assert reported["queued_requests"] == 1
+        assert reported["max_wait_ms"] > 0
+        assert reported["in_use_peak"] == 1
+        assert connector.get_pool_stats()["in_use"] == 0
+    finally:
+        await connector.close()
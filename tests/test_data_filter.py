@@ -0,0 +1,64 @@
+"""Tests for the copy-on-write DataFilter.
+
+Run with:  pytest tests/test_data_filter.py -v
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from mcp import types  # noqa: E402
+
+from auth.data_filter import DataFilter  # noqa: E402
+
+
+@pytest.fixture
+def data_filter():
+    return DataFilter()
+
+
+def test_clean_payload_is_returned_without_copying(data_filter):
+    payload = {"rows": [{"NAME": "Alice", "AMOUNT": 10}], "count": 1}
+    assert data_filter.filter_response(payload) is payload
+
+
+def test_text_content_passes_through_untouched(data_filter):
+    result = [types.TextContent(type="text", text="x" * 100_000)]
+    assert data_filter.filter_response(result) is result
+
+
+def test_only_the_changed_path_is_copied(data_filter):
+    clean = {"NAME": "Alice"}
+    payload = {"rows": [clean, {"password": "hunter2"}], "meta": {"count": 2}}
+
+    filtered = data_filter.filter_response(payload)
+
+    assert filtered["rows"][1] == {"password": "***REDACTED_CREDENTIAL***"}
+    assert filtered["rows"][0] is clean
+    assert filtered["meta"] is payload["meta"]
+    assert payload["rows"][1] == {"password": "hunter2"}
+
+
+def test_value_patterns_keep_their_precedence(data_filter):
+    jwt = "eyJ" + "a" * 12 + "." + "b" * 12 + "." + "c" * 12
+    filtered = data_filter.filter_response({"note": f"see {jwt} and jdbc://db:1/x"})
+    assert filtered["note"] == "see JWT_TOKEN_REDACTED and CONNECTION_STRING_REDACTED"
+
+
+def test_field_verdicts_are_cached(data_filter, monkeypatch):
+    monkeypatch.setattr(DataFilter, "FIELD_VERDICT_CACHE_SIZE", 2)
+    assert data_filter._is_sensitive_field("client_secret")
+    assert not data_filter._is_sensitive_field("REGION")
+    assert data_filter._field_verdicts == {"client_secret": True, "REGION": False}
+    data_filter._is_sensitive_field("AMOUNT")
+    assert data_filter._field_verdicts == {"AMOUNT": False}
+
+
+def test_filter_connection_info_does_not_modify_the_input(data_filter):
+    connection = {"host": "db.example.com", "username": "admin", "port": 443}
+    filtered = data_filter.filter_connection_info(connection)
+    assert filtered == {"host": "*****.example.com", "username": "***REDACTED***", "port": 443}
+    assert connection["username"] == "admin"
@@ -0,0 +1,215 @@
+"""Tests for find_assets_by_column: the concurrent scan and the column index.
+
+Run with:  pytest tests/test_find_assets_by_column.py -v
+"""
+
+import asyncio
+import json
+import os
+import sys
+import time
+from types import SimpleNamespace
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+os.environ.setdefault("USE_MOCK_DATA", "true")
+
+import sap_datasphere_mcp_server as srv  # noqa: E402
+from cache_manager import CacheManager  # noqa: E402
+from column_index import ColumnIndex  # noqa: E402
+
+METADATA_TEMPLATE = """<?xml version="1.0" encoding="utf-8"?>
+<edmx:Edmx xmlns:edmx="http://docs.oasis-open.org/odata/ns/edmx" Version="4.0">
+  <edmx:DataServices>
+    <Schema xmlns="http://docs.oasis-open.org/odata/ns/edm" Namespace="ns">
+      <EntityType Name="E">{properties}</EntityType>
+    </Schema>
+  </edmx:DataServices>
+</edmx:Edmx>"""
+
+
+def _metadata(*columns):
+    properties = "".join(f'<Property Name="{name}" Type="Edm.String"/>' for name in columns)
+    return METADATA_TEMPLATE.format(properties=properties)
+
+
+class TenantStub:
+    """Two spaces of assets; every $metadata request takes a few milliseconds."""
+
+    def __init__(self, assets_per_space=6, matching=lambda asset: True, column="customer_id"):
+        self.spaces = {"S1": [f"S1_A{i}" for i in range(assets_per_space)],
+                       "S2": [f"S2_A{i}" for i in range(assets_per_space)]}
+        self.matching = matching
+        self.column = column
+        self.metadata_calls = []
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.config = SimpleNamespace(base_url="https://tenant.example")
+
+    async def get(self, endpoint, params=None):
+        if endpoint.endswith("/catalog/spaces"):
+            return {"value": [{"id": space} for space in self.spaces]}
+        space = endpoint.split("/spaces/")[1].split("/")[0]
+        return {"value": [{"name": asset, "type": "View"} for asset in self.spaces[space]]}
+
+    async def fetch_text_conditional(self, endpoint, etag=None, accept="application/xml", timeout=30):
+        asset = endpoint.split("/")[-2]
+        self.metadata_calls.append(asset)
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(0.01)
+        finally:
+            self.in_flight -= 1
+        columns = ("ID", self.column) if self.matching(asset) else ("ID",)
+        return 200, _metadata(*columns), None
+
+
+@pytest.fixture
+def tenant(monkeypatch):
+    """Install a stub tenant with an empty column index and no background crawl."""
+    def install(**kwargs):
+        stub = TenantStub(**kwargs)
+        monkeypatch.setattr(srv, "datasphere_connector", stub)
+        monkeypatch.setattr(srv, "cache_manager", CacheManager())
+        monkeypatch.setattr(srv, "column_index", ColumnIndex())
+        monkeypatch.setattr(srv, "_schedule_column_index_refresh", lambda: None)
+        monkeypatch.setitem(srv.DATASPHERE_CONFIG, "use_mock_data", False)
+        return stub
+    return install
+
+
+async def _find(**arguments):
+    result = await srv._execute_tool("find_assets_by_column", {"column_name": "CUSTOMER_ID", **arguments})
+    return json.loads(result[0].text)
+
+
+async def test_scan_runs_concurrently_within_the_bound(tenant, monkeypatch):
+    monkeypatch.setattr(srv, "SCHEMA_SCAN_CONCURRENCY", 3)
+    stub = tenant(matching=lambda asset: asset.endswith(("A1", "A4")))
+
+    payload = await _find()
+
+    assert 1 < stub.peak_in_flight <= 3
+    assert [(m["space_id"], m["asset_name"]) for m in payload["matches"]] == [
+        ("S1", "S1_A1"), ("S1", "S1_A4"), ("S2", "S2_A1"), ("S2", "S2_A4"),
+    ]
+    assert [m["column_position"] for m in payload["matches"]] == [1, 2, 3, 4]
+    assert payload["matches"][0]["column_name"] == "customer_id"
+    assert payload["search_scope"] == {"spaces_searched": 2, "assets_checked": 12,
+                                       "assets_with_schema": 12, "source": "live_scan"}
+
+
+async def test_scan_stops_once_enough_matches_are_found(tenant, monkeypatch):
+    monkeypatch.setattr(srv, "SCHEMA_SCAN_CONCURRENCY", 2)
+    stub = tenant(assets_per_space=20)
+
+    payload = await _find(max_assets=2)
+
+    assert len(payload["matches"]) == 2
+    assert len(stub.metadata_calls) < 10
+
+
+async def test_case_sensitive_match_and_single_space(tenant):
+    stub = tenant()
+    payload = await _find(space_id="S2", case_sensitive=True)
+    assert payload["matches"] == []
+    assert all(asset.startswith("S2_") for asset in stub.metadata_calls)
+
+
+async def test_cached_schemas_are_reused(tenant):
+    stub = tenant(assets_per_space=3)
+    await _find()
+    calls = len(stub.metadata_calls)
+    payload = await _find()
+    assert len(stub.metadata_calls) == calls
+    assert len(payload["matches"]) == 6
+
+
+async def test_complete_index_answers_without_requests(tenant):
+    stub = tenant(matching=lambda asset: asset.endswith("A2"))
+    await srv._refresh_column_index()
+    calls = len(stub.metadata_calls)
+
+    payload = await _find(data_type="Edm.String")
+
+    assert len(stub.metadata_calls) == calls
+    assert payload["search_scope"]["source"] == "column_index"
+    assert [(m["asset_name"], m["column_position"]) for m in payload["matches"]] == [("S1_A2", 1), ("S2_A2", 2)]
+    assert (await _find(data_type="Edm.Int32"))["matches"] == []
+
+
+async def test_index_refresh_is_incremental_and_drops_vanished_assets(tenant, monkeypatch):
+    stub = tenant(assets_per_space=3)
+    await srv._refresh_column_index()
+    assert len(srv.column_index) == 6
+
+    stub.spaces["S2"] = ["S2_A0"]
+    monkeypatch.setattr(srv.column_index, "complete_at", None)
+    stub.metadata_calls.clear()
+    await srv._refresh_column_index()
+
+    assert stub.metadata_calls == []  # every remaining asset is still fresh
+    assert len(srv.column_index) == 4
+
+
+async def test_search_tables_includes_column_matches(tenant, monkeypatch):
+    tenant(matching=lambda asset: asset == "S1_A3")
+    await srv._refresh_column_index()
+    listing = [{"name": "S1_A3", "spaceName": "S1", "label": "", "description": ""},
+               {"name": "CUSTOMERS", "spaceName": "S1", "label": "", "description": ""}]
+
+    async def snapshot():
+        return {"assets": listing, "complete": True, "fetched_at": time.time()}
+
+    monkeypatch.setattr(srv, "_get_catalog_snapshot", snapshot)
+    result = await srv._execute_tool("search_tables", {"search_term": "customer"})
+    payload = json.loads(result[0].text)
+
+    assert [a["name"] for a in payload["results"]] == ["CUSTOMERS", "S1_A3"]
+    assert payload["results"][1]["matched_columns"] == ["customer_id"]
+    assert "matched_columns" not in listing[0]
+
+
+async def test_space_with_a_failed_listing_is_not_answered_from_the_index(tenant):
+    stub = tenant(assets_per_space=3, matching=lambda asset: asset.endswith("A1"))
+    list_assets = stub.get
+
+    async def flaky_get(endpoint, params=None):
+        if "/spaces/S2/" in endpoint:
+            raise RuntimeError("HTTP 503")
+        return await list_assets(endpoint, params)
+
+    stub.get = flaky_get
+    await srv._refresh_column_index()
+    assert srv.column_index.is_complete(srv.COLUMN_INDEX_MAX_AGE, "S1")
+    assert not srv.column_index.is_complete(srv.COLUMN_INDEX_MAX_AGE)
+
+    stub.get = list_assets
+    payload = await _find()
+    assert payload["search_scope"]["source"] == "live_scan"
+    assert [m["asset_name"] for m in payload["matches"]] == ["S1_A1", "S2_A1"]
+
+
+async def test_separator_insensitive_fallback_when_no_exact_match(tenant):
+    tenant(matching=lambda asset: asset.endswith("A2"), column="CustomerId")
+
+    payload = await _find()
+    assert payload["column_match"] == "normalized"
+    assert [(m["asset_name"], m["column_name"]) for m in payload["matches"]] == [
+        ("S1_A2", "CustomerId"), ("S2_A2", "CustomerId"),
+    ]
+
+    await srv._refresh_column_index()
+    indexed = await _find()
+    assert indexed["search_scope"]["source"] == "column_index"
+    assert indexed["column_match"] == "normalized"
+    assert [m["asset_name"] for m in indexed["matches"]] == ["S1_A2", "S2_A2"]
+
+
+async def test_exact_matches_win_and_case_sensitive_search_has_no_fallback(tenant):
+    tenant(column="CustomerId")
+
+    assert (await _find(case_sensitive=True))["matches"] == []
+    assert (await _find(column_name="CUSTOMERID"))["column_match"] == "exact"
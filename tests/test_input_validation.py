@@ -338,3 +338,31 @@ def test_parameter_validator_exists_but_is_not_wired():
         f"a parameterised-asset URL is now built ({built}) -- wire "
         "validate_parameter_value into it and update this test"
     )
+
+
+# ── Compiled validation plans ────────────────────────────────────────────────
+
+
+def test_validation_plan_is_compiled_once_per_tool():
+    assert ToolValidators.get_validation_plan("smart_query") is ToolValidators.get_validation_plan("smart_query")
+    assert len(ToolValidators.get_validation_plan("no_such_tool")) == 0
+
+
+def test_validation_plan_matches_validate_params(validator):
+    rules = ToolValidators.get_validator_rules("query_relational_entity")
+    plan = ToolValidators.get_validation_plan("query_relational_entity")
+    for params in (
+        {"space_id": "DEMO_SALES", "asset_id": "A", "entity_name": "E", "top": 10},
+        {"space_id": "bad space", "asset_id": "A/../B", "top": "10"},
+        {},
+    ):
+        assert plan.validate(params) == validator.validate_params(params, rules)
+
+
+def test_validation_plan_keeps_no_state_between_calls():
+    plan = ToolValidators.get_validation_plan("query_relational_entity")
+    ok, errors = plan.validate({"space_id": "bad space"})
+    assert not ok and errors
+    ok, more_errors = plan.validate({"space_id": "DEMO_SALES", "asset_id": "A", "entity_name": "E"})
+    assert ok and more_errors == []
+    assert errors  # The earlier result was not cleared by the later call
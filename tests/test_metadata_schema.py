@@ -0,0 +1,138 @@
+"""Tests for parsed, cached $metadata schemas (metadata_schema.py).
+
+Run with:  pytest tests/test_metadata_schema.py -v
+"""
+
+import asyncio
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import metadata_schema  # noqa: E402
+from cache_manager import CacheCategory, CacheManager  # noqa: E402
+from metadata_schema import AssetSchema, MetadataUnavailable, get_asset_schema  # noqa: E402
+
+METADATA_XML = """<?xml version="1.0" encoding="utf-8"?>
+<edmx:Edmx xmlns:edmx="http://docs.oasis-open.org/odata/ns/edmx" Version="4.0">
+  <edmx:DataServices>
+    <Schema xmlns="http://docs.oasis-open.org/odata/ns/edm" Namespace="ns">
+      <EntityType Name="SALES">
+        <Key><PropertyRef Name="ID"/></Key>
+        <Property Name="ID" Type="Edm.String" Nullable="false" MaxLength="10"/>
+        <Property Name="AMOUNT" Type="Edm.Decimal" Precision="15" Scale="2"/>
+        <NavigationProperty Name="Customer" Type="ns.CUSTOMER" Partner="Sales"/>
+      </EntityType>
+      <EntityContainer Name="Container">
+        <EntitySet Name="SALES" EntityType="ns.SALES"/>
+      </EntityContainer>
+    </Schema>
+  </edmx:DataServices>
+</edmx:Edmx>"""
+
+
+class StubConnector:
+    """Serves a fixed $metadata document, honouring If-None-Match."""
+
+    def __init__(self, status=200, etag='W/"1"'):
+        self.status = status
+        self.etag = etag
+        self.calls = []
+
+    async def fetch_text_conditional(self, endpoint, etag=None, accept="application/xml", timeout=30):
+        self.calls.append((endpoint, etag))
+        if self.status != 200:
+            return self.status, "", None
+        if etag is not None and etag == self.etag:
+            return 304, "", self.etag
+        return 200, METADATA_XML, self.etag
+
+
+def _expire(cache, space_id, asset_id, kind="relational"):
+    """Move the entry past its TTL, into the stale-while-revalidate window."""
+    key = cache._make_cache_key(f"{kind}:{space_id}/{asset_id}", CacheCategory.METADATA)
+    cache._cache[key].created_at -= 1801
+    cache._rebuild_expiry_heap()
+
+
+async def _drain(cache):
+    while cache._refresh_tasks:
+        await asyncio.gather(*cache._refresh_tasks.values(), return_exceptions=True)
+
+
+def test_parse_extracts_entities_keys_and_columns():
+    schema = metadata_schema.parse_asset_schema(METADATA_XML, "SAP_SC", "SALES", "relational")
+    entity = schema.entities[0]
+
+    assert entity.name == "SALES"
+    assert entity.keys == ["ID"]
+    assert schema.field_names() == ["ID", "AMOUNT"]
+    assert schema.field_types() == {"ID": "Edm.String", "AMOUNT": "Edm.Decimal"}
+    assert entity.properties[0].nullable is False
+    assert entity.properties[0].max_length == "10"
+    assert entity.properties[1].scale == "2"
+    assert entity.navigation_properties == [{"name": "Customer", "type": "ns.CUSTOMER", "partner": "Sales"}]
+
+
+def test_dict_round_trip():
+    schema = metadata_schema.parse_asset_schema(METADATA_XML, "SAP_SC", "SALES", "relational", etag="x")
+    assert AssetSchema.from_dict(schema.to_dict()) == schema
+
+
+def test_endpoint_quotes_identifiers():
+    assert metadata_schema.metadata_endpoint("SP/1", "A B", "relational") == (
+        "/api/v1/datasphere/consumption/relational/SP%2F1/A%20B/$metadata"
+    )
+
+
+async def test_schema_is_fetched_once_and_shared():
+    cache = CacheManager()
+    connector = StubConnector()
+
+    first = await get_asset_schema(cache, connector, "SAP_SC", "SALES")
+    second = await get_asset_schema(cache, connector, "SAP_SC", "SALES")
+
+    assert first == second
+    assert len(connector.calls) == 1
+
+
+async def test_kinds_are_cached_separately():
+    cache = CacheManager()
+    connector = StubConnector()
+    await get_asset_schema(cache, connector, "SAP_SC", "SALES", "relational")
+    await get_asset_schema(cache, connector, "SAP_SC", "SALES", "analytical")
+    assert [call[0].split("/")[5] for call in connector.calls] == ["relational", "analytical"]
+
+
+async def test_expired_schema_is_revalidated_by_etag():
+    cache = CacheManager()
+    connector = StubConnector()
+    first = await get_asset_schema(cache, connector, "SAP_SC", "SALES")
+    _expire(cache, "SAP_SC", "SALES")
+
+    stale = await get_asset_schema(cache, connector, "SAP_SC", "SALES")
+    assert stale == first
+    await _drain(cache)
+
+    assert connector.calls[-1][1] == 'W/"1"'
+    revalidated = await get_asset_schema(cache, connector, "SAP_SC", "SALES")
+    assert revalidated.entities == first.entities
+    assert revalidated.fetched_at >= first.fetched_at
+    assert len(connector.calls) == 2
+
+
+async def test_failures_are_not_cached():
+    cache = CacheManager()
+    failing = StubConnector(status=404)
+    with pytest.raises(MetadataUnavailable):
+        await get_asset_schema(cache, failing, "SAP_SC", "SALES")
+
+    schema = await get_asset_schema(cache, StubConnector(), "SAP_SC", "SALES")
+    assert schema.field_names() == ["ID", "AMOUNT"]
+
+
+async def test_missing_connector_raises():
+    with pytest.raises(MetadataUnavailable):
+        await get_asset_schema(CacheManager(), None, "SAP_SC", "SALES")
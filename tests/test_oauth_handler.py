@@ -0,0 +1,223 @@
+"""Tests for OAuthHandler token renewal.
+
+The token endpoint is replaced by a stub, so no tenant is needed.
+
+Run with:  pytest tests/test_oauth_handler.py -v
+"""
+
+import asyncio
+import os
+import sys
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from auth.oauth_handler import OAuthHandler, OAuthToken, TokenAcquisitionError  # noqa: E402
+from telemetry import TelemetryManager  # noqa: E402
+
+
+class StubHandler(OAuthHandler):
+    """Handler whose token endpoint is a slow stub issuing numbered tokens."""
+
+    def __init__(self, expires_in=3600, fail=False, **kwargs):
+        super().__init__("client-id", "secret", "https://auth.example/oauth/token", **kwargs)
+        self.expires_in = expires_in
+        self.fail = fail
+        self.issued = 0
+        self.attempts = 0
+
+    async def _acquire_token(self):
+        self.attempts += 1
+        await asyncio.sleep(0.02)
+        if self.fail:
+            raise TokenAcquisitionError("token endpoint down")
+        self.issued += 1
+        token = OAuthToken(access_token=f"token-{self.issued}", token_type="Bearer", expires_in=self.expires_in)
+        self._store_token(token)
+        return token
+
+
+def _age(handler, seconds):
+    """Pretend the current token was issued ``seconds`` ago."""
+    handler._token.acquired_at -= seconds
+
+
+async def test_valid_token_is_read_without_the_lock():
+    handler = StubHandler(refresh_fraction=0)
+    await handler.get_token()
+
+    async with handler._lock:  # a renewal in progress must not block readers
+        token = await asyncio.wait_for(handler.get_token(), timeout=0.1)
+    assert token.access_token == "token-1"
+
+
+async def test_concurrent_callers_share_one_renewal():
+    handler = StubHandler(refresh_fraction=0)
+    tokens = await asyncio.gather(*[handler.get_token() for _ in range(10)])
+    assert handler.issued == 1
+    assert {t.access_token for t in tokens} == {"token-1"}
+
+    # Concurrent force refreshes (e.g. several 401s) renew only once
+    stale = handler._token
+    tokens = await asyncio.gather(*[handler.get_token(force_refresh=True) for _ in range(5)])
+    assert handler.issued == 2
+    assert all(t is not stale for t in tokens)
+
+
+async def test_token_is_renewed_in_the_background_before_expiry():
+    telemetry = TelemetryManager()
+    handler = StubHandler(expires_in=1000, refresh_fraction=0.5, telemetry_manager=telemetry)
+    await handler.get_token()
+    assert handler.get_health_status()["background_refresh"] is True
+
+    _age(handler, 499.95)
+    await asyncio.sleep(0.2)
+
+    assert handler._token.access_token == "token-2"
+    assert not handler._token.is_expired
+    stats = telemetry.get_token_refresh_stats()
+    assert stats["on_demand"] == 1 and stats["proactive"] == 1
+    assert stats["latency"]["count"] == 2 and stats["latency"]["max_ms"] >= 20
+    assert handler.get_health_status()["proactive_refreshes"] == 1
+
+    await handler.revoke_token()
+    assert handler._refresh_task is None
+
+
+async def test_failed_background_renewal_keeps_the_current_token():
+    telemetry = TelemetryManager()
+    handler = StubHandler(expires_in=1000, refresh_fraction=0.5, telemetry_manager=telemetry)
+    first = await handler.get_token()
+    handler.fail = True
+    _age(handler, 500)
+    await asyncio.sleep(0.1)
+
+    assert await handler.get_token() is first
+    assert telemetry.get_token_refresh_stats()["failed"] == 1
+    await handler.revoke_token()
+
+
+def _restart_refresher(handler):
+    """Re-run the refresher so it sees the aged token immediately."""
+    handler._stop_refresher()
+    handler._start_refresher()
+
+
+async def test_failed_background_renewals_back_off(monkeypatch):
+    real_sleep = asyncio.sleep
+    delays = []
+
+    async def recording_sleep(delay):
+        if not 1 <= delay <= 100:  # the stub endpoint, or the wait for the next due renewal
+            return await real_sleep(delay)
+        delays.append(delay)
+        if len(delays) == 8:
+            handler.fail = False
+        await real_sleep(0)
+
+    handler = StubHandler(expires_in=1000, refresh_fraction=0.5)
+    await handler.get_token()
+    handler.fail = True
+    _age(handler, 600)  # due, and still valid for another 340 s
+    monkeypatch.setattr(asyncio, "sleep", recording_sleep)
+    _restart_refresher(handler)
+    while handler.issued < 2:
+        await real_sleep(0.01)
+
+    assert delays == [1, 2, 4, 8, 16, 32, 60, 60]
+    assert handler.attempts == 1 + 9
+    await handler.revoke_token()
+
+
+async def test_refresher_stops_once_the_token_has_expired():
+    handler = StubHandler(expires_in=1000, refresh_fraction=0.5)
+    await handler.get_token()
+    handler.fail = True
+    _age(handler, 950)  # past the 60 s expiry buffer
+    _restart_refresher(handler)
+    await asyncio.sleep(0.2)
+
+    assert handler.attempts == 2  # one background attempt, no retry loop
+    assert handler._refresh_task.done()
+
+    handler.fail = False
+    assert (await handler.get_token()).access_token == "token-2"  # renewed on demand
+    assert not handler._refresh_task.done()
+    await handler.revoke_token()
+
+
+async def test_renewal_is_due_before_the_expiry_buffer():
+    handler = StubHandler(expires_in=100, refresh_fraction=0.9)
+    await handler.get_token()
+    _age(handler, 39.95)  # 90% would be past the 60 s expiry buffer
+    await asyncio.sleep(0.2)
+    assert handler.issued == 2
+    await handler.revoke_token()
+
+
+async def test_expired_token_is_renewed_on_demand():
+    handler = StubHandler(refresh_fraction=0)
+    await handler.get_token()
+    _age(handler, 3600)
+    started = time.perf_counter()
+    token = await handler.get_token()
+    assert token.access_token == "token-2"
+    assert time.perf_counter() - started >= 0.02
+    assert handler._refresh_task is None  # disabled
+
+
+async def test_renewal_failure_propagates_to_callers():
+    handler = StubHandler(fail=True)
+    with pytest.raises(TokenAcquisitionError):
+        await handler.get_token()
+
+
+@pytest.fixture
+async def token_endpoint():
+    """Local token endpoint counting requests and the connections they arrive on."""
+    from aiohttp import web
+    from aiohttp.test_utils import TestServer
+
+    calls, connections = [], set()
+
+    async def issue(request):
+        calls.append(1)
+        connections.add(id(request.transport))
+        return web.json_response({"access_token": f"token-{len(calls)}", "token_type": "Bearer",
+                                  "expires_in": 3600})
+
+    app = web.Application()
+    app.router.add_post("/oauth/token", issue)
+    server = TestServer(app)
+    await server.start_server()
+    yield str(server.make_url("/oauth/token")), calls, connections
+    await server.close()
+
+
+async def test_token_requests_reuse_the_provided_session(token_endpoint):
+    import aiohttp
+
+    url, calls, connections = token_endpoint
+    async with aiohttp.ClientSession() as pooled:
+        handler = OAuthHandler("client-id", "secret", url, refresh_fraction=0, session_provider=lambda: pooled)
+        for _ in range(3):
+            await handler.get_token(force_refresh=True)
+        await handler.close()
+
+        assert len(calls) == 3 and len(connections) == 1
+        assert handler._session is None and not pooled.closed  # the provider owns its session
+    assert handler._token.authorization == "Bearer token-3"
+
+
+async def test_handler_keeps_one_session_of_its_own(token_endpoint):
+    url, calls, connections = token_endpoint
+    handler = OAuthHandler("client-id", "secret", url, refresh_fraction=0)
+    await handler.get_token()
+    session = handler._session
+    await handler.get_token(force_refresh=True)
+
+    assert handler._session is session and len(connections) == 1
+    await handler.close()
+    assert session.closed
@@ -0,0 +1,195 @@
+"""Tests for paged OData extraction and the NDJSON mode of query_relational_entity.
+
+Run with:  pytest tests/test_odata_extraction.py -v
+"""
+
+import asyncio
+import json
+import os
+import sys
+from types import SimpleNamespace
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+os.environ.setdefault("USE_MOCK_DATA", "true")
+
+from odata_extraction import (  # noqa: E402
+    CursorError,
+    ExtractionPosition,
+    PagedExtraction,
+    decode_cursor,
+    encode_cursor,
+    query_fingerprint,
+    resolve_next_link,
+)
+
+BASE_URL = "https://tenant.example"
+ENDPOINT = "/api/v1/datasphere/consumption/relational/SP/SALES/SALES"
+
+
+class SkipService:
+    """Serves ``total`` rows with $top/$skip, tracking concurrency."""
+
+    def __init__(self, total, fail_at_skip=None):
+        self.rows = [{"ID": i} for i in range(total)]
+        self.fail_at_skip = fail_at_skip
+        self.calls = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def get(self, endpoint, params):
+        self.calls.append(dict(params))
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(0.001)
+            skip = params.get("$skip", 0)
+            if skip == self.fail_at_skip:
+                raise RuntimeError("HTTP 503")
+            return {"value": self.rows[skip:skip + params["$top"]]}
+        finally:
+            self.in_flight -= 1
+
+
+class LinkService:
+    """Server-driven paging: pages of 3 rows chained by @odata.nextLink."""
+
+    def __init__(self, total, link_host=BASE_URL):
+        self.rows = [{"ID": i} for i in range(total)]
+        self.link_host = link_host
+        self.calls = []
+
+    async def get(self, endpoint, params):
+        self.calls.append((endpoint, dict(params)))
+        start = int(params.get("$skiptoken", 0))
+        data = {"value": self.rows[start:start + 3]}
+        if start + 3 < len(self.rows):
+            data["@odata.nextLink"] = f"{self.link_host}{ENDPOINT}?$skiptoken={start + 3}"
+        return data
+
+
+async def _collect(extraction):
+    return [row["ID"] for page in [p async for p in extraction.pages()] for row in page.rows]
+
+
+async def test_skip_paging_reads_everything_in_order():
+    service = SkipService(23)
+    extraction = PagedExtraction(service.get, ENDPOINT, {}, BASE_URL, page_size=5, max_rows=100)
+    assert await _collect(extraction) == list(range(23))
+    assert extraction.position is None
+    assert extraction.pages_fetched == 5
+
+
+async def test_read_ahead_concurrency_is_bounded():
+    service = SkipService(200)
+    extraction = PagedExtraction(service.get, ENDPOINT, {}, BASE_URL, page_size=5,
+                                 max_rows=200, concurrency=3)
+    await _collect(extraction)
+    assert service.max_in_flight <= 3
+
+
+async def test_budget_stops_and_leaves_resume_position():
+    service = SkipService(50)
+    extraction = PagedExtraction(service.get, ENDPOINT, {}, BASE_URL, page_size=4, max_rows=10)
+    assert await _collect(extraction) == list(range(10))
+    assert extraction.position == ExtractionPosition(skip=10)
+    assert max(call["$top"] for call in service.calls) == 4
+
+    resumed = PagedExtraction(service.get, ENDPOINT, {}, BASE_URL, page_size=4, max_rows=100,
+                              start=extraction.position)
+    assert await _collect(resumed) == list(range(10, 50))
+
+
+async def test_failure_keeps_position_of_last_delivered_page():
+    service = SkipService(50, fail_at_skip=10)
+    extraction = PagedExtraction(service.get, ENDPOINT, {}, BASE_URL, page_size=5,
+                                 max_rows=50, concurrency=1)
+    seen = []
+    with pytest.raises(RuntimeError):
+        async for page in extraction.pages():
+            seen.extend(row["ID"] for row in page.rows)
+    assert seen == list(range(10))
+    assert extraction.position == ExtractionPosition(skip=10)
+
+
+async def test_next_links_are_followed():
+    service = LinkService(8)
+    extraction = PagedExtraction(service.get, ENDPOINT, {"$filter": "ID gt 0"}, BASE_URL,
+                                 page_size=100, max_rows=100)
+    assert await _collect(extraction) == list(range(8))
+    assert extraction.position is None
+    assert service.calls[1] == (ENDPOINT.lstrip("/"), {"$skiptoken": "3"})
+
+
+async def test_next_link_to_another_host_is_refused():
+    service = LinkService(8, link_host="https://attacker.example")
+    extraction = PagedExtraction(service.get, ENDPOINT, {}, BASE_URL, page_size=100, max_rows=100)
+    with pytest.raises(ValueError):
+        await _collect(extraction)
+    assert len(service.calls) == 1
+
+
+def test_relative_next_link_resolves_against_request():
+    endpoint, params = resolve_next_link("SALES?$skiptoken=abc", BASE_URL, ENDPOINT)
+    assert endpoint == ENDPOINT.lstrip("/")
+    assert params == {"$skiptoken": "abc"}
+
+
+def test_cursor_round_trip_and_binding():
+    fingerprint = query_fingerprint(ENDPOINT, {"$filter": "A eq 'x'", "$top": 5})
+    token = encode_cursor(ExtractionPosition(skip=40), fingerprint)
+    assert decode_cursor(token, fingerprint) == ExtractionPosition(skip=40)
+
+    other = query_fingerprint(ENDPOINT, {"$filter": "A eq 'y'"})
+    with pytest.raises(CursorError):
+        decode_cursor(token, other)
+    with pytest.raises(CursorError):
+        decode_cursor("not-a-cursor", fingerprint)
+
+
+def test_fingerprint_ignores_paging_params():
+    assert query_fingerprint(ENDPOINT, {"$top": 1, "$skip": 5}) == query_fingerprint(ENDPOINT, {})
+
+
+async def test_ndjson_mode_streams_pages_with_cursor(monkeypatch):
+    import sap_datasphere_mcp_server as srv
+
+    service = SkipService(12)
+    connector = SimpleNamespace(get=service.get, config=SimpleNamespace(base_url=BASE_URL))
+    monkeypatch.setattr(srv, "datasphere_connector", connector)
+
+    args = {"space_id": "SP", "asset_id": "SALES", "entity_name": "SALES",
+            "output_format": "ndjson", "page_size": 4, "max_rows": 8}
+    result = await srv._execute_tool("query_relational_entity", dict(args))
+
+    header = json.loads(result[0].text.split("\n\n", 1)[1])
+    rows = [json.loads(line) for chunk in result[1:] for line in chunk.text.splitlines()]
+    assert rows == [{"ID": i} for i in range(8)]
+    assert header["rows_returned"] == 8
+    assert header["complete"] is False
+
+    result = await srv._execute_tool(
+        "query_relational_entity", {**args, "cursor": header["next_cursor"]}
+    )
+    header = json.loads(result[0].text.split("\n\n", 1)[1])
+    rows = [json.loads(line) for chunk in result[1:] for line in chunk.text.splitlines()]
+    assert rows == [{"ID": i} for i in range(8, 12)]
+    assert header["complete"] is True
+    assert header["next_cursor"] is None
+
+
+async def test_ndjson_rows_per_call_are_capped(monkeypatch):
+    import sap_datasphere_mcp_server as srv
+
+    service = SkipService(12)
+    connector = SimpleNamespace(get=service.get, config=SimpleNamespace(base_url=BASE_URL))
+    monkeypatch.setattr(srv, "datasphere_connector", connector)
+    monkeypatch.setattr(srv, "EXTRACT_MAX_ROWS", 6)
+
+    result = await srv._execute_tool("query_relational_entity", {
+        "space_id": "SP", "asset_id": "SALES", "entity_name": "SALES",
+        "output_format": "ndjson", "page_size": 4, "max_rows": 1000})
+    header = json.loads(result[0].text.split("\n\n", 1)[1])
+    assert header["rows_returned"] == 6
+    assert header["next_cursor"] and "next_cursor" in header["recommendation"]
@@ -294,6 +294,54 @@ class TestApplyMasking:
         assert len(result[0]["EMAIL"]) == 64
 
 
+# ─────────────────────────────────────────────────────────────────────────────
+# Compiled masking plans
+# ─────────────────────────────────────────────────────────────────────────────
+
+class TestMaskingPlans:
+    def test_plan_is_resolved_once_per_layout(self, monkeypatch):
+        import pii_masking
+
+        calls = []
+        original = pii_masking._resolve_column_action
+        monkeypatch.setattr(
+            pii_masking, "_resolve_column_action",
+            lambda *args: calls.append(args[-1]) or original(*args),
+        )
+        p = make_policy(rules=[{"space": "*", "columns": {"EMAIL": "redact"}}])
+        rows = [{"NAME": f"n{i}", "EMAIL": f"{i}@x.io"} for i in range(50)]
+        apply_masking(rows, "S", "T", p)
+        apply_masking(rows, "S", "T", p)
+        assert sorted(calls) == ["EMAIL", "NAME"]
+
+    def test_heterogeneous_rows_get_their_own_plan(self):
+        p = make_policy(rules=[{"space": "*", "columns": {"EMAIL": "drop"}}])
+        rows = [{"NAME": "a", "EMAIL": "a@x.io"}, {"NAME": "b"}, {"EMAIL": "c@x.io", "NAME": "c"}]
+        result, masked = apply_masking(rows, "S", "T", p)
+        assert result == [{"NAME": "a"}, {"NAME": "b"}, {"NAME": "c"}]
+        assert masked == ["EMAIL"]
+
+    def test_plan_cache_is_bounded(self, monkeypatch):
+        monkeypatch.setattr(Policy, "PLAN_CACHE_SIZE", 2)
+        p = make_policy()
+        for col in ("A", "B", "C"):
+            p.plan_for("S", "T", (col,))
+        assert [key[2] for key in p._plans] == [("B",), ("C",)]
+
+    def test_patterns_are_scanned_with_one_combined_regex(self):
+        p = make_policy(patterns={"email": r"\S+@\S+", "phone": r"\+\d{6,}"})
+        assert p.value_scanner("call +4930123456") and p.value_scanner("a@b")
+        assert not p.value_scanner("nothing here")
+        result, masked = apply_masking([{"N": "call +4930123456", "M": "ok"}], "S", "T", p)
+        assert result == [{"N": "***", "M": "ok"}]
+        assert masked == ["N"]
+
+    def test_back_referencing_patterns_are_scanned_separately(self):
+        p = make_policy(patterns={"twice": r"(ab)\1", "pin": r"PIN(\d)\1"})
+        assert p.value_scanner("xxPIN33") and p.value_scanner("abab")
+        assert not p.value_scanner("PIN34 ab")
+
+
 # ─────────────────────────────────────────────────────────────────────────────
 # load_policy
 # ─────────────────────────────────────────────────────────────────────────────
@@ -355,3 +403,59 @@ class TestLoadPolicy:
         monkeypatch.setenv("DATASPHERE_PII_SALT", "salt")
         p = load_policy()
         assert p.mode == "audit_only"
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Column-wise batches and thread offload
+# ─────────────────────────────────────────────────────────────────────────────
+
+class TestBatchMasking:
+    def test_repeated_values_are_hashed_once_per_batch(self, monkeypatch):
+        import pii_masking
+
+        calls = []
+        original = pii_masking._apply_action
+        monkeypatch.setattr(
+            pii_masking, "_apply_action",
+            lambda action, value, salt: calls.append(value) or original(action, value, salt),
+        )
+        p = make_policy(rules=[{"space": "*", "columns": {"EMAIL": "hash"}}])
+        rows = [{"EMAIL": f"user{i % 3}@x.io"} for i in range(30)]
+        result, _ = apply_masking(rows, "S", "T", p)
+        assert sorted(calls) == ["user0@x.io", "user1@x.io", "user2@x.io"]
+        assert result[3]["EMAIL"] == sha256("user0@x.io")
+
+    def test_drop_keeps_null_cells_like_the_row_path(self):
+        p = make_policy(rules=[{"space": "*", "columns": {"EMAIL": "drop"}}])
+        rows = [{"NAME": "a", "EMAIL": "a@x.io"}, {"NAME": "b", "EMAIL": None}]
+        result, _ = apply_masking(rows, "S", "T", p)
+        assert result == [{"NAME": "a"}, {"NAME": "b", "EMAIL": None}]
+
+    def test_column_order_is_preserved(self):
+        p = make_policy(rules=[{"space": "*", "columns": {"B": "redact"}}],
+                        patterns={"digits": r"\d{4}"})
+        result, masked = apply_masking([{"C": "1234", "B": "x", "A": 1}], "S", "T", p)
+        assert list(result[0]) == ["C", "B", "A"]
+        assert result == [{"C": "***", "B": "***", "A": 1}]
+        assert masked == ["B", "C"]
+
+    async def test_large_batches_are_masked_off_the_event_loop(self, monkeypatch):
+        import threading
+
+        import pii_masking
+
+        threads = []
+        original = pii_masking._mask_rows
+        monkeypatch.setattr(
+            pii_masking, "_mask_rows",
+            lambda *args: threads.append(threading.current_thread()) or original(*args),
+        )
+        monkeypatch.setattr(Policy, "OFFLOAD_MIN_ROWS", 10)
+        p = make_policy(rules=[{"space": "*", "columns": {"EMAIL": "redact"}}])
+
+        small, _ = await pii_masking.apply_masking_async(ROWS[:1], "S", "T", p)
+        large, masked = await pii_masking.apply_masking_async(ROWS * 10, "S", "T", p)
+        assert threads[0] is threading.main_thread()
+        assert threads[1] is not threading.main_thread()
+        assert all(row["EMAIL"] == "***" for row in small + large)
+        assert masked == ["EMAIL"]
@@ -0,0 +1,113 @@
+"""Tests for single-flight coalescing of identical in-flight Datasphere GETs.
+
+The upstream call is replaced by a counting stub, so no tenant is needed.
+
+Run with:  pytest tests/test_request_coalescing.py -v
+"""
+
+import asyncio
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from auth.datasphere_auth_connector import (  # noqa: E402
+    ConnectionPoolConfig,
+    DatasphereAuthConnector,
+    DatasphereConfig,
+)
+
+
+class CountingConnector(DatasphereAuthConnector):
+    """Connector whose upstream call is a slow stub that counts invocations."""
+
+    def __init__(self, config, fail=False):
+        super().__init__(config)
+        self.calls = []
+        self.fail = fail
+
+    async def _make_request(self, method, endpoint, params=None, data=None):
+        self.calls.append((method, endpoint, params))
+        await asyncio.sleep(0.02)
+        if self.fail:
+            raise RuntimeError("upstream failed")
+        return {"value": [{"name": "SALES"}]}
+
+
+def _config(coalesce=True):
+    return DatasphereConfig(
+        base_url="https://tenant.example",
+        client_id="client",
+        client_secret="secret",
+        token_url="https://tenant.example/oauth/token",
+        tenant_id="tenant",
+        pool=ConnectionPoolConfig(coalesce_gets=coalesce),
+    )
+
+
+async def test_identical_concurrent_gets_share_one_upstream_call():
+    connector = CountingConnector(_config())
+    results = await asyncio.gather(*[
+        connector.get("/api/v1/datasphere/consumption/catalog/assets", {"$top": 500, "$skip": 0})
+        for _ in range(5)
+    ])
+    assert len(connector.calls) == 1
+    assert all(r == {"value": [{"name": "SALES"}]} for r in results)
+    assert connector._inflight == {}
+
+
+async def test_shared_responses_are_independent_copies():
+    connector = CountingConnector(_config())
+    first, second = await asyncio.gather(
+        connector.get("api/assets", {"$top": 1}),
+        connector.get("/api/assets", {"$top": "1"}),
+    )
+    assert len(connector.calls) == 1
+    first["value"][0]["_whyFound"] = "name match"
+    assert "_whyFound" not in second["value"][0]
+
+
+async def test_different_params_are_not_coalesced():
+    connector = CountingConnector(_config())
+    await asyncio.gather(
+        connector.get("/api/assets", {"$skip": 0}),
+        connector.get("/api/assets", {"$skip": 500}),
+    )
+    assert len(connector.calls) == 2
+
+
+async def test_sequential_gets_are_not_coalesced():
+    connector = CountingConnector(_config())
+    await connector.get("/api/assets")
+    await connector.get("/api/assets")
+    assert len(connector.calls) == 2
+
+
+async def test_errors_propagate_to_every_waiter():
+    connector = CountingConnector(_config(), fail=True)
+    results = await asyncio.gather(
+        connector.get("/api/assets"),
+        connector.get("/api/assets"),
+        return_exceptions=True,
+    )
+    assert len(connector.calls) == 1
+    assert all(isinstance(r, RuntimeError) for r in results)
+
+
+async def test_cancelled_waiter_does_not_cancel_shared_call():
+    connector = CountingConnector(_config())
+    leader = asyncio.ensure_future(connector.get("/api/assets"))
+    follower = asyncio.ensure_future(connector.get("/api/assets"))
+    await asyncio.sleep(0)
+    leader.cancel()
+    assert await follower == {"value": [{"name": "SALES"}]}
+    with pytest.raises(asyncio.CancelledError):
+        await leader
+
+
+async def test_coalescing_can_be_disabled():
+    connector = CountingConnector(_config(coalesce=False))
+    await asyncio.gather(connector.get("/api/assets"), connector.get("/api/assets"))
+    assert len(connector.calls) == 2
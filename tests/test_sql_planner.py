@@ -0,0 +1,246 @@
+"""Tests for the SQL-subset parser and the OData pushdown planner.
+
+Run with:  pytest tests/test_sql_planner.py -v
+"""
+
+import json
+import os
+import sys
+from types import SimpleNamespace
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+os.environ.setdefault("USE_MOCK_DATA", "true")
+
+from sql_planner import (  # noqa: E402
+    TARGET_ANALYTICAL,
+    TARGET_RELATIONAL,
+    SqlParseError,
+    evaluate,
+    parse_select,
+    plan_select,
+    to_odata_filter,
+)
+
+ROWS = [
+    {"REGION": "EU", "AMOUNT": 10, "CITY": "Berlin"},
+    {"REGION": "US", "AMOUNT": 5, "CITY": "Boston"},
+    {"REGION": "EU", "AMOUNT": 7, "CITY": "Bern"},
+    {"REGION": "APJ", "AMOUNT": None, "CITY": "Osaka"},
+]
+
+
+def _plan(sql, target=TARGET_RELATIONAL, **kwargs):
+    return plan_select(parse_select(sql), target, max_rows=kwargs.pop("max_rows", 1000),
+                       fetch_limit=kwargs.pop("fetch_limit", 50000), **kwargs)
+
+
+def test_parse_full_statement():
+    statement = parse_select(
+        "SELECT s.REGION, SUM(AMOUNT) AS total FROM SALES.ORDERS s WHERE YEAR >= 2024 "
+        "GROUP BY REGION HAVING COUNT(*) > 1 ORDER BY total DESC LIMIT 5 OFFSET 2;"
+    )
+    assert (statement.schema, statement.table) == ("SALES", "ORDERS")
+    assert statement.group_by == ["REGION"]
+    assert statement.having_sql == "COUNT(*) > 1"
+    assert statement.order_by_sql == "total DESC"
+    assert (statement.limit, statement.offset) == (5, 2)
+    assert statement.has_aggregation
+
+
+@pytest.mark.parametrize("sql", [
+    "SELECT a FROM T JOIN U ON T.id = U.id",
+    "SELECT DISTINCT a FROM T",
+    "SELECT a FROM (SELECT a FROM T)",
+    "SELECT a FROM T WHERE SUM(a) > 1",
+    "DELETE FROM T",
+    "SELECT a FROM T LIMIT 1.5",
+])
+def test_unsupported_sql_is_rejected(sql):
+    with pytest.raises(SqlParseError):
+        parse_select(sql)
+
+
+@pytest.mark.parametrize("where, expected", [
+    ("A = 'x'", "A eq 'x'"),
+    ("5 < A", "A gt 5"),
+    ("A IS NOT NULL", "A ne null"),
+    ("A IN ('x', 'y')", "(A eq 'x' or A eq 'y')"),
+    ("A BETWEEN 1 AND 3", "A ge 1 and A le 3"),
+    ("A LIKE 'ab%'", "startswith(A,'ab')"),
+    ("A LIKE '%ab%'", "contains(A,'ab')"),
+    ("NOT A = -2", "not (A eq -2)"),
+    ("A LIKE 'a_b%'", None),
+    ("A = 'O''Brien'", None),
+])
+def test_filter_translation(where, expected):
+    assert to_odata_filter(parse_select(f"SELECT * FROM T WHERE {where}").where) == expected
+
+
+def test_federated_assets_only_get_eq_and_or():
+    where = parse_select("SELECT * FROM T WHERE A = 1 OR B = 2").where
+    assert to_odata_filter(where, federated=True) == "A eq 1 or B eq 2"
+    assert to_odata_filter(parse_select("SELECT * FROM T WHERE A > 1").where, federated=True) is None
+
+
+def test_local_evaluation_matches_sql_semantics():
+    where = parse_select("SELECT * FROM T WHERE CITY LIKE 'B_r%' AND AMOUNT > '6'").where
+    assert [row["CITY"] for row in ROWS if evaluate(where, row)] == ["Berlin", "Bern"]
+    null_check = parse_select("SELECT * FROM T WHERE NOT AMOUNT > 6").where
+    assert [row["CITY"] for row in ROWS if evaluate(null_check, row)] == ["Boston", "Osaka"]
+
+
+def test_like_pattern_is_compiled_once_per_node(monkeypatch):
+    like = parse_select("SELECT * FROM T WHERE CITY NOT LIKE 'B%'").where
+    monkeypatch.setattr(sys.modules["sql_planner"], "_like_regex", None)
+    assert [row["CITY"] for row in ROWS if evaluate(like, row)] == ["Osaka"]
+
+
+def test_plain_query_is_fully_pushed_down():
+    plan = _plan("SELECT REGION AS r, AMOUNT FROM T WHERE REGION = 'EU' ORDER BY r DESC LIMIT 10 OFFSET 20")
+    assert plan.params == {"$select": "REGION,AMOUNT", "$filter": "REGION eq 'EU'",
+                           "$orderby": "REGION desc", "$top": 10, "$skip": 20}
+    assert plan.execute_locally([{"REGION": "EU", "AMOUNT": 1}]) == [{"r": "EU", "AMOUNT": 1}]
+
+
+def test_untranslatable_conjunct_stays_local_and_limit_follows_it():
+    plan = _plan("SELECT REGION FROM T WHERE REGION = 'EU' AND CITY LIKE 'B_r%' LIMIT 1", fetch_limit=500)
+    assert plan.params == {"$select": "REGION,CITY", "$filter": "REGION eq 'EU'", "$top": 500}
+    rows = plan.execute_locally([r for r in ROWS if r["REGION"] == "EU"])
+    assert rows == [{"REGION": "EU"}]
+
+
+def test_aggregation_is_pushed_as_apply_on_analytical_assets():
+    plan = _plan("SELECT REGION, SUM(AMOUNT) AS total, COUNT(*) FROM T WHERE YEAR = 2024 "
+                 "GROUP BY REGION ORDER BY total DESC LIMIT 3", TARGET_ANALYTICAL)
+    assert plan.params == {
+        "$apply": "filter(YEAR eq 2024)/groupby((REGION),aggregate(AMOUNT with sum as total,$count as COUNT_ALL))",
+        "$orderby": "total desc",
+        "$top": 3,
+    }
+    assert plan.aggregation is None
+    assert plan.execute_locally([{"REGION": "EU", "total": 1.0, "COUNT_ALL": 2}]) == [
+        {"REGION": "EU", "total": 1.0, "COUNT_*": 2}
+    ]
+
+
+def test_order_by_position_follows_the_select_list():
+    sql = "SELECT SUM(AMOUNT) AS total, REGION FROM T GROUP BY REGION ORDER BY 1 DESC"
+    assert _plan(sql, TARGET_ANALYTICAL).params["$orderby"] == "total desc"
+    assert _plan(sql.replace("ORDER BY 1", "ORDER BY 2"), TARGET_ANALYTICAL).params["$orderby"] == "REGION desc"
+
+    plan = _plan(sql)
+    assert plan.aggregation is not None
+    assert [row["REGION"] for row in plan.execute_locally(ROWS)] == ["EU", "US", "APJ"]
+
+
+def test_aggregation_runs_locally_on_a_narrow_projection_otherwise():
+    plan = _plan("SELECT REGION, SUM(AMOUNT) AS total FROM T GROUP BY REGION HAVING COUNT(*) > 1 "
+                 "ORDER BY total LIMIT 5", TARGET_ANALYTICAL, fetch_limit=2000)
+    assert plan.params == {"$select": "REGION,AMOUNT", "$top": 2000}
+    assert plan.execute_locally(ROWS) == [{"REGION": "EU", "total": 17.0}]
+
+
+def test_disabling_filter_pushdown_evaluates_where_locally():
+    plan = _plan("SELECT CITY FROM T WHERE REGION = 'EU'", push_filters=False, fetch_limit=100)
+    assert "$filter" not in plan.params
+    assert plan.execute_locally(ROWS) == [{"CITY": "Berlin"}, {"CITY": "Bern"}]
+
+
+class RecordingConnector:
+    """Answers the catalog lookup and records consumption requests."""
+
+    def __init__(self, rows, supports_analytical=False):
+        self.rows = rows
+        self.supports_analytical = supports_analytical
+        self.requests = []
+        self.config = SimpleNamespace(base_url="https://tenant.example")
+
+    async def get(self, endpoint, params=None):
+        if "/catalog/" in endpoint:
+            return {"value": [{"name": "SALES", "type": "view",
+                               "supportsAnalyticalQueries": self.supports_analytical}]}
+        self.requests.append((endpoint, dict(params or {})))
+        return {"value": self.rows}
+
+
+async def test_smart_query_pushes_filters_and_aggregates_locally(monkeypatch):
+    import sap_datasphere_mcp_server as srv
+
+    connector = RecordingConnector(ROWS)
+    monkeypatch.setattr(srv, "datasphere_connector", connector)
+
+    result = await srv._execute_tool("smart_query", {
+        "space_id": "SP",
+        "query": "SELECT REGION, SUM(AMOUNT) AS total FROM SALES WHERE AMOUNT > 0 GROUP BY REGION ORDER BY total DESC",
+    })
+    payload = json.loads(result[0].text.split("\n\n", 1)[1])
+
+    endpoint, params = connector.requests[0]
+    assert "/consumption/relational/SP/SALES/SALES" in endpoint
+    assert params["$filter"] == "AMOUNT gt 0"
+    assert params["$select"] == "REGION,AMOUNT"
+    assert payload["method"] == "relational + client-side aggregation"
+    assert payload["data"] == [{"REGION": "EU", "total": 17.0}, {"REGION": "US", "total": 5.0}, {"REGION": "APJ", "total": 0}]
+
+
+async def test_execute_query_applies_the_plan(monkeypatch):
+    import sap_datasphere_mcp_server as srv
+
+    connector = RecordingConnector(ROWS)
+    monkeypatch.setattr(srv, "datasphere_connector", connector)
+    monkeypatch.setitem(srv.DATASPHERE_CONFIG, "use_mock_data", False)
+
+    result = await srv._execute_tool("execute_query", {
+        "space_id": "SP", "sql_query": "SELECT COUNT(*) AS n FROM SALES WHERE REGION = 'EU'",
+    })
+    payload = json.loads(result[0].text.split("\n\n", 1)[1])
+    assert connector.requests[0][1]["$filter"] == "REGION eq 'EU'"
+    assert payload["data"] == [{"n": 4}]  # The stub ignores $filter; the count is local
+
+
+class PagedConnector(RecordingConnector):
+    """Serves ``total`` rows honouring $top/$skip."""
+
+    def __init__(self, total):
+        super().__init__([{"REGION": "EU", "AMOUNT": 1}] * total)
+
+    async def get(self, endpoint, params=None):
+        await super().get(endpoint, params)
+        skip, top = params.get("$skip", 0), params["$top"]
+        return {"value": self.rows[skip:skip + top]}
+
+
+@pytest.mark.parametrize("total, expected", [(22, 22), (60, 25)])
+async def test_local_aggregation_pages_up_to_the_fetch_cap(monkeypatch, total, expected):
+    import sap_datasphere_mcp_server as srv
+
+    connector = PagedConnector(total)
+    monkeypatch.setattr(srv, "datasphere_connector", connector)
+    monkeypatch.setitem(srv.DATASPHERE_CONFIG, "use_mock_data", False)
+    monkeypatch.setattr(srv.sql_planner, "LOCAL_FETCH_LIMIT", 25)
+    monkeypatch.setattr(srv.sql_planner, "LOCAL_FETCH_PAGE_SIZE", 10)
+
+    result = await srv._execute_tool("execute_query", {
+        "space_id": "SP", "sql_query": "SELECT COUNT(*) AS N FROM SALES", "limit": 1,
+    })
+    payload = json.loads(result[0].text.split("\n\n", 1)[1])
+
+    assert payload["data"] == [{"N": expected}]
+    assert [(p["$skip"], p["$top"]) for _, p in connector.requests] == [(0, 10), (10, 10), (20, 5)]
+    if total > expected:
+        assert payload["truncated"] is True and "first 25 rows" in payload["warning"]
+    else:
+        assert "truncated" not in payload and "warning" not in payload
+
+
+def test_truncation_depends_on_the_kind_of_local_work():
+    aggregate = _plan("SELECT COUNT(*) FROM T", fetch_limit=4)
+    assert aggregate.is_truncated(ROWS, [{"COUNT_ALL": 4}])
+    assert not aggregate.is_truncated(ROWS[:3], [{"COUNT_ALL": 3}])
+
+    filtered = _plan("SELECT CITY FROM T WHERE CITY LIKE 'B%' LIMIT 2", fetch_limit=4, push_filters=False)
+    assert not filtered.is_truncated(ROWS, [{"CITY": "Berlin"}, {"CITY": "Boston"}])
+    assert filtered.is_truncated(ROWS, [{"CITY": "Berlin"}])
+    assert not _plan("SELECT CITY FROM T", fetch_limit=4).is_truncated(ROWS, ROWS)
@@ -0,0 +1,68 @@
+"""Tests for the compiled SQL sanitizer and its analysis cache.
+
+Run with:  pytest tests/test_sql_sanitizer.py -v
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from auth.sql_sanitizer import SQLSanitizer, SQLSanitizerError  # noqa: E402
+
+
+@pytest.fixture
+def sanitizer():
+    return SQLSanitizer(cache_size=2)
+
+
+def test_safe_query_is_normalised(sanitizer):
+    analysis = sanitizer.analyze_query("SELECT  a,\n b FROM SALES s JOIN REGIONS r ON s.id = r.id")
+    assert analysis.is_safe
+    assert analysis.sanitized_query == "SELECT a, b FROM SALES s JOIN REGIONS r ON s.id = r.id"
+    assert analysis.tables_accessed == ["SALES", "REGIONS"]
+
+
+def test_blocked_keywords_are_each_reported_once(sanitizer):
+    analysis = sanitizer.analyze_query("SELECT 1 FROM t; drop table t; DROP table u; delete from v")
+    blocked = [e for e in analysis.errors if e.startswith("Blocked keyword")]
+    assert blocked == ["Blocked keyword detected: DROP", "Blocked keyword detected: DELETE"]
+    assert not analysis.is_safe
+
+
+def test_injection_patterns_are_reported_per_pattern(sanitizer):
+    analysis = sanitizer.analyze_query("SELECT * FROM t WHERE a = 'x' OR '1'='1' AND 1=1")
+    injection = [e for e in analysis.errors if "injection" in e]
+    assert len(injection) == 3  # quote OR, OR-with-quotes, 1=1
+    assert sanitizer.analyze_query("SELECT * FROM t WHERE a = 'sp_x'").is_safe is False
+
+
+@pytest.mark.parametrize("query", [
+    "SELECT a FROM t -- trailing",
+    "SELECT a /* inline */ FROM t",
+    "SELECT a FROM t # mysql",
+])
+def test_comments_are_rejected(sanitizer, query):
+    analysis = sanitizer.analyze_query(query)
+    assert analysis.errors.count("SQL comments are not allowed in queries") == 1
+
+
+def test_repeated_queries_hit_the_cache_and_get_independent_copies(sanitizer):
+    first = sanitizer.analyze_query("SELECT a FROM t")
+    first.warnings.append("caller scribble")
+    second = sanitizer.analyze_query("SELECT a FROM t")
+    assert second.warnings == []
+    assert (sanitizer.cache_hits, sanitizer.cache_misses) == (1, 1)
+
+
+def test_cache_is_bounded_lru(sanitizer):
+    for query in ("SELECT a FROM t", "SELECT b FROM t", "SELECT a FROM t", "SELECT c FROM t"):
+        sanitizer.analyze_query(query)
+    assert list(sanitizer._cache) == ["SELECT a FROM t", "SELECT c FROM t"]
+
+
+def test_sanitize_raises_on_unsafe_query(sanitizer):
+    with pytest.raises(SQLSanitizerError):
+        sanitizer.sanitize("UPDATE t SET a = 1")
@@ -0,0 +1,113 @@
+"""Tests for the table-driven tool dispatch registry.
+
+Run with:  pytest tests/test_tool_registry.py -v
+"""
+
+import asyncio
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+os.environ.setdefault("USE_MOCK_DATA", "true")
+
+from auth.authorization import AuthorizationManager  # noqa: E402
+from auth.tool_validators import ToolValidators  # noqa: E402
+from tool_registry import (  # noqa: E402
+    VISIBILITY_DIAGNOSTIC,
+    VISIBILITY_FULL,
+    ToolRegistry,
+)
+
+
+@pytest.fixture(scope="module")
+def server():
+    import sap_datasphere_mcp_server as srv
+    return srv
+
+
+async def _noop(arguments):
+    return []
+
+
+def test_duplicate_registration_is_rejected():
+    registry = ToolRegistry()
+    registry.tool("a")(_noop)
+    with pytest.raises(ValueError):
+        registry.tool("a")(_noop)
+
+
+def test_unknown_visibility_is_rejected():
+    with pytest.raises(ValueError):
+        ToolRegistry().tool("a", visibility="secret")
+
+
+def test_visibility_follows_profile_and_diagnostics_flag():
+    registry = ToolRegistry()
+    registry.tool("lean")(_noop)
+    registry.tool("overlap", visibility=VISIBILITY_FULL)(_noop)
+    registry.tool("probe", visibility=VISIBILITY_DIAGNOSTIC)(_noop)
+
+    assert registry.visible_names("lean", False) == ["lean"]
+    assert registry.visible_names("full", False) == ["lean", "overlap"]
+    assert registry.visible_names("lean", True) == ["lean", "probe"]
+
+
+def test_validation_plan_is_shared_per_tool():
+    registry = ToolRegistry()
+    registry.tool("list_spaces")(_noop)
+    spec = registry.get("list_spaces")
+    assert spec.validation_plan is ToolValidators.get_validation_plan("list_spaces")
+
+
+def test_every_advertised_tool_has_a_handler_and_vice_versa(server, monkeypatch):
+    monkeypatch.setenv("DATASPHERE_TOOL_PROFILE", "full")
+    monkeypatch.setenv("DATASPHERE_EXPOSE_DIAGNOSTICS", "true")
+    advertised = [t.name for t in asyncio.run(server.handle_list_tools())]
+    assert advertised == server.tool_registry.names()
+
+
+def test_every_registered_tool_has_a_descriptor(server):
+    assert set(server._TOOL_DESCRIPTORS) == set(server.tool_registry.names())
+
+
+def test_lean_profile_hides_overlapping_and_diagnostic_tools(server, monkeypatch):
+    monkeypatch.setenv("DATASPHERE_TOOL_PROFILE", "lean")
+    monkeypatch.setenv("DATASPHERE_EXPOSE_DIAGNOSTICS", "false")
+    advertised = {t.name for t in asyncio.run(server.handle_list_tools())}
+    assert "list_spaces" in advertised
+    assert "search_repository" not in advertised
+    assert "test_phase8_endpoints" not in advertised
+
+
+def test_permission_comes_from_the_authorization_registry(server):
+    spec = server.tool_registry.get("list_spaces")
+    assert spec.permission is AuthorizationManager.TOOL_PERMISSIONS["list_spaces"]
+
+
+def test_validators_only_exist_for_registered_tools(server):
+    assert set(ToolValidators.get_all_tool_names()) <= set(server.tool_registry.names())
+
+
+async def test_dispatch_reaches_the_registered_handler(server):
+    result = await server._execute_tool("list_spaces", {})
+    assert result and "Unknown tool" not in result[0].text
+
+
+async def test_call_pipeline_dispatches_the_spec_it_looked_up(server, monkeypatch):
+    lookups = []
+    real_get = server.tool_registry.get
+
+    def counting_get(name):
+        lookups.append(name)
+        return real_get(name)
+
+    monkeypatch.setattr(server.tool_registry, "get", counting_get)
+    await server.handle_call_tool("list_spaces", {})
+    assert lookups == ["list_spaces"]
+
+
+async def test_unknown_tool_is_reported(server):
+    result = await server._execute_tool("no_such_tool", {})
+    assert result[0].text == "Unknown tool: no_such_tool"
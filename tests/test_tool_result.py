@@ -0,0 +1,156 @@
+"""Tests for structured tool results and their single serialisation.
+
+Run with:  pytest tests/test_tool_result.py -v
+"""
+
+import json
+import os
+import sys
+from types import SimpleNamespace
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+os.environ.setdefault("USE_MOCK_DATA", "true")
+
+import tool_result  # noqa: E402
+from tool_result import (  # noqa: E402
+    COMPACT,
+    JSON_FORMAT_META_KEY,
+    MASKED_FIELDS_META_KEY,
+    PRETTY,
+    ToolResult,
+)
+
+PAYLOAD = {"rows": [{"REGION": "EU", "AMOUNT": 1.5}], "count": 1}
+
+
+def test_result_keeps_the_historical_text_layout():
+    result = ToolResult(PAYLOAD, banner="Results:\n\n", footer="\n\nNote: mock")
+    assert len(result) == 1
+    assert result[0].text == "Results:\n\n" + json.dumps(PAYLOAD, indent=2) + "\n\nNote: mock"
+    assert [c.text for c in result] == [result[0].text]
+
+
+# Values the standard library and orjson encode differently
+AWKWARD = {"city": "Zürich", "ratio": float("nan"), "big": 1e16, "huge": 2 ** 70}
+
+
+def test_pretty_output_is_the_standard_library_output():
+    assert tool_result.dumps(AWKWARD, PRETTY) == json.dumps(AWKWARD, indent=2)
+
+
+def test_compact_output_without_orjson_is_the_standard_library_output(monkeypatch):
+    monkeypatch.setattr(tool_result, "orjson", None)
+    assert tool_result.dumps(AWKWARD, COMPACT) == json.dumps(AWKWARD, separators=(",", ":"))
+
+
+def test_compact_output_with_orjson_differs_as_documented(monkeypatch):
+    orjson = pytest.importorskip("orjson")
+    monkeypatch.setattr(tool_result, "orjson", orjson)
+    payload = {"city": "Zürich", "ratio": float("nan"), "big": 1e16}
+    assert tool_result.dumps(payload, COMPACT) == '{"city":"Zürich","ratio":null,"big":1e16}'
+    # Integers orjson cannot encode fall back to the standard library
+    assert tool_result.dumps({"huge": 2 ** 70}, COMPACT) == '{"huge":%d}' % 2 ** 70
+
+
+def test_rendering_happens_once_per_format(monkeypatch):
+    calls = []
+    original = tool_result.dumps
+    monkeypatch.setattr(tool_result, "dumps", lambda *a: calls.append(a[1]) or original(*a))
+
+    result = ToolResult(PAYLOAD)
+    assert result.render(PRETTY) is result.render(PRETTY)
+    assert json.loads(result.render(COMPACT)[0].text) == PAYLOAD
+    assert calls == [PRETTY, COMPACT]
+
+
+def test_compact_output_has_no_whitespace():
+    assert tool_result.dumps(PAYLOAD, COMPACT) == '{"rows":[{"REGION":"EU","AMOUNT":1.5}],"count":1}'
+
+
+def test_default_format_comes_from_the_environment(monkeypatch):
+    monkeypatch.setenv("DATASPHERE_JSON_FORMAT", "compact")
+    assert ToolResult(PAYLOAD)[0].text.startswith('{"rows"')
+    monkeypatch.setenv("DATASPHERE_JSON_FORMAT", "bogus")
+    assert tool_result.default_format() == PRETTY
+
+
+@pytest.mark.parametrize("meta, expected", [
+    ({JSON_FORMAT_META_KEY: "COMPACT"}, COMPACT),
+    ({JSON_FORMAT_META_KEY: "yaml"}, None),
+    ({"other": 1}, None),
+    (None, None),
+])
+def test_requested_format(meta, expected):
+    assert tool_result.requested_format(meta) == expected
+
+
+async def test_transport_edge_uses_the_request_format_and_handler_flag(monkeypatch):
+    import sap_datasphere_mcp_server as srv
+
+    async def handler(name, arguments):
+        return ToolResult(PAYLOAD, banner="Smart Query Results:\n\n")
+
+    monkeypatch.setattr(srv, "handle_call_tool", handler)
+    params = SimpleNamespace(name="smart_query", arguments={}, meta={JSON_FORMAT_META_KEY: "compact"})
+
+    result = await srv._on_call_tool(None, params)
+
+    assert result.is_error is False
+    assert result.content[0].text == "Smart Query Results:\n\n" + tool_result.dumps(PAYLOAD, COMPACT)
+
+
+async def test_query_handlers_return_structured_results():
+    import sap_datasphere_mcp_server as srv
+
+    result = await srv._execute_tool("execute_query", {
+        "space_id": "SAP_CONTENT", "sql_query": "SELECT * FROM CUSTOMERS LIMIT 2",
+    })
+    assert isinstance(result, ToolResult)
+    assert result.payload["sample_data"]
+    assert result[0].text.startswith("Query Execution Results:\n\n{")
+
+
+async def test_response_filter_scans_the_payload(monkeypatch):
+    import sap_datasphere_mcp_server as srv
+
+    async def execute(name, arguments, spec=None):
+        return ToolResult({"rows": [{"USER": "a", "password": "hunter2"}]},
+                          banner="Results:\n\n", masked_fields=["EMAIL"])
+
+    monkeypatch.setattr(srv, "_execute_tool", execute)
+    result = await srv.handle_call_tool("list_spaces", {})
+
+    assert isinstance(result, ToolResult)
+    assert result.payload["rows"][0] == {"USER": "a", "password": "***REDACTED_CREDENTIAL***"}
+    assert result.banner == "Results:\n\n"
+    assert result.masked_fields == ["EMAIL"]
+    assert "hunter2" not in result[0].text
+
+
+async def test_clean_payload_is_not_rewrapped(monkeypatch):
+    import sap_datasphere_mcp_server as srv
+
+    original = ToolResult(PAYLOAD)
+
+    async def execute(name, arguments, spec=None):
+        return original
+
+    monkeypatch.setattr(srv, "_execute_tool", execute)
+    assert await srv.handle_call_tool("list_spaces", {}) is original
+
+
+async def test_transport_edge_reports_masked_fields(monkeypatch):
+    import sap_datasphere_mcp_server as srv
+
+    async def handler(name, arguments):
+        return ToolResult(PAYLOAD, masked_fields=["EMAIL", "PHONE"])
+
+    monkeypatch.setattr(srv, "handle_call_tool", handler)
+    params = SimpleNamespace(name="execute_query", arguments={}, meta=None)
+
+    result = await srv._on_call_tool(None, params)
+
+    assert result.meta == {MASKED_FIELDS_META_KEY: ["EMAIL", "PHONE"]}
+    assert ToolResult(PAYLOAD).meta() is None
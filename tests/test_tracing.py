@@ -0,0 +1,138 @@
+"""Tests for per-call latency spans and the telemetry stage histograms.
+
+Run with:  pytest tests/test_tracing.py -v
+"""
+
+import asyncio
+import os
+import sys
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+os.environ.setdefault("USE_MOCK_DATA", "true")
+
+import tracing  # noqa: E402
+from telemetry import LatencyHistogram, TelemetryManager  # noqa: E402
+
+
+def test_span_outside_a_trace_is_a_shared_noop():
+    assert tracing.span("x") is tracing.span("y")
+    with tracing.span("x"):
+        pass
+    assert tracing.current_trace() is None
+
+
+async def test_spans_attach_across_awaits_and_tasks():
+    trace, token = tracing.start_trace("tool")
+    try:
+        with tracing.span("handler"):
+            await asyncio.sleep(0)
+
+            async def upstream():
+                with tracing.span("upstream_http"):
+                    await asyncio.sleep(0)
+
+            await asyncio.gather(upstream(), upstream())
+    finally:
+        tracing.end_trace(trace, token)
+
+    assert sorted(stage for stage, _, _ in trace.spans) == ["handler", "upstream_http", "upstream_http"]
+    assert tracing.current_trace() is None
+
+
+def test_spans_after_the_call_ended_are_dropped():
+    trace, token = tracing.start_trace("tool")
+    tracing.end_trace(trace, token)
+    trace.add("late", 1.0)
+    assert trace.spans == []
+
+
+def test_histogram_buckets_and_percentiles():
+    histogram = LatencyHistogram()
+    for ms in (0.5, 3, 3, 40, 20000):
+        histogram.record(ms)
+    summary = histogram.to_dict()
+    assert summary["count"] == 5
+    assert summary["buckets"] == {"le_1ms": 1, "le_5ms": 2, "le_50ms": 1, "le_30000ms": 1}
+    assert summary["p50_ms"] == 5.0
+    assert summary["max_ms"] == 20000
+
+
+def test_finished_trace_feeds_stage_histograms_and_handler_self():
+    telemetry = TelemetryManager()
+    handle = telemetry.start_call_trace("smart_query")
+    trace, _ = handle
+    trace.add("validation", 1.0)
+    trace.add("upstream_http", 30.0)
+    trace.add("upstream_http", 50.0)
+    trace.add("handler", 100.0)
+    telemetry.finish_call_trace(handle)
+
+    breakdown = telemetry.get_dashboard()["latency_breakdown"]
+    assert breakdown["by_stage"]["upstream_http"]["count"] == 2
+    assert breakdown["by_tool"]["smart_query"]["upstream_http"] == 80.0
+    assert breakdown["by_tool"]["smart_query"]["handler_self"] == 20.0
+
+
+def test_token_renewal_inside_an_upstream_request_is_subtracted_once():
+    telemetry = TelemetryManager()
+    handle = telemetry.start_call_trace("get_table_schema")
+    trace, _ = handle
+    trace.add("oauth_token", 10.0, 1000.0)        # before the request
+    trace.add("upstream_http", 50.0, 1010.0)
+    trace.add("oauth_token", 20.0, 1020.0)        # 401 retry, inside the request
+    trace.add("handler", 100.0, 1000.0)
+    telemetry.finish_call_trace(handle)
+
+    tool = telemetry.get_latency_breakdown()["by_tool"]["get_table_schema"]
+    assert tool["oauth_token"] == 30.0
+    assert tool["handler_self"] == 40.0
+
+
+def test_concurrent_upstream_requests_are_subtracted_as_wall_time():
+    telemetry = TelemetryManager()
+    handle = telemetry.start_call_trace("extract")
+    trace, _ = handle
+    for offset in (0.0, 5.0, 10.0, 15.0):         # four overlapping 40 ms requests
+        trace.add("upstream_http", 40.0, 1000.0 + offset)
+    trace.add("upstream_http", 10.0, 1070.0)      # a later, separate one
+    trace.add("handler", 100.0, 1000.0)
+    telemetry.finish_call_trace(handle)
+
+    tool = telemetry.get_latency_breakdown()["by_tool"]["extract"]
+    assert tool["upstream_http"] == 170.0          # per-request time, summed
+    assert tool["handler_self"] == 35.0            # 100 - (55 + 10), not clamped to 0
+
+
+def test_disabled_spans_record_nothing():
+    telemetry = TelemetryManager(enable_spans=False)
+    assert telemetry.start_call_trace("tool") is None
+    telemetry.finish_call_trace(None)
+    telemetry.record_stage("tool", "serialization", 1.0)
+    assert telemetry.get_latency_breakdown()["by_stage"] == {}
+
+
+async def test_tool_call_records_pipeline_stages():
+    import sap_datasphere_mcp_server as srv
+
+    await srv.handle_call_tool("list_spaces", {})
+    stages = srv.telemetry_manager.get_latency_breakdown()["by_tool"]["list_spaces"]
+    for stage in ("validation", "consent", "authorization", "handler", "data_filter", "handler_self"):
+        assert stage in stages, stage
+
+
+async def test_structured_result_serialization_is_timed(monkeypatch):
+    import sap_datasphere_mcp_server as srv
+    from tool_result import ToolResult
+
+    async def handler(name, arguments):
+        return ToolResult({"rows": [{"n": i} for i in range(100)]})
+
+    telemetry = TelemetryManager()
+    monkeypatch.setattr(srv, "telemetry_manager", telemetry)
+    monkeypatch.setattr(srv, "handle_call_tool", handler)
+    await srv._on_call_tool(None, SimpleNamespace(name="execute_query", arguments={}, meta=None))
+
+    breakdown = telemetry.get_latency_breakdown()
+    assert breakdown["by_stage"]["serialization"]["count"] == 1
+    assert "serialization" in breakdown["by_tool"]["execute_query"]
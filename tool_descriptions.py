@@ -373,9 +373,10 @@ class ToolDescriptions:
 
 **Performance notes:**
 - Searches across multiple spaces by default
-- Uses intelligent caching for better performance
+- Answered from a tenant-wide column index once it has been built in the background; until then assets are scanned concurrently
 - Results limited to 50 assets by default (configurable)
 - Case-insensitive search by default
+- Without an exact hit, a case-insensitive search falls back to names that differ only in separators (CUSTOMER_ID finds CustomerId); `column_match` reports which was used
 """,
             "inputSchema": {
                 "type": "object",
@@ -399,6 +400,10 @@ class ToolDescriptions:
                         "type": "boolean",
                         "description": "Optional: Perform case-sensitive column name matching. Default: false",
                         "default": False
+                    },
+                    "data_type": {
+                        "type": "string",
+                        "description": "Optional: Only match columns of this OData type (e.g., 'Edm.String', 'Edm.Decimal')"
                     }
                 },
                 "required": ["column_name"]
@@ -0,0 +1,130 @@
+"""
+Tool dispatch registry for SAP Datasphere MCP Server
+
+Each MCP tool is an ordinary coroutine registered under its name, together
+with what the request pipeline needs to know about it: its validation plan
+(from ``ToolValidators``), its permission entry (from ``AuthorizationManager``)
+and whether ``tools/list`` advertises it by default. ``tools/list`` is built
+from the registry, so a tool is advertised only if it has a handler.
+
+``handle_call_tool`` looks the tool up once and dispatches in O(1) instead of
+walking an if/elif chain, and because every handler is its own function it
+can be profiled or rate-limited individually.
+"""
+
+import logging
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Iterator, List, Optional
+
+from auth.authorization import AuthorizationManager, ToolPermission
+from auth.input_validator import ValidationPlan
+from auth.tool_validators import ToolValidators
+
+logger = logging.getLogger(__name__)
+
+ToolHandler = Callable[[Dict[str, Any]], Awaitable[List[Any]]]
+
+#: Advertised in every tool profile
+VISIBILITY_DEFAULT = "default"
+#: Advertised only with DATASPHERE_TOOL_PROFILE=full (overlaps a lean tool)
+VISIBILITY_FULL = "full"
+#: Advertised only with DATASPHERE_EXPOSE_DIAGNOSTICS=true
+VISIBILITY_DIAGNOSTIC = "diagnostic"
+
+_VISIBILITIES = (VISIBILITY_DEFAULT, VISIBILITY_FULL, VISIBILITY_DIAGNOSTIC)
+
+
+@dataclass
+class ToolSpec:
+    """Everything the request pipeline needs to run one tool"""
+    name: str
+    handler: ToolHandler
+    visibility: str = VISIBILITY_DEFAULT
+
+    @property
+    def validation_plan(self) -> ValidationPlan:
+        """Compiled, reentrant input validation rules (shared per tool)"""
+        return ToolValidators.get_validation_plan(self.name)
+
+    @property
+    def permission(self) -> Optional[ToolPermission]:
+        """Permission entry, or None if the tool has none (calls are denied)"""
+        return AuthorizationManager.TOOL_PERMISSIONS.get(self.name)
+
+    def is_visible(self, profile: str, expose_diagnostics: bool) -> bool:
+        """Whether ``tools/list`` advertises this tool under the given settings"""
+        if self.visibility == VISIBILITY_DIAGNOSTIC:
+            return expose_diagnostics
+        if self.visibility == VISIBILITY_FULL:
+            return profile == "full"
+        return True
+
+
+class ToolRegistry:
+    """
+    Registry of tool name -> ToolSpec
+
+    Handlers register with the ``tool`` decorator; registration order is the
+    order tools are advertised in.
+    """
+
+    def __init__(self):
+        self._tools: Dict[str, ToolSpec] = {}
+
+    def tool(
+        self,
+        name: str,
+        visibility: str = VISIBILITY_DEFAULT
+    ) -> Callable[[ToolHandler], ToolHandler]:
+        """
+        Decorator registering a coroutine as the handler for a tool
+
+        Args:
+            name: Tool name as advertised over MCP
+            visibility: VISIBILITY_DEFAULT, VISIBILITY_FULL or VISIBILITY_DIAGNOSTIC
+
+        Returns:
+            The decorator; the handler itself is returned unchanged
+        """
+        if visibility not in _VISIBILITIES:
+            raise ValueError(f"Unknown visibility '{visibility}' for tool {name}")
+
+        def decorator(handler: ToolHandler) -> ToolHandler:
+            if name in self._tools:
+                raise ValueError(f"Tool {name} is already registered")
+            self._tools[name] = ToolSpec(
+                name=name,
+                handler=handler,
+                visibility=visibility
+            )
+            return handler
+
+        return decorator
+
+    def get(self, name: str) -> Optional[ToolSpec]:
+        """Look up a tool; None if no handler is registered under that name"""
+        return self._tools.get(name)
+
+    def names(self) -> List[str]:
+        """Registered tool names, in registration order"""
+        return list(self._tools)
+
+    def visible(self, profile: str, expose_diagnostics: bool) -> List[ToolSpec]:
+        """Tools advertised by ``tools/list`` under the given settings"""
+        return [
+            spec for spec in self._tools.values()
+            if spec.is_visible(profile, expose_diagnostics)
+        ]
+
+    def visible_names(self, profile: str, expose_diagnostics: bool) -> List[str]:
+        """Names advertised by ``tools/list`` under the given settings"""
+        return [spec.name for spec in self.visible(profile, expose_diagnostics)]
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._tools
+
+    def __iter__(self) -> Iterator[ToolSpec]:
+        return iter(self._tools.values())
+
+    def __len__(self) -> int:
+        return len(self._tools)
@@ -0,0 +1,152 @@
+"""
+Structured tool results for SAP Datasphere MCP Server
+
+Handlers used to ``json.dumps(payload, indent=2)`` straight into a
+``TextContent``; the text was then carried through response filtering and
+inspected again to decide ``is_error``. A handler can instead return a
+``ToolResult``: the payload stays a Python object until the transport edge,
+where it is serialised exactly once, in the format the client asked for:
+
+    return ToolResult(result, banner="Smart Query Results:\\n\\n")
+
+``ToolResult`` is a read-only sequence of ``TextContent``, so code that
+indexes or iterates a handler's return value keeps working unchanged; it
+renders on first access and remembers the rendering per format. Response
+filtering works on the payload (``with_payload``) before anything is
+rendered, and the transport reports ``masked_fields`` in the result's
+``_meta`` under ``MASKED_FIELDS_META_KEY``.
+
+Output format
+-------------
+``pretty`` or ``compact`` (no whitespace, roughly half the size for large
+query results). The server default comes from ``DATASPHERE_JSON_FORMAT``; a
+client may override it per request with the ``_meta`` key
+``JSON_FORMAT_META_KEY``.
+
+``pretty`` is always ``json.dumps(payload, indent=2)``, byte for byte what
+the handlers produced before. ``compact`` is encoded with orjson when it is
+installed (``pip install sap-datasphere-mcp[fast-json]``), which differs from
+the standard library in three ways: non-ASCII text is emitted as UTF-8 rather
+than ``\\u`` escapes, NaN and infinities become ``null`` rather than the
+non-standard ``NaN``/``Infinity``, and some floats are spelled differently
+(``1e16`` rather than ``1e+16``). The parsed values are the same apart from
+the non-finite floats.
+"""
+
+import json
+import os
+from collections.abc import Sequence
+from typing import Any, Dict, List, Optional
+
+from mcp import types
+
+try:
+    import orjson
+except ImportError:  # optional speed-up
+    orjson = None
+
+PRETTY = "pretty"
+COMPACT = "compact"
+JSON_FORMATS = (PRETTY, COMPACT)
+
+#: Request ``_meta`` key a client sets to choose the format for one call.
+JSON_FORMAT_META_KEY = "sap-datasphere/json-format"
+
+#: Result ``_meta`` key listing the fields PII masking redacted.
+MASKED_FIELDS_META_KEY = "sap-datasphere/masked-fields"
+
+
+def default_format() -> str:
+    """The server-wide format from ``DATASPHERE_JSON_FORMAT`` (pretty if unset).
+
+    Read per call rather than at import: the server loads ``.env`` after its
+    imports have run.
+    """
+    value = os.getenv("DATASPHERE_JSON_FORMAT", PRETTY).strip().lower()
+    return value if value in JSON_FORMATS else PRETTY
+
+
+def dumps(payload: Any, json_format: Optional[str] = None) -> str:
+    """Serialise *payload* as pretty or compact JSON.
+
+    Pretty output always comes from the standard library. Compact output is
+    encoded with orjson when available (see the module docstring for how it
+    differs); anything orjson refuses (integers wider than 64 bits,
+    unsupported types) goes through the standard library instead.
+    """
+    if (json_format or default_format()) != COMPACT:
+        return json.dumps(payload, indent=2)
+    if orjson is not None:
+        try:
+            return orjson.dumps(payload, option=orjson.OPT_NON_STR_KEYS).decode()
+        except TypeError:
+            pass
+    return json.dumps(payload, separators=(",", ":"))
+
+
+def requested_format(meta: Any) -> Optional[str]:
+    """The format a request's ``_meta`` asks for, or None for the default."""
+    if not isinstance(meta, dict):
+        return None
+    value = meta.get(JSON_FORMAT_META_KEY)
+    if isinstance(value, str) and value.lower() in JSON_FORMATS:
+        return value.lower()
+    return None
+
+
+class ToolResult(Sequence):
+    """A handler's payload, serialised lazily into one ``TextContent``.
+
+    The text is ``banner + JSON + footer``, the layout the handlers have always
+    produced (byte for byte in the pretty format). ``is_error`` and ``masked_fields`` travel with the result so the
+    transport does not need to re-derive them from the rendered text.
+    """
+
+    __slots__ = ("payload", "banner", "footer", "is_error", "masked_fields", "_rendered")
+
+    def __init__(
+        self,
+        payload: Any,
+        banner: str = "",
+        footer: str = "",
+        *,
+        is_error: bool = False,
+        masked_fields: Optional[List[str]] = None,
+    ):
+        self.payload = payload
+        self.banner = banner
+        self.footer = footer
+        self.is_error = is_error
+        self.masked_fields = list(masked_fields or [])
+        self._rendered: Dict[str, List[types.TextContent]] = {}
+
+    def render(self, json_format: Optional[str] = None) -> List[types.TextContent]:
+        """The content for *json_format* (server default when None)"""
+        json_format = json_format or default_format()
+        content = self._rendered.get(json_format)
+        if content is None:
+            text = self.banner + dumps(self.payload, json_format) + self.footer
+            content = self._rendered[json_format] = [types.TextContent(type="text", text=text)]
+        return content
+
+    def with_payload(self, payload: Any) -> "ToolResult":
+        """A copy carrying *payload* and this result's text and flags"""
+        return ToolResult(
+            payload, self.banner, self.footer,
+            is_error=self.is_error, masked_fields=self.masked_fields,
+        )
+
+    def meta(self) -> Optional[Dict[str, Any]]:
+        """The result ``_meta`` for the transport, or None if there is none"""
+        if not self.masked_fields:
+            return None
+        return {MASKED_FIELDS_META_KEY: list(self.masked_fields)}
+
+    def __getitem__(self, index):
+        return self.render()[index]
+
+    def __len__(self) -> int:
+        return 1
+
+    def __repr__(self) -> str:
+        return f"ToolResult(banner={self.banner!r}, is_error={self.is_error})"
@@ -0,0 +1,130 @@
+"""
+Per-call latency spans for SAP Datasphere MCP Server
+
+A tool call passes through validation, SQL sanitization, consent,
+authorization, the handler itself (upstream HTTP, PII masking,
+post-processing), response filtering and, for structured results,
+serialization at the transport edge (recorded by ``TelemetryManager.record_stage``
+once the trace has closed). The call's total duration cannot
+show which of these was slow. This module times each stage of the call:
+
+    with span("authorization"):
+        ...
+
+The active trace is held in a context variable, so spans opened anywhere
+below ``handle_call_tool`` (including in the connector and in tasks created
+by the handler) attach to the right call without passing anything around.
+Outside a trace, or when tracing is disabled, ``span`` returns a shared no-op
+context manager: one context-variable read and no allocation.
+
+Deliberately dependency-free so the connector and masking modules can use it
+without importing telemetry.
+"""
+
+import time
+from contextvars import ContextVar, Token
+from typing import Dict, List, Optional, Tuple
+
+_current_trace: ContextVar[Optional["CallTrace"]] = ContextVar("datasphere_call_trace", default=None)
+
+
+class CallTrace:
+    """Spans recorded during one tool call"""
+
+    __slots__ = ("tool_name", "spans", "closed")
+
+    def __init__(self, tool_name: str):
+        self.tool_name = tool_name
+        # (stage, duration ms, start ms on the perf_counter clock or None)
+        self.spans: List[Tuple[str, float, Optional[float]]] = []
+        self.closed = False
+
+    def add(self, stage: str, duration_ms: float, started_ms: Optional[float] = None):
+        # A background task can outlive its call; its late spans are dropped
+        if not self.closed:
+            self.spans.append((stage, duration_ms, started_ms))
+
+    def totals(self) -> Dict[str, float]:
+        """Milliseconds per stage, summed over repeated spans"""
+        totals: Dict[str, float] = {}
+        for stage, duration_ms, _ in self.spans:
+            totals[stage] = totals.get(stage, 0.0) + duration_ms
+        return totals
+
+    def covered_ms(self, stages: Tuple[str, ...]) -> float:
+        """
+        Wall-clock milliseconds during which at least one span of ``stages``
+        was open
+
+        Overlapping spans (concurrent upstream requests, a token renewal
+        inside a request) count once, so the result never exceeds the
+        elapsed time they cover. Spans without a start time are summed.
+        """
+        timed, total = [], 0.0
+        for stage, duration_ms, started_ms in self.spans:
+            if stage not in stages:
+                continue
+            if started_ms is None:
+                total += duration_ms
+            else:
+                timed.append((started_ms, started_ms + duration_ms))
+        reach = float("-inf")
+        for start, end in sorted(timed):
+            if end > reach:
+                total += end - max(start, reach)
+                reach = end
+        return total
+
+
+class _Span:
+    __slots__ = ("_trace", "_stage", "_start")
+
+    def __init__(self, trace: CallTrace, stage: str):
+        self._trace = trace
+        self._stage = stage
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._trace.add(self._stage, (time.perf_counter() - self._start) * 1000, self._start * 1000)
+        return False
+
+
+class _NoopSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+def span(stage: str):
+    """Time a block as ``stage`` of the current call (no-op outside a trace)"""
+    trace = _current_trace.get()
+    if trace is None:
+        return _NOOP_SPAN
+    return _Span(trace, stage)
+
+
+def current_trace() -> Optional[CallTrace]:
+    """The trace of the call being executed, if any"""
+    return _current_trace.get()
+
+
+def start_trace(tool_name: str) -> Tuple[CallTrace, Token]:
+    """Begin tracing a call in the current context"""
+    trace = CallTrace(tool_name)
+    return trace, _current_trace.set(trace)
+
+
+def end_trace(trace: CallTrace, token: Token):
+    """Stop tracing; later spans from leftover tasks are ignored"""
+    trace.closed = True
+    _current_trace.reset(token)